@@ -2,8 +2,8 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
-from dotenv import load_dotenv
 import os
+import time
 
 from config import Config
 
@@ -12,8 +12,7 @@ migrate = Migrate()
 
 
 def create_app():
-    load_dotenv()  # Load .env file
-    app = Flask(__name__)
+    started = time.perf_counter()
 
     base_dir = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))  # satu level di atas app/
     static_folder_path = os.path.join(base_dir, 'static')
@@ -29,10 +28,10 @@ def create_app():
     # ✅ Inisialisasi CORS untuk semua route /api/*
     CORS(
         app,
-        resources={r"/api/*": {"origins": "http://localhost:5173"}},
+        resources={r"/api/*": {"origins": app.config["CORS_ORIGIN"]}},
         supports_credentials=True,  # ✅ penting jika pakai token Authorization
         expose_headers=["Content-Type", "Authorization"],  # ✅ jika ingin header tertentu terlihat
-        allow_headers=["Content-Type", "Authorization"],
+        allow_headers=["Content-Type", "Authorization", "Idempotency-Key"],
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],  # ✅ agar OPTIONS tidak diblok
     )
 
@@ -47,10 +46,71 @@ def create_app():
     from app.routes.karyaseni import karya_seni_bp
     from app.routes.ruangvideo import ruang_video_bp
     from app.routes.auth import auth_bp
+    from app.routes.export import export_bp
+    from app.routes.live import live_bp
+    from app.routes.explore import explore_bp
+    from app.routes.storage import storage_bp
+    from app.routes.internal import internal_bp
 
     app.register_blueprint(users_bp, url_prefix="/api/users")
     app.register_blueprint(karya_seni_bp, url_prefix="/api/karya_seni")
     app.register_blueprint(ruang_video_bp, url_prefix="/api/ruang_video")
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
+    app.register_blueprint(export_bp, url_prefix="/api/export")
+    app.register_blueprint(live_bp, url_prefix="/api/live")
+    app.register_blueprint(explore_bp, url_prefix="/api/explore")
+    app.register_blueprint(storage_bp, url_prefix="/api/storage")
+    app.register_blueprint(internal_bp, url_prefix="/api/internal")
 
+    from app.archival import archive_cli
+    from app.cache import init_cache
+    from app.compression import init_compression
+    from app.counters import counters_cli, init_counters
+    from app.deadlines import init_deadlines
+    from app.explore import init_explore
+    from app.exporter import export_command
+    from app.feed import feed_cli
+    from app.idempotency import init_idempotency
+    from app.images import images_cli
+    from app.importer import import_cli
+    from app.metrics import init_metrics
+    from app.passwords import init_passwords
+    from app.profiling import init_profiling
+    from app.ratelimit import init_ratelimit
+    from app.realtime import init_realtime
+    from app.slowlog import init_slowlog
+    from app.storage import init_storage
+    from app.uploads import uploads_cli
+    from app.usernames import init_usernames
+    from app.jobs import jobs_cli
+    from app.warmup import warmup_command
+
+    init_cache(app)
+    init_compression(app)
+    init_counters(app)
+    init_deadlines(app)
+    init_explore(app)
+    init_idempotency(app)
+    init_metrics(app)
+    init_passwords(app)
+    init_profiling(app)
+    init_ratelimit(app)
+    init_realtime(app)
+    init_slowlog(app)
+    init_storage(app)
+    init_usernames(app)
+    app.cli.add_command(archive_cli)
+    app.cli.add_command(counters_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(export_command)
+    app.cli.add_command(feed_cli)
+    app.cli.add_command(images_cli)
+    app.cli.add_command(import_cli)
+    app.cli.add_command(uploads_cli)
+
+    app.cli.add_command(warmup_command)
+
+    app.extensions["startup_timings"] = {
+        "create_app_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
     return app
@@ -0,0 +1,210 @@
+"""Arsip baris soft-delete ke tabel *_archive.
+
+Baris yang ``deleted_at``-nya lebih lama dari masa retensi dipindahkan per batch
+(INSERT ... SELECT lalu DELETE dalam satu transaksi) supaya tabel dan index
+utama hanya berisi konten yang masih hidup. File upload yang tidak lagi dipakai
+baris mana pun dipindahkan ke prefix ``archive/`` di backend storage aktif
+(untuk backend local: folder archive/ di luar static/) sehingga restore tetap
+bisa mengembalikannya.
+"""
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import delete, insert, literal, or_, select
+
+from app import db
+from app.cache import invalidate
+from app.feed import sync_karya
+from app.jobs import enqueue
+from app.storage import get_storage
+from app.usernames import forget_username
+from app.models import (
+    KaryaSeniArchive,
+    LikeVideo,
+    RuangVideoArchive,
+    User,
+    UserArchive,
+    karya_seni,
+    ruang_video,
+)
+
+# kind -> (model utama, model arsip, kolom berisi path file upload)
+ARCHIVES = {
+    "karya": (karya_seni, KaryaSeniArchive, "link_foto"),
+    "video": (ruang_video, RuangVideoArchive, None),
+    "user": (User, UserArchive, "foto_profil"),
+}
+
+
+ARCHIVE_PREFIX = "archive/"
+
+
+def _file_in_use(path):
+    # File bisa dipakai lebih dari satu baris (nama file dari upload asli)
+    in_karya = db.session.execute(
+        select(karya_seni.id).where(karya_seni.link_foto == path).limit(1)
+    ).first()
+    in_users = db.session.execute(
+        select(User.id).where(User.foto_profil == path).limit(1)
+    ).first()
+    return in_karya is not None or in_users is not None
+
+
+def _move_file(value, to_archive):
+    """Pindahkan file nilai kolom ``value`` ke/dari prefix arsip di storage."""
+    storage = get_storage()
+    key = storage.key_for(value)
+    if key is None:
+        return False
+    src, dst = (key, ARCHIVE_PREFIX + key) if to_archive else (ARCHIVE_PREFIX + key, key)
+    if not storage.exists(src):
+        return False
+    storage.move(src, dst)
+    return True
+
+
+def _expired_ids(model, cutoff, batch_size):
+    query = (
+        select(model.id)
+        .where(model.deleted_at.is_not(None), model.deleted_at < cutoff)
+        .order_by(model.deleted_at)
+        .limit(batch_size)
+    )
+    if model is User:
+        # User hanya diarsip setelah semua karya/videonya keluar dari tabel utama
+        query = query.where(
+            ~select(karya_seni.id).where(karya_seni.user_id == User.id).exists(),
+            ~select(ruang_video.id).where(ruang_video.user_id == User.id).exists(),
+        )
+    return db.session.execute(query).scalars().all()
+
+
+def archive_batch(kind, cutoff, batch_size):
+    """Arsipkan satu batch; kembalikan jumlah baris yang dipindahkan."""
+    model, archive, file_column = ARCHIVES[kind]
+    ids = _expired_ids(model, cutoff, batch_size)
+    if not ids:
+        return 0
+
+    files = []
+    if file_column:
+        files = db.session.execute(
+            select(getattr(model, file_column)).where(model.id.in_(ids))
+        ).scalars().all()
+
+    columns = [c.name for c in model.__table__.columns]
+    db.session.execute(
+        insert(archive).from_select(
+            columns + ["archived_at"],
+            select(*[model.__table__.c[name] for name in columns],
+                   literal(datetime.utcnow(), db.DateTime)).where(model.id.in_(ids)),
+        )
+    )
+    if kind == "video":
+        db.session.execute(delete(LikeVideo).where(LikeVideo.video_id.in_(ids)))
+    elif kind == "user":
+        # like_count video yang pernah di-like user ini dihitung ulang di worker
+        liked_videos = db.session.execute(
+            select(LikeVideo.video_id).where(LikeVideo.user_id.in_(ids)).distinct()
+        ).scalars().all()
+        db.session.execute(delete(LikeVideo).where(LikeVideo.user_id.in_(ids)))
+        for video_id in liked_videos:
+            enqueue(
+                "recount_video_likes", {"video_id": video_id}, dedup_key=f"video-likes:{video_id}"
+            )
+    db.session.execute(delete(model).where(model.id.in_(ids)))
+    db.session.commit()
+
+    # File dipindah setelah commit; kalau gagal, baris tetap konsisten
+    for path in set(filter(None, files)):
+        if not _file_in_use(path):
+            _move_file(path, to_archive=True)
+    return len(ids)
+
+
+def archive_expired(retention_days, batch_size=500, max_batches=None):
+    """Arsipkan semua baris yang soft-delete lebih dari ``retention_days`` hari."""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    totals = {}
+    # User terakhir, setelah karya/video miliknya sempat diarsip
+    for kind in ("karya", "video", "user"):
+        totals[kind] = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            moved = archive_batch(kind, cutoff, batch_size)
+            if not moved:
+                break
+            totals[kind] += moved
+            batches += 1
+    return totals
+
+
+def restore(kind, id, undelete=True):
+    """Kembalikan satu baris arsip ke tabel utama."""
+    model, archive, file_column = ARCHIVES[kind]
+    row = db.session.get(archive, id)
+    if row is None:
+        raise LookupError(f"{kind} {id} tidak ada di arsip")
+
+    if kind in ("karya", "video") and not db.session.get(User, row.user_id):
+        raise ValueError(f"Pemilik (user {row.user_id}) masih diarsip, restore user dulu")
+    if kind == "user":
+        conflict = db.session.execute(
+            select(User.id).where(
+                or_(User.username == row.username, User.email == row.email)
+            )
+        ).first()
+        if conflict:
+            raise ValueError("Username atau email sudah dipakai user lain")
+
+    columns = [c.name for c in model.__table__.columns]
+    db.session.execute(
+        insert(model).from_select(
+            columns,
+            select(*[archive.__table__.c[name] for name in columns]).where(archive.id == id),
+        )
+    )
+    db.session.execute(delete(archive).where(archive.id == id))
+    if undelete:
+        db.session.execute(
+            model.__table__.update().where(model.id == id).values(deleted_at=None)
+        )
+    if kind == "karya":
+        sync_karya(karya_seni.id == id)
+    db.session.commit()
+    invalidate({"karya": "karya", "video": "video", "user": "users"}[kind], f"{kind}:{id}")
+    if kind == "user":
+        forget_username(row.username)
+
+    path = getattr(row, file_column) if file_column else None
+    if path:
+        _move_file(path, to_archive=False)
+    return db.session.get(model, id)
+
+
+archive_cli = AppGroup("archive", help="Arsip baris soft-delete.")
+
+
+@archive_cli.command("run")
+@click.option("--retention-days", default=90, show_default=True, type=int)
+@click.option("--batch-size", default=500, show_default=True, type=int)
+@click.option("--max-batches", default=None, type=int, help="Batas batch per tabel.")
+def archive_run_command(retention_days, batch_size, max_batches):
+    """Pindahkan baris soft-delete yang lewat masa retensi ke tabel arsip."""
+    totals = archive_expired(retention_days, batch_size, max_batches)
+    for kind, count in totals.items():
+        click.echo(f"{kind}: {count} baris diarsip")
+
+
+@archive_cli.command("restore")
+@click.argument("kind", type=click.Choice(sorted(ARCHIVES)))
+@click.argument("id", type=int)
+@click.option("--keep-deleted", is_flag=True, help="Jangan hapus deleted_at saat restore.")
+def archive_restore_command(kind, id, keep_deleted):
+    """Kembalikan baris arsip ke tabel utama."""
+    try:
+        restore(kind, id, undelete=not keep_deleted)
+    except (LookupError, ValueError) as e:
+        raise click.ClickException(str(e))
+    click.echo(f"{kind} {id} berhasil di-restore")
@@ -0,0 +1,178 @@
+"""Mode ASGI opsional.
+
+Endpoint list yang read-heavy dilayani langsung oleh handler async di atas
+engine SQLAlchemy async (aiomysql/aiosqlite), sehingga request yang menunggu
+I/O database tidak menahan thread. Semua route lain tetap diteruskan ke
+aplikasi Flask (WSGI) lewat ``asgiref.wsgi.WsgiToAsgi``.
+
+Hook ``before_request``/``after_request`` Flask tidak berjalan untuk route
+async, jadi gateway menerapkan sendiri, dengan bobot dan deadline dari view
+Flask-nya:
+
+* rate limit dan admission control (bucket dan slot yang sama, app/ratelimit.py);
+* deadline request (504, metrik ``deadline_exceeded``);
+* kompresi gzip/brotli (app/compression.py).
+
+Response cache tidak dipakai: route async selalu membaca database.
+
+Jalankan dengan: ``uvicorn asgi:app``
+"""
+import asyncio
+import math
+
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import select
+from werkzeug.http import parse_accept_header
+
+from app.async_db import get_async_engine
+from app.compression import available_encodings, compress_cached
+from app.metrics import incr
+from app.ratelimit import client_key, take_tokens
+from app.models import KaryaFeed, User, ruang_video
+from app.routes.karyaseni import FEED_FIELDS
+from app.routes.ruangvideo import VIDEO_FIELDS
+from app.routes.users import USER_FIELDS
+
+# Row hasil Core mendukung akses atribut, jadi serializer Fieldset yang sama
+# dengan view Flask bisa dipakai langsung
+
+
+async def list_karya(conn, ctx):
+    # Read model karya_feed: artist sudah ada di baris, tanpa query ke users
+    f = KaryaFeed.__table__
+    rows = (await conn.execute(select(f).order_by(f.c.id))).all()
+    return FEED_FIELDS.serialize_many(rows, list(FEED_FIELDS.fields), ctx)
+
+
+async def list_video(conn, ctx):
+    v = ruang_video.__table__
+    rows = (await conn.execute(select(v).where(v.c.deleted_at.is_(None)))).all()
+    return VIDEO_FIELDS.serialize_many(rows, list(VIDEO_FIELDS.fields), ctx)
+
+
+async def list_users(conn, ctx):
+    u = User.__table__
+    rows = (await conn.execute(select(u).where(u.c.deleted_at.is_(None)))).all()
+    # created_at (datetime) diformat oleh provider JSON Flask seperti di jsonify
+    return USER_FIELDS.serialize_many(rows, list(USER_FIELDS.fields), ctx)
+
+
+# Route GET yang dilayani async; path harus sama persis dengan route Flask-nya.
+# Handler dipanggil ``handler(conn, ctx)`` dengan ctx serializer Fieldset
+# (``{"url_prefix": ...}``), sama seperti view Flask-nya
+ASYNC_ROUTES = {
+    "/api/karya_seni": list_karya,
+    "/api/ruang_video": list_video,
+    "/api/users/": list_users,
+}
+
+
+class AsyncGateway:
+    """Aplikasi ASGI: route async untuk list endpoint, sisanya ke Flask."""
+
+    def __init__(self, flask_app, routes=None):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.routes = ASYNC_ROUTES if routes is None else routes
+        self.cors_origin = flask_app.config.get("CORS_ORIGIN")
+        self.database_uri = flask_app.config["SQLALCHEMY_DATABASE_URI"]
+        # View Flask pasangan tiap route: sumber rate_cost dan deadline
+        adapter = flask_app.url_map.bind("localhost")
+        self.views = {}
+        for path in self.routes:
+            endpoint, _ = adapter.match(path, method="GET")
+            self.views[path] = (endpoint, flask_app.view_functions[endpoint])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+
+        handler = None
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            handler = self.routes.get(scope["path"])
+        if handler is None or b"fields=" in scope.get("query_string", b""):
+            # ?fields= (sparse fieldset) ditangani view Flask
+            return await self.wsgi(scope, receive, send)
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        endpoint, view = self.views[scope["path"]]
+        limits = self.flask_app.extensions.get("ratelimit")
+        cost = getattr(view, "rate_cost", 1) if limits else 0
+
+        if cost:
+            with self.flask_app.app_context():
+                retry_after = take_tokens(
+                    limits["buckets"], self.client(scope, headers), endpoint, view, cost
+                )
+            if retry_after is not None:
+                message = {"message": "Terlalu banyak request, coba lagi nanti"}
+                return await self.respond(scope, send, headers, 429, message, retry_after)
+            admission = limits["admission"]
+            # Antrean admission menunggu di thread, bukan di event loop
+            if not admission.acquire(cost, block=False) and not await asyncio.to_thread(
+                admission.acquire, cost
+            ):
+                message = {"message": "Server sedang sibuk, coba lagi sebentar"}
+                return await self.respond(scope, send, headers, 503, message, admission.wait)
+
+        ctx = {"url_prefix": "%s://%s/" % (scope.get("scheme", "http"), headers.get("host", "localhost"))}
+        seconds = getattr(view, "deadline", self.flask_app.config["REQUEST_DEADLINE_SECONDS"])
+        try:
+            engine = get_async_engine(self.database_uri)
+            async with engine.connect() as conn:
+                payload = await asyncio.wait_for(handler(conn, ctx), seconds or None)
+        except asyncio.TimeoutError:
+            with self.flask_app.app_context():
+                incr("deadline_exceeded", route=endpoint)
+            return await self.respond(scope, send, headers, 504, {"message": "Request melebihi batas waktu"})
+        finally:
+            if cost:
+                admission.release(cost)
+        await self.respond(scope, send, headers, 200, payload)
+
+    def client(self, scope, headers):
+        address = (scope.get("client") or ("unknown",))[0]
+        forwarded = headers.get("x-forwarded-for")
+        if self.flask_app.config["RATELIMIT_TRUST_PROXY"] and forwarded:
+            address = forwarded.split(",")[0].strip()
+        return client_key(headers.get("authorization"), address)
+
+    async def respond(self, scope, send, headers, status, payload, retry_after=None):
+        config = self.flask_app.config
+        body = self.flask_app.json.dumps(payload, separators=(",", ":")).encode("utf-8") + b"\n"
+        response_headers = [(b"content-type", b"application/json"), (b"vary", b"Accept-Encoding")]
+        if retry_after is not None:
+            response_headers.append((b"retry-after", str(max(1, math.ceil(retry_after))).encode()))
+
+        encoding = parse_accept_header(headers.get("accept-encoding")).best_match(available_encodings())
+        if encoding and len(body) >= config["COMPRESS_MIN_SIZE"]:
+            body = compress_cached(body, encoding, config, self.flask_app.extensions["compression_lru"])
+            response_headers.append((b"content-encoding", encoding.encode()))
+        response_headers.append((b"content-length", str(len(body)).encode()))
+        response_headers.extend(self.cors_headers(headers.get("origin")))
+
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+    def cors_headers(self, origin):
+        # Meniru header yang dipasang Flask-CORS untuk /api/*
+        if not origin or origin != self.cors_origin:
+            return []
+        return [
+            (b"access-control-allow-origin", origin.encode("latin-1")),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-expose-headers", b"Content-Type, Authorization"),
+            (b"vary", b"Origin"),
+        ]
+
+    async def lifespan(self, receive, send):
+        from app.async_db import dispose_async_engine
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await dispose_async_engine()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,43 @@
+import os
+
+from sqlalchemy.engine import make_url
+
+# Driver async pengganti untuk driver sync yang dipakai di DATABASE_URI
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+_engine = None
+
+
+def async_url(sync_url):
+    """Ubah URL database sync (pymysql/sqlite) menjadi URL driver async."""
+    url = make_url(sync_url)
+    driver = ASYNC_DRIVERS.get(url.drivername)
+    if driver is None:
+        raise ValueError(f"Driver {url.drivername!r} tidak punya pasangan async")
+    return url.set(drivername=driver)
+
+
+def get_async_engine(sync_url=None):
+    # Engine dibuat sekali per proses, baru saat request async pertama datang
+    global _engine
+    if _engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = async_url(sync_url or os.getenv("DATABASE_URI"))
+        kwargs = {}
+        if not url.drivername.startswith("sqlite"):
+            kwargs.update(pool_size=10, max_overflow=20, pool_recycle=280)
+        _engine = create_async_engine(url, pool_pre_ping=True, **kwargs)
+    return _engine
+
+
+async def dispose_async_engine():
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
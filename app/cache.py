@@ -0,0 +1,306 @@
+"""Cache response dua lapis dengan invalidasi berbasis tag.
+
+* Lapis 1: LRU di memori tiap proses (``CACHE_LOCAL_SIZE`` entry).
+* Lapis 2: store bersama berprotokol Redis (``CACHE_REDIS_URL``, butuh
+  ``pip install -r requirements-redis.txt``). Tanpa URL
+  dipakai ``LocalStore`` di memori, cukup untuk satu proses dan untuk test.
+  Invalidasi di ``LocalStore`` tidak sampai ke proses lain, jadi jika
+  ``WORKER_PROCESSES`` > 1 tanpa ``CACHE_REDIS_URL`` cache response dimatikan
+  (``ResponseCache.shared`` False; Idempotency-Key dan cache username ikut mati).
+
+Setiap entry diberi tag entitas, mis. ``karya:42`` atau ``user:7:content``.
+Versi tiap tag disimpan di store bersama; entry mencatat versi tag saat dibuat
+dan dianggap basi begitu salah satu versi berubah. ``invalidate(*tags)``
+cukup menaikkan versi tag, jadi invalidasi dari worker mana pun langsung
+berlaku di semua worker, termasuk untuk entry di LRU lokal mereka.
+
+Pemakaian di route GET::
+
+    @karya_seni_bp.route("/<int:id>", methods=["GET"])
+    @cached("karya:{id}")
+    def get_karya_detail(id):
+        ...
+        cache_tags(f"user:{karya.user_id}")  # tag yang baru diketahui di view
+
+dan setelah commit di route tulis::
+
+    invalidate("karya", f"karya:{karya.id}")
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, g, request
+
+KEY_PREFIX = "cache:resp:"
+TAG_PREFIX = "cache:tag:"
+
+
+class LocalStore:
+    """Pengganti Redis di memori (get/set/add/mget/incr dengan TTL)."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires = item
+        if expires is not None and expires <= now:
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, key):
+        with self._lock:
+            return self._live(key, time.monotonic())
+
+    def mget(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return [self._live(key, now) for key in keys]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+
+    def add(self, key, value, ex=None):
+        """SET NX: simpan hanya jika key belum ada; True jika tersimpan."""
+        with self._lock:
+            now = time.monotonic()
+            if self._live(key, now) is not None:
+                return False
+            self._data[key] = (value, now + ex if ex else None)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._live(key, time.monotonic()) or 0) + 1
+            self._data[key] = (str(value).encode(), None)
+            return value
+
+
+class RedisStore:
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def mget(self, keys):
+        return self.client.mget(keys)
+
+    def set(self, key, value, ex=None):
+        self.client.set(key, value, ex=ex)
+
+    def add(self, key, value, ex=None):
+        return bool(self.client.set(key, value, ex=ex, nx=True))
+
+    def delete(self, key):
+        self.client.delete(key)
+
+    def incr(self, key):
+        return self.client.incr(key)
+
+
+class LocalLRU:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class ResponseCache:
+    def __init__(self, store, local_size, default_ttl, shared=True):
+        self.store = store
+        self.local = LocalLRU(local_size)
+        self.default_ttl = default_ttl
+        # False: store hanya terlihat di proses ini padahal ada worker lain
+        self.shared = shared
+
+    def tag_versions(self, tags):
+        if not tags:
+            return {}
+        values = self.store.mget([TAG_PREFIX + tag for tag in tags])
+        return {tag: int(value or 0) for tag, value in zip(tags, values)}
+
+    def _fresh(self, entry):
+        if entry["expires"] <= time.time():
+            return False
+        return self.tag_versions(list(entry["versions"])) == entry["versions"]
+
+    def get(self, key):
+        entry = self.local.get(key)
+        if entry is None:
+            raw = self.store.get(KEY_PREFIX + key)
+            if raw is None:
+                return None
+            header, _, body = raw.partition(b"\n")
+            entry = json.loads(header)
+            entry["body"] = body
+            entry["compressed"] = {}
+            self.local.set(key, entry)
+        if not self._fresh(entry):
+            self.local.discard(key)
+            return None
+        return entry
+
+    def set(self, key, response, versions, ttl):
+        ttl = ttl or self.default_ttl
+        meta = {
+            "status": response.status_code,
+            "mimetype": response.mimetype,
+            "versions": versions,
+            "expires": time.time() + ttl,
+        }
+        body = response.get_data()
+        self.store.set(KEY_PREFIX + key, json.dumps(meta).encode() + b"\n" + body, ex=ttl)
+        self.local.set(key, {**meta, "body": body, "compressed": {}})
+
+    def invalidate(self, *tags):
+        for tag in set(tags):
+            self.store.incr(TAG_PREFIX + tag)
+
+
+def init_cache(app):
+    app.config.setdefault("CACHE_ENABLED", True)
+    app.config.setdefault("CACHE_REDIS_URL", None)
+    app.config.setdefault("CACHE_LOCAL_SIZE", 512)
+    app.config.setdefault("CACHE_DEFAULT_TTL", 60)
+    app.config.setdefault("WORKER_PROCESSES", 1)
+
+    url = app.config["CACHE_REDIS_URL"]
+    shared = bool(url) or app.config["WORKER_PROCESSES"] <= 1
+    if not shared:
+        app.logger.warning(
+            "CACHE_REDIS_URL kosong dengan %s worker: cache response, Idempotency-Key "
+            "dan cache username dimatikan",
+            app.config["WORKER_PROCESSES"],
+        )
+        app.config["CACHE_ENABLED"] = False
+    store = RedisStore(url) if url else LocalStore()
+    app.extensions["cache"] = ResponseCache(
+        store, app.config["CACHE_LOCAL_SIZE"], app.config["CACHE_DEFAULT_TTL"], shared
+    )
+
+
+def _cache():
+    if not current_app.config.get("CACHE_ENABLED", True):
+        return None
+    return current_app.extensions.get("cache")
+
+
+def request_key(user_id=None):
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    # Host ikut key: body berisi URL absolut dari request.host_url
+    raw = f"{request.host}{request.path}?{query}|{user_id or ''}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def cache_tags(*tags):
+    """Tambahkan tag ke entry request yang sedang di-cache (dari dalam view)."""
+    cache = _cache()
+    pending = g.get("cache_versions")
+    if cache is None or pending is None:
+        return
+    try:
+        pending.update(cache.tag_versions([t for t in tags if t not in pending]))
+    except Exception:
+        # Store tidak bisa dihubungi: jangan simpan response ini
+        g.cache_versions = None
+
+
+def invalidate(*tags):
+    """Naikkan versi tag; dipanggil setelah commit."""
+    cache = _cache()
+    if cache is None:
+        return
+    try:
+        cache.invalidate(*tags)
+    except Exception:
+        current_app.logger.exception("Gagal invalidasi cache %s", tags)
+
+
+def cached(*tags, ttl=None, per_user=False, unless=None):
+    """Cache response GET 200 dengan tag ``tags`` (boleh memakai ``{kwarg}`` view).
+
+    ``per_user=True`` untuk route di belakang ``token_required`` (argumen
+    pertama view adalah user login); key cache lalu dipisah per user dan tag
+    boleh memakai ``{user_id}``.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = _cache()
+            if cache is None or request.method != "GET" or (unless and unless()):
+                return fn(*args, **kwargs)
+
+            user_id = args[0].id if per_user else None
+            key = request_key(user_id)
+            try:
+                entry = cache.get(key)
+            except Exception:
+                current_app.logger.exception("Cache tidak bisa dibaca")
+                return fn(*args, **kwargs)
+            if entry is not None:
+                response = current_app.response_class(
+                    entry["body"], status=entry["status"], mimetype=entry["mimetype"]
+                )
+                # Bentuk gzip/brotli disimpan di entry (lihat app/compression.py)
+                response.compression_store = entry["compressed"]
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            # Versi tag dibaca sebelum query: tulis yang terjadi selama view
+            # berjalan membuat entry ini langsung basi
+            # kwarg view (mis. user_id dari URL) menang atas user login
+            names = [tag.format(**{"user_id": user_id, **kwargs}) for tag in tags]
+            try:
+                g.cache_versions = cache.tag_versions(names)
+            except Exception:
+                current_app.logger.exception("Cache tidak bisa dibaca")
+                return fn(*args, **kwargs)
+            response = current_app.make_response(fn(*args, **kwargs))
+            versions, g.cache_versions = g.cache_versions, None
+
+            if versions is not None and response.status_code == 200 and not response.is_streamed:
+                try:
+                    cache.set(key, response, versions, ttl)
+                except Exception:
+                    current_app.logger.exception("Cache tidak bisa ditulis")
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,122 @@
+"""Kompresi response (gzip/brotli) berdasarkan Accept-Encoding.
+
+Hasil kompresi disimpan supaya payload yang sama (mis. list karya yang sering
+diminta) cukup dikompres sekali. Response dari cache bisa membawa dict
+``response.compression_store`` sendiri; bentuk terkompresi lalu disimpan di
+entry cache tersebut. Selain itu ada LRU kecil per proses yang dikunci dengan
+digest body.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli opsional, gzip selalu tersedia
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/html",
+    "text/css",
+    "text/plain",
+    "application/javascript",
+)
+
+
+class CompressedLRU:
+    """LRU thread-safe: (digest, encoding) -> bytes terkompresi."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data, encoding, config):
+    if encoding == "br":
+        return brotli.compress(data, quality=config["COMPRESS_BR_QUALITY"])
+    return gzip.compress(data, compresslevel=config["COMPRESS_LEVEL"], mtime=0)
+
+
+def compress_cached(data, encoding, config, lru):
+    """Kompres lewat LRU per proses; body besar tidak disimpan."""
+    if len(data) > config["COMPRESS_CACHE_MAX_BYTES"]:
+        return compress(data, encoding, config)
+    key = (hashlib.blake2b(data, digest_size=16).digest(), encoding)
+    compressed = lru.get(key)
+    if compressed is None:
+        compressed = compress(data, encoding, config)
+        lru.set(key, compressed)
+    return compressed
+
+
+def init_compression(app):
+    app.config.setdefault("COMPRESS_MIN_SIZE", 1024)
+    app.config.setdefault("COMPRESS_MIMETYPES", DEFAULT_MIMETYPES)
+    app.config.setdefault("COMPRESS_LEVEL", 6)
+    app.config.setdefault("COMPRESS_BR_QUALITY", 4)
+    app.config.setdefault("COMPRESS_CACHE_SIZE", 128)
+    app.config.setdefault("COMPRESS_CACHE_MAX_BYTES", 2 * 1024 * 1024)
+
+    lru = CompressedLRU(app.config["COMPRESS_CACHE_SIZE"])
+    app.extensions["compression_lru"] = lru
+
+    @app.after_request
+    def compress_response(response):
+        config = app.config
+        response.vary.add("Accept-Encoding")
+
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in config["COMPRESS_MIMETYPES"]
+        ):
+            return response
+
+        encoding = request.accept_encodings.best_match(available_encodings())
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < config["COMPRESS_MIN_SIZE"]:
+            return response
+
+        # Utamakan simpanan milik entry cache, lalu LRU per proses
+        store = getattr(response, "compression_store", None)
+        if store is not None:
+            compressed = store.get(encoding)
+            if compressed is None:
+                compressed = store[encoding] = compress(data, encoding, config)
+        else:
+            compressed = compress_cached(data, encoding, config, lru)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
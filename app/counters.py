@@ -0,0 +1,212 @@
+"""Counter like ter-shard untuk item yang sedang ramai.
+
+Normalnya like meng-update ``like_count`` di baris karya/video. Saat satu item
+menerima like lebih cepat dari ``COUNTER_HOT_WRITES`` per
+``COUNTER_HOT_WINDOW`` detik, like berikutnya (selama
+``COUNTER_HOT_HOLD_SECONDS``) ditulis sebagai delta ke salah satu dari
+``COUNTER_SHARDS`` slot acak di ``like_counter_shards``, sehingga lock baris
+tersebar ke beberapa baris.
+
+Total like = ``like_count`` + jumlah delta slot. Job ``fold_like_counters``
+memindahkan delta slot kembali ke ``like_count`` secara berkala; listing
+membaca ``like_count`` saja dan tertinggal paling lama satu periode fold.
+``flask counters fold`` mem-fold semua item yang masih punya delta.
+
+Deteksi "ramai" dihitung per proses. ``COUNTER_SHARDS=0`` mematikan fitur ini.
+"""
+import random
+import threading
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.jobs import enqueue, job_handler
+from app.models import LikeCounterShard, karya_seni, ruang_video
+
+COUNTER_MODELS = {"karya": karya_seni, "video": ruang_video}
+
+
+class RateTracker:
+    """Hitung tulis per item dalam jendela tetap; item di atas ambang jadi 'hot'."""
+
+    def __init__(self, threshold, window, hold):
+        self.threshold = threshold
+        self.window = window
+        self.hold = hold
+        self._counts = {}
+        self._hot_until = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            started, count = self._counts.get(key, (now, 0))
+            if now - started >= self.window:
+                started, count = now, 0
+            count += 1
+            self._counts[key] = (started, count)
+            if count >= self.threshold:
+                self._hot_until[key] = now + self.hold
+            hot = self._hot_until.get(key, 0) > now
+            if len(self._counts) > 10000:
+                self._prune(now)
+        return hot
+
+    def _prune(self, now):
+        self._counts = {
+            key: value for key, value in self._counts.items() if now - value[0] < self.window
+        }
+        self._hot_until = {key: until for key, until in self._hot_until.items() if until > now}
+
+
+def init_counters(app):
+    app.config.setdefault("COUNTER_SHARDS", 8)
+    app.config.setdefault("COUNTER_HOT_WRITES", 20)
+    app.config.setdefault("COUNTER_HOT_WINDOW", 10)
+    app.config.setdefault("COUNTER_HOT_HOLD_SECONDS", 300)
+    app.config.setdefault("COUNTER_FOLD_DELAY", 5)
+    app.extensions["counters"] = RateTracker(
+        app.config["COUNTER_HOT_WRITES"],
+        app.config["COUNTER_HOT_WINDOW"],
+        app.config["COUNTER_HOT_HOLD_SECONDS"],
+    )
+
+
+def _add_to_slot(kind, item_id, slot, delta):
+    stmt = (
+        update(LikeCounterShard)
+        .where(
+            LikeCounterShard.kind == kind,
+            LikeCounterShard.item_id == item_id,
+            LikeCounterShard.slot == slot,
+        )
+        .values(delta=LikeCounterShard.delta + delta)
+    )
+    if db.session.execute(stmt).rowcount:
+        return
+    # Slot belum ada; request lain bisa membuatnya bersamaan
+    try:
+        with db.session.begin_nested():
+            db.session.execute(
+                insert(LikeCounterShard).values(
+                    kind=kind, item_id=item_id, slot=slot, delta=delta
+                )
+            )
+    except IntegrityError:
+        db.session.execute(stmt)
+
+
+def add_like(kind, item_id, delta):
+    """Tulis ke slot acak jika item sedang ramai; True jika delta sudah dicatat.
+
+    False berarti pemanggil meng-update ``like_count`` seperti biasa. Tidak
+    commit.
+    """
+    shards = current_app.config["COUNTER_SHARDS"]
+    tracker = current_app.extensions["counters"]
+    if not shards or not tracker.record(f"{kind}:{item_id}"):
+        return False
+    _add_to_slot(kind, item_id, random.randrange(shards), delta)
+    enqueue(
+        "fold_like_counters",
+        {"kind": kind, "item_id": item_id},
+        dedup_key=f"like-fold:{kind}:{item_id}",
+        delay=current_app.config["COUNTER_FOLD_DELAY"],
+    )
+    return True
+
+
+def pending_delta(kind, item_id):
+    return db.session.execute(
+        select(func.coalesce(func.sum(LikeCounterShard.delta), 0)).where(
+            LikeCounterShard.kind == kind, LikeCounterShard.item_id == item_id
+        )
+    ).scalar()
+
+
+def like_total(kind, item_id):
+    """``like_count`` + delta slot yang belum di-fold."""
+    model = COUNTER_MODELS[kind]
+    base = db.session.execute(select(model.like_count).where(model.id == item_id)).scalar()
+    return (base or 0) + pending_delta(kind, item_id)
+
+
+def take_shards(kind, item_id):
+    """Kunci slot item, nolkan, dan kembalikan total delta-nya (tanpa commit)."""
+    slots = db.session.execute(
+        select(LikeCounterShard.slot, LikeCounterShard.delta)
+        .where(LikeCounterShard.kind == kind, LikeCounterShard.item_id == item_id)
+        .with_for_update()
+    ).all()
+    total = sum(delta for _, delta in slots)
+    for slot, delta in slots:
+        if delta:
+            db.session.execute(
+                update(LikeCounterShard)
+                .where(
+                    LikeCounterShard.kind == kind,
+                    LikeCounterShard.item_id == item_id,
+                    LikeCounterShard.slot == slot,
+                )
+                .values(delta=LikeCounterShard.delta - delta)
+            )
+    return total
+
+
+@job_handler("fold_like_counters")
+def fold(kind, item_id):
+    """Pindahkan delta slot ke ``like_count``; kembalikan like_count baru."""
+    from app.cache import invalidate
+    from app.feed import set_like_count
+    from app.realtime import publish_like
+
+    model = COUNTER_MODELS[kind]
+    total = take_shards(kind, item_id)
+    item = db.session.get(model, item_id)
+    if item is None:
+        db.session.commit()
+        return None
+    if total:
+        # Like bukan edit konten: updated_at dipertahankan (menahan onupdate)
+        new_count = func.coalesce(model.like_count, 0) + total
+        db.session.execute(
+            update(model)
+            .where(model.id == item_id)
+            .values(
+                like_count=case((new_count < 0, 0), else_=new_count),
+                updated_at=model.updated_at,
+            )
+        )
+        db.session.refresh(item)
+        if kind == "karya":
+            set_like_count(item)
+    db.session.commit()
+    invalidate(f"{kind}:{item_id}")
+    publish_like(kind, item_id, item.like_count)
+    return item.like_count
+
+
+def fold_all():
+    """Fold semua item yang masih punya delta; kembalikan jumlah item."""
+    pending = db.session.execute(
+        select(LikeCounterShard.kind, LikeCounterShard.item_id)
+        .where(LikeCounterShard.delta != 0)
+        .distinct()
+    ).all()
+    for kind, item_id in pending:
+        fold(kind, item_id)
+    return len(pending)
+
+
+counters_cli = AppGroup("counters", help="Kelola counter like ter-shard.")
+
+
+@counters_cli.command("fold")
+def fold_command():
+    """Pindahkan semua delta slot ke kolom like_count."""
+    click.echo(f"{fold_all()} item di-fold")
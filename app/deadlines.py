@@ -0,0 +1,141 @@
+"""Deadline per request dan batas waktu statement database.
+
+Setiap request /api punya deadline ``REQUEST_DEADLINE_SECONDS``, atau nilai
+per route yang ditandai tepat di bawah decorator route::
+
+    @karya_seni_bp.route("", methods=["GET"])
+    @deadline(3)
+    def get_all_karya():
+        ...
+
+Statement database memakai sisa waktu sampai deadline itu:
+
+* MySQL: hint ``/*+ MAX_EXECUTION_TIME(ms) */`` pada SELECT (MariaDB:
+  ``SET STATEMENT max_statement_time=... FOR``);
+* SQLite: progress handler yang menghentikan statement begitu deadline lewat;
+* dialek lain: statement yang dimulai setelah deadline lewat ditolak.
+
+Request yang melewati deadline dibalas 504 dan dicatat di metrik
+``deadline_exceeded``. Body response streaming (SSE, export) berjalan di luar
+deadline. ``deadline(0)`` mematikan deadline untuk route tersebut.
+"""
+import time
+
+from flask import current_app, g, has_request_context, jsonify, request
+from sqlalchemy import event
+
+from app import db
+from app.metrics import incr
+
+# Kode error MySQL/MariaDB untuk statement yang dihentikan karena timeout
+TIMEOUT_ERRORS = {3024, 1969}
+SQLITE_PROGRESS_STEPS = 10000
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def deadline(seconds):
+    def decorator(fn):
+        fn.deadline = seconds
+        return fn
+
+    return decorator
+
+
+def remaining():
+    """Sisa detik sampai deadline request ini, atau None jika tanpa deadline."""
+    if not has_request_context():
+        return None
+    expires = g.get("deadline_at")
+    return None if expires is None else expires - time.monotonic()
+
+
+def _exceeded():
+    if not g.get("deadline_hit"):
+        g.deadline_hit = True
+        incr("deadline_exceeded", route=request.endpoint)
+
+
+def before_execute(conn, cursor, statement, parameters, context, executemany):
+    left = remaining()
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        dbapi = conn.connection.dbapi_connection
+        if left is not None:
+            expires = g.deadline_at
+            dbapi.set_progress_handler(lambda: int(time.monotonic() >= expires), SQLITE_PROGRESS_STEPS)
+            conn.info["deadline_handler"] = True
+        elif conn.info.pop("deadline_handler", False):
+            dbapi.set_progress_handler(None, 0)
+    if left is None:
+        return statement, parameters
+    if left <= 0:
+        _exceeded()
+        raise DeadlineExceeded()
+
+    return with_statement_timeout(statement, dialect, max(1, int(left * 1000))), parameters
+
+
+def with_statement_timeout(statement, dialect, ms):
+    """SELECT dengan batas waktu ``ms`` untuk MySQL/MariaDB; dialek lain apa adanya.
+
+    Teks hasilnya berbeda untuk tiap ``ms``; listener lain yang butuh teks asli
+    (mis. app/slowlog.py) membaca ``context.statement``.
+    """
+    if statement.lstrip()[:6].upper() != "SELECT":
+        return statement
+    if dialect == "mysql":
+        return statement.lstrip().replace("SELECT", f"SELECT /*+ MAX_EXECUTION_TIME({ms}) */", 1)
+    if dialect == "mariadb":
+        return f"SET STATEMENT max_statement_time={ms / 1000:.3f} FOR {statement}"
+    return statement
+
+
+def handle_error(context):
+    if not has_request_context() or g.get("deadline_at") is None:
+        return None
+    error = context.original_exception
+    args = getattr(error, "args", ())
+    timed_out = (args and args[0] in TIMEOUT_ERRORS) or "interrupted" in str(error)
+    if timed_out and remaining() <= 0:
+        _exceeded()
+        return DeadlineExceeded()
+    return None
+
+
+def _timeout_response():
+    response = jsonify({"message": "Request melebihi batas waktu"})
+    response.status_code = 504
+    return response
+
+
+def init_deadlines(app):
+    app.config.setdefault("REQUEST_DEADLINE_SECONDS", 10)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_execute, retval=True)
+    event.listen(engine, "handle_error", handle_error)
+
+    @app.before_request
+    def start_deadline():
+        view = current_app.view_functions.get(request.endpoint)
+        seconds = getattr(view, "deadline", current_app.config["REQUEST_DEADLINE_SECONDS"])
+        if seconds:
+            g.deadline_at = time.monotonic() + seconds
+
+    @app.errorhandler(DeadlineExceeded)
+    def deadline_exceeded(error):
+        db.session.rollback()
+        return _timeout_response()
+
+    @app.after_request
+    def finish_deadline(response):
+        g.pop("deadline_at", None)
+        # Route yang menangkap semua Exception mengubah timeout jadi 500
+        if g.pop("deadline_hit", False) and response.status_code >= 500:
+            db.session.rollback()
+            return _timeout_response()
+        return response
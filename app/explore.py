@@ -0,0 +1,106 @@
+"""Sampling acak untuk halaman explore tanpa ``ORDER BY RAND()``.
+
+Id karya/video yang masih hidup disimpan di memori sebagai array terurut yang
+dibangun ulang tiap ``EXPLORE_REFRESH_SECONDS`` (satu scan index id). Urutan
+per ``seed`` di atas array itu didapat saat dibaca dari permutasi aritmetika
+``posisi(i) = (start + i * stride) mod n`` dengan ``stride`` koprima dengan
+``n``: setiap posisi muncul tepat sekali, sehingga halaman berikutnya
+(``offset``) untuk seed yang sama tidak berulang, dan tiap item dihitung O(1).
+
+Snapshot dibangun per proses, tetapi isinya terurut dan versinya hash dari
+isinya, jadi semua worker dengan data yang sama menghasilkan urutan dan versi
+yang sama. Cursor halaman menyimpan versi snapshot; cursor dari snapshot lama
+ditolak (lihat app/routes/explore.py). Baris yang terhapus setelah snapshot
+dibuat disaring saat baris diambil dari database.
+"""
+import hashlib
+import math
+import threading
+import time
+from array import array
+
+from flask import current_app
+from sqlalchemy import select
+
+from app import db
+from app.models import KaryaFeed, ruang_video
+
+# Tipe item -> query id yang masih hidup (karya_feed hanya berisi karya hidup)
+SOURCES = {
+    "karya": lambda: select(KaryaFeed.id).order_by(KaryaFeed.id),
+    "video": lambda: select(ruang_video.id)
+    .where(ruang_video.deleted_at.is_(None))
+    .order_by(ruang_video.id),
+}
+
+
+class Snapshot:
+    def __init__(self, entries, built_at):
+        # entries: (tipe, id) terurut; id disimpan sebagai array ringkas
+        self.types = [kind for kind, _ in entries]
+        self.ids = array("q", (item_id for _, item_id in entries))
+        self.built_at = built_at
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(",".join(self.types).encode())
+        digest.update(self.ids.tobytes())
+        self.version = digest.hexdigest()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, position):
+        return self.types[position], self.ids[position]
+
+
+class ExploreIndex:
+    def __init__(self, refresh_seconds):
+        self.refresh_seconds = refresh_seconds
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self, kinds):
+        key = tuple(sorted(kinds))
+        current = self._snapshots.get(key)
+        if current is not None and time.time() - current.built_at < self.refresh_seconds:
+            return current
+        with self._lock:
+            current = self._snapshots.get(key)
+            if current is None or time.time() - current.built_at >= self.refresh_seconds:
+                entries = [
+                    (kind, item_id)
+                    for kind in key
+                    for item_id in db.session.execute(SOURCES[kind]()).scalars()
+                ]
+                current = Snapshot(entries, time.time())
+                self._snapshots[key] = current
+        return current
+
+
+def permutation(seed, n):
+    """(start, stride) dari seed; stride koprima dengan n."""
+    digest = hashlib.blake2b(str(seed).encode(), digest_size=16).digest()
+    start = int.from_bytes(digest[:8], "big") % n
+    if n <= 2:
+        return start, 1
+    stride = int.from_bytes(digest[8:], "big") % (n - 1) + 1
+    while math.gcd(stride, n) != 1:
+        stride = stride % (n - 1) + 1
+    return start, stride
+
+
+def sample(kinds, seed, offset, limit):
+    """Kembalikan (entries, offset berikutnya atau None, versi snapshot)."""
+    index = current_app.extensions["explore"]
+    snapshot = index.snapshot(kinds)
+    n = len(snapshot)
+    if offset >= n:
+        return [], None, snapshot.version
+    start, stride = permutation(seed, n)
+    end = min(offset + limit, n)
+    entries = [snapshot[(start + i * stride) % n] for i in range(offset, end)]
+    return entries, (end if end < n else None), snapshot.version
+
+
+def init_explore(app):
+    app.config.setdefault("EXPLORE_REFRESH_SECONDS", 300)
+    app.extensions["explore"] = ExploreIndex(app.config["EXPLORE_REFRESH_SECONDS"])
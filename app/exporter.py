@@ -0,0 +1,109 @@
+"""Export katalog sebagai NDJSON/CSV secara streaming.
+
+Baris dibaca lewat server-side cursor (``stream_results`` + ``yield_per``) pada
+koneksi tersendiri, jadi memori worker tetap konstan berapa pun jumlah barisnya.
+"""
+import csv
+import io
+import json
+import sys
+from datetime import date, datetime
+
+import click
+from flask import current_app
+from sqlalchemy import select
+
+from app import db
+from app.models import LikeVideo, User, karya_seni, ruang_video
+
+# Hanya kolom yang terdaftar di sini yang ikut di-export; kolom baru di model
+# (mis. data pribadi) tidak otomatis bocor ke file export
+EXPORTS = {
+    "karya_seni": (
+        karya_seni,
+        ("id", "user_id", "judul_karya", "deskripsi", "link_foto", "like_count",
+         "created_at", "updated_at", "deleted_at"),
+    ),
+    "ruang_video": (
+        ruang_video,
+        ("id", "user_id", "judul", "link_youtube", "link_thumbnail", "deskripsi",
+         "dibuat_oleh", "like_count", "created_at", "updated_at", "deleted_at"),
+    ),
+    "users": (
+        User,
+        ("id", "username", "nama_lengkap", "lokasi", "created_at", "updated_at", "deleted_at"),
+    ),
+    "like_video": (LikeVideo, ("id", "user_id", "video_id", "created_at")),
+}
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_columns(resource):
+    model, names = EXPORTS[resource]
+    return [model.__table__.c[name] for name in names]
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} tidak bisa di-serialisasi")
+
+
+def iter_rows(resource, include_deleted=False, batch_size=1000):
+    columns = export_columns(resource)
+    table = EXPORTS[resource][0].__table__
+    query = select(*columns).order_by(table.c.id)
+    if not include_deleted and "deleted_at" in table.c:
+        query = query.where(table.c.deleted_at.is_(None))
+
+    with db.engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=batch_size
+        ).execute(query)
+        for partition in result.partitions():
+            yield partition
+
+
+def iter_export(resource, fmt="ndjson", include_deleted=False, batch_size=1000):
+    """Generator chunk teks (satu chunk per batch) untuk response/file."""
+    names = [c.name for c in export_columns(resource)]
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+        yield buffer.getvalue()
+        for partition in iter_rows(resource, include_deleted, batch_size):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                [v.isoformat() if isinstance(v, datetime) else v for v in row]
+                for row in partition
+            )
+            yield buffer.getvalue()
+        return
+
+    for partition in iter_rows(resource, include_deleted, batch_size):
+        yield "".join(
+            json.dumps(dict(zip(names, row)), default=_json_default) + "\n"
+            for row in partition
+        )
+
+
+@click.command("export")
+@click.argument("resource", type=click.Choice(sorted(EXPORTS)))
+@click.option("--format", "fmt", type=click.Choice(sorted(FORMATS)), default="ndjson", show_default=True)
+@click.option("--output", "-o", type=click.Path(dir_okay=False), default="-", help="File tujuan (default stdout).")
+@click.option("--include-deleted", is_flag=True, help="Ikutkan baris soft-delete.")
+@click.option("--batch-size", default=1000, show_default=True, type=int)
+def export_command(resource, fmt, output, include_deleted, batch_size):
+    """Export tabel sebagai NDJSON atau CSV."""
+    stream = sys.stdout if output == "-" else open(output, "w", newline="", encoding="utf-8")
+    try:
+        for chunk in iter_export(resource, fmt, include_deleted, batch_size):
+            stream.write(chunk)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    if output != "-":
+        current_app.logger.info("Export %s selesai: %s", resource, output)
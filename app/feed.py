@@ -0,0 +1,121 @@
+"""Read model ``karya_feed`` untuk listing karya tanpa join ke ``users``.
+
+Setiap baris berisi kolom karya plus username dan foto profil artist-nya.
+Tabel ini di-maintain eksplisit di jalur tulis, dalam transaksi yang sama
+dengan perubahan sumbernya:
+
+* ``sync_karya(kondisi)`` memproyeksikan ulang karya yang cocok (create,
+  update, delete, import, restore arsip)
+* ``set_like_count`` untuk like/unlike
+* ``sync_artists(kondisi)`` saat user mengganti username/foto
+
+``flask feed rebuild`` membangun ulang seluruh tabel dari sumbernya tanpa
+mengosongkannya lebih dulu.
+"""
+import click
+from flask.cli import AppGroup
+from sqlalchemy import delete, func, insert, select, update
+
+from app import db
+from app.models import KaryaFeed, User, karya_seni
+
+KARYA_COLUMNS = (
+    "id",
+    "user_id",
+    "judul_karya",
+    "deskripsi",
+    "link_foto",
+    "link_whatsapp",
+    "like_count",
+    "foto_width",
+    "foto_height",
+    "foto_color",
+    "foto_blurhash",
+    "created_at",
+    "updated_at",
+)
+
+
+def _projection(condition):
+    k = karya_seni.__table__
+    return (
+        select(*[k.c[name] for name in KARYA_COLUMNS], User.username, User.foto_profil)
+        .select_from(k.outerjoin(User, User.id == k.c.user_id))
+        .where(condition, k.c.deleted_at.is_(None))
+    )
+
+
+def sync_karya(condition):
+    """Proyeksikan ulang karya yang cocok ``condition`` (ekspresi atas karya_seni).
+
+    Tidak commit; dipanggil sebelum commit transaksi penulisnya.
+    """
+    db.session.flush()
+    ids = select(karya_seni.id).where(condition)
+    db.session.execute(delete(KaryaFeed).where(KaryaFeed.id.in_(ids)))
+    db.session.execute(
+        insert(KaryaFeed).from_select(
+            KARYA_COLUMNS + ("artist_username", "artist_foto"), _projection(condition)
+        )
+    )
+
+
+def set_like_count(karya):
+    """Like/unlike cukup update dua kolom, tanpa proyeksi ulang."""
+    db.session.execute(
+        update(KaryaFeed)
+        .where(KaryaFeed.id == karya.id)
+        .values(like_count=karya.like_count, updated_at=karya.updated_at)
+    )
+
+
+def sync_artists(condition):
+    """Samakan username/foto artist di baris feed milik user yang cocok ``condition``."""
+    db.session.flush()
+    db.session.execute(
+        update(KaryaFeed)
+        .where(KaryaFeed.user_id.in_(select(User.id).where(condition)))
+        .values(
+            artist_username=select(User.username)
+            .where(User.id == KaryaFeed.user_id)
+            .scalar_subquery(),
+            artist_foto=select(User.foto_profil)
+            .where(User.id == KaryaFeed.user_id)
+            .scalar_subquery(),
+        )
+    )
+
+
+def rebuild(batch_size=1000):
+    """Bangun ulang seluruh feed per batch id; kembalikan jumlah baris feed.
+
+    Tabel tidak dikosongkan dulu: tiap batch dihapus dan diisi ulang dalam
+    satu transaksi, sehingga listing tetap lengkap selama rebuild berjalan.
+    Baris feed tanpa karya sumber (mis. sudah diarsipkan) dibuang di akhir.
+    """
+    after_id = 0
+    while True:
+        ids = db.session.execute(
+            select(karya_seni.id)
+            .where(karya_seni.id > after_id)
+            .order_by(karya_seni.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+        sync_karya(karya_seni.id.between(ids[0], ids[-1]))
+        db.session.commit()
+        after_id = ids[-1]
+    db.session.execute(delete(KaryaFeed).where(KaryaFeed.id.not_in(select(karya_seni.id))))
+    db.session.commit()
+    return db.session.execute(select(func.count()).select_from(KaryaFeed)).scalar()
+
+
+feed_cli = AppGroup("feed", help="Kelola read model karya_feed.")
+
+
+@feed_cli.command("rebuild")
+@click.option("--batch-size", default=1000, show_default=True, type=int)
+def rebuild_command(batch_size):
+    """Bangun ulang karya_feed dari karya_seni dan users."""
+    click.echo(f"karya_feed: {rebuild(batch_size)} baris")
@@ -0,0 +1,124 @@
+"""Sparse fieldset: ``?fields=id,judul_karya,link_foto``.
+
+Setiap endpoint mendefinisikan ``Fieldset`` berisi key response yang boleh
+diminta, kolom yang dibutuhkan key tersebut, dan fungsi pengambil nilainya.
+Field yang diminta divalidasi terhadap whitelist itu lalu dipakai untuk
+``load_only`` (kolom SELECT) sekaligus key yang diserialisasi, sehingga kolom
+Text seperti ``deskripsi`` tidak ikut di-load kalau tidak ditampilkan.
+
+Serializer untuk tiap kombinasi key dikompilasi sekali (``attrgetter`` untuk
+kolom polos) dan ``serialize_many`` memproses satu batch baris sekaligus.
+"""
+from operator import attrgetter
+
+from flask import abort, jsonify, make_response, request
+from sqlalchemy.orm import load_only
+
+MAX_PLANS = 256
+
+# Semua Fieldset yang pernah dibuat; plan default-nya dikompilasi saat warm-up
+FIELDSETS = []
+
+
+class Field:
+    def __init__(self, getter, columns=(), attr=None, transform=None):
+        self.getter = getter
+        self.columns = tuple(columns)
+        # Diisi oleh column(): field yang bisa dibaca lewat attrgetter
+        self.attr = attr
+        self.transform = transform
+
+
+def column(name, transform=None):
+    """Field yang langsung membaca satu kolom model."""
+    get = attrgetter(name)
+    if transform is None:
+        return Field(lambda obj, ctx: get(obj), (name,), attr=name)
+    return Field(lambda obj, ctx: transform(get(obj)), (name,), attr=name, transform=transform)
+
+
+class Fieldset:
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+        self._plans = {}
+        FIELDSETS.append(self)
+
+    def requested(self):
+        """Key dari ``?fields=``; semua key jika parameter tidak dikirim."""
+        raw = request.args.get("fields")
+        if not raw:
+            return list(self.fields)
+        keys = list(dict.fromkeys(k.strip() for k in raw.split(",") if k.strip()))
+        unknown = [k for k in keys if k not in self.fields]
+        if unknown or not keys:
+            abort(
+                make_response(
+                    jsonify(
+                        {
+                            "message": "Field tidak dikenal: " + ", ".join(unknown),
+                            "allowed_fields": list(self.fields),
+                        }
+                    ),
+                    400,
+                )
+            )
+        return keys
+
+    def load_only(self, keys):
+        columns = {"id"}
+        for key in keys:
+            columns.update(self.fields[key].columns)
+        return load_only(*[getattr(self.model, name) for name in sorted(columns)])
+
+    def _plan(self, keys):
+        """Serializer terkompilasi untuk kombinasi key ini (di-cache per Fieldset).
+
+        Kolom tanpa transform dibaca sekaligus dengan satu ``attrgetter``;
+        sisanya memakai transform atau getter field-nya.
+        """
+        keys = tuple(keys)
+        plan = self._plans.get(keys)
+        if plan is not None:
+            return plan
+
+        plain = [key for key in keys if self.fields[key].attr and not self.fields[key].transform]
+        transformed = [
+            (key, attrgetter(self.fields[key].attr), self.fields[key].transform)
+            for key in keys
+            if self.fields[key].attr and self.fields[key].transform
+        ]
+        custom = [(key, self.fields[key].getter) for key in keys if not self.fields[key].attr]
+        get_plain = attrgetter(*[self.fields[key].attr for key in plain]) if plain else None
+        single = len(plain) == 1
+
+        def serialize_many(rows, ctx):
+            result = []
+            for obj in rows:
+                if get_plain is None:
+                    item = {}
+                elif single:
+                    item = {plain[0]: get_plain(obj)}
+                else:
+                    item = dict(zip(plain, get_plain(obj)))
+                for key, get, transform in transformed:
+                    item[key] = transform(get(obj))
+                for key, getter in custom:
+                    item[key] = getter(obj, ctx)
+                result.append(item)
+            return result
+
+        # Kombinasi ?fields= dari klien tidak terbatas; cache secukupnya
+        if len(self._plans) < MAX_PLANS:
+            self._plans[keys] = serialize_many
+        return serialize_many
+
+    def precompile(self):
+        """Kompilasi plan untuk semua key (request tanpa ``?fields=``)."""
+        self._plan(list(self.fields))
+
+    def serialize_many(self, rows, keys, ctx=None):
+        return self._plan(keys)(rows, ctx)
+
+    def serialize(self, obj, keys, ctx=None):
+        return self._plan(keys)([obj], ctx)[0]
@@ -0,0 +1,114 @@
+"""Dukungan header ``Idempotency-Key`` untuk endpoint create.
+
+Response pertama untuk sebuah key disimpan di store bersama cache (app/cache.py)
+selama ``IDEMPOTENCY_TTL`` detik; request ulang dengan key yang sama
+mendapat response itu tanpa menjalankan handler lagi (header
+``Idempotent-Replayed: true``). Key dikunci dengan SET NX sebelum handler
+jalan, jadi duplikat yang datang bersamaan menunggu hasil request pertama
+(maksimal ``IDEMPOTENCY_WAIT_SECONDS``).
+
+Key berlaku per user dan per route. Key yang sama dengan isi request berbeda
+ditolak dengan 422. Response error (4xx/5xx) tidak disimpan supaya bisa dicoba lagi.
+
+SET NX di ``LocalStore`` hanya berlaku di satu proses. Jika store tidak dibagi
+antar worker (``ResponseCache.shared`` False, lihat app/cache.py), header
+diabaikan dan request diproses biasa.
+"""
+import base64
+import hashlib
+import json
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def fingerprint():
+    """Hash isi request tanpa membaca ulang byte file upload."""
+    digest = hashlib.sha256(f"{request.method} {request.path}".encode())
+    for key, value in sorted(request.form.items(multi=True)):
+        digest.update(f"f:{key}={value}\n".encode())
+    for key, file in sorted(request.files.items(multi=True)):
+        digest.update(f"u:{key}={file.filename}:{file.mimetype}\n".encode())
+    if request.is_json:
+        body = request.get_json(silent=True)
+        digest.update(json.dumps(body, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _replay(record):
+    response = current_app.response_class(
+        base64.b64decode(record["body"]), status=record["status"], mimetype=record["mimetype"]
+    )
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(fn):
+    """Pasang di bawah ``token_required``; argumen pertama view adalah user login."""
+
+    @wraps(fn)
+    def wrapper(current_user, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return fn(current_user, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({"message": f"{HEADER} maksimal {MAX_KEY_LENGTH} karakter"}), 400
+
+        cache = current_app.extensions["cache"]
+        if not cache.shared:
+            return fn(current_user, *args, **kwargs)
+        config = current_app.config
+        store = cache.store
+        store_key = f"idem:{current_user.id}:{request.endpoint}:{key}"
+        fp = fingerprint()
+
+        pending = json.dumps({"state": "pending", "fp": fp}).encode()
+        if not store.add(store_key, pending, ex=config["IDEMPOTENCY_LOCK_SECONDS"]):
+            deadline = time.monotonic() + config["IDEMPOTENCY_WAIT_SECONDS"]
+            while True:
+                raw = store.get(store_key)
+                if raw is None:
+                    # Request pertama gagal atau lock kedaluwarsa: ambil alih
+                    if store.add(store_key, pending, ex=config["IDEMPOTENCY_LOCK_SECONDS"]):
+                        break
+                    continue
+                record = json.loads(raw)
+                if record["fp"] != fp:
+                    return jsonify({"message": f"{HEADER} sudah dipakai untuk request lain"}), 422
+                if record["state"] == "done":
+                    return _replay(record)
+                if time.monotonic() >= deadline:
+                    return jsonify({"message": "Request dengan key yang sama masih diproses"}), 409
+                time.sleep(0.1)
+
+        try:
+            response = current_app.make_response(fn(current_user, *args, **kwargs))
+        except Exception:
+            store.delete(store_key)
+            raise
+
+        # Hanya hasil sukses yang dipakai ulang; error boleh dicoba lagi dengan body yang diperbaiki
+        if response.status_code >= 400 or response.is_streamed:
+            store.delete(store_key)
+            return response
+        record = {
+            "state": "done",
+            "fp": fp,
+            "status": response.status_code,
+            "mimetype": response.mimetype,
+            "body": base64.b64encode(response.get_data()).decode(),
+        }
+        store.set(store_key, json.dumps(record).encode(), ex=config["IDEMPOTENCY_TTL"])
+        return response
+
+    return wrapper
+
+
+def init_idempotency(app):
+    app.config.setdefault("IDEMPOTENCY_TTL", 24 * 3600)
+    app.config.setdefault("IDEMPOTENCY_LOCK_SECONDS", 60)
+    app.config.setdefault("IDEMPOTENCY_WAIT_SECONDS", 10)
@@ -0,0 +1,204 @@
+"""Metadata gambar karya: ukuran, warna dominan dan blurhash.
+
+Dengan ``foto_width``/``foto_height`` frontend bisa menyusun grid sebelum
+gambar selesai diunduh, dan ``foto_color``/``foto_blurhash`` dipakai sebagai
+placeholder. Nilainya diisi saat upload (create/update karya, bulk import).
+File yang diupload lewat presigned URL diproses job
+``extract_image_metadata``. ``flask images backfill`` mengisi karya lama.
+
+Butuh Pillow (``pip install -r requirements-images.txt``). Tanpa Pillow,
+metadata dibiarkan kosong.
+"""
+import math
+import warnings
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select
+
+from app import db
+from app.cache import invalidate
+from app.feed import sync_karya
+from app.jobs import job_handler
+from app.models import karya_seni
+from app.storage import get_storage
+from app.uploads import local_path
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+# Ukuran sampel untuk warna dan blurhash; detail lebih dari ini tidak terlihat
+SAMPLE_SIZE = 32
+BLURHASH_COMPONENTS = (4, 3)
+# Gambar di atas ini (setelah draft) tidak di-decode: PNG/WebP tidak punya
+# decode resolusi kecil seperti JPEG, jadi hanya ukurannya yang disimpan
+MAX_DECODE_PIXELS = 4096 * 4096
+# Tag EXIF orientation yang memutar gambar 90/270 derajat
+ROTATED = {5, 6, 7, 8}
+METADATA_COLUMNS = ("foto_width", "foto_height", "foto_color", "foto_blurhash")
+
+
+def _base83(value, length):
+    return "".join(BASE83[(value // 83 ** (length - 1 - i)) % 83] for i in range(length))
+
+
+def _to_linear(value):
+    value /= 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _to_srgb(value):
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(image, x_components=4, y_components=3):
+    """Encode gambar RGB kecil menjadi string blurhash (https://blurha.sh)."""
+    width, height = image.size
+    data = image.tobytes()
+    pixels = [tuple(_to_linear(c) for c in data[i : i + 3]) for i in range(0, len(data), 3)]
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            scale = (1 if i == 0 and j == 0 else 2) / (width * height)
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                by = cos_y[j][y]
+                for x in range(width):
+                    basis = by * cos_x[i][x]
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        quantised = max(0, min(82, int(max(abs(v) for f in ac for v in f) * 166 - 0.5)))
+        max_value = (quantised + 1) / 166
+        result += _base83(quantised, 1)
+    else:
+        max_value = 1
+        result += _base83(0, 1)
+    result += _base83((_to_srgb(dc[0]) << 16) + (_to_srgb(dc[1]) << 8) + _to_srgb(dc[2]), 4)
+    for factor in ac:
+        r, g, b = (
+            max(0, min(18, int(math.floor(math.copysign(abs(v / max_value) ** 0.5, v) * 9 + 9.5))))
+            for v in factor
+        )
+        result += _base83(r * 19 * 19 + g * 19 + b, 2)
+    return result
+
+
+def image_metadata(fileobj):
+    """Kolom ``foto_*`` dari file gambar; dict kosong jika tidak bisa dibaca.
+
+    Posisi ``fileobj`` dikembalikan seperti semula supaya bisa langsung disimpan.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return {}
+
+    position = fileobj.tell()
+    try:
+        with warnings.catch_warnings():
+            # Batas decode dicek sendiri di bawah (MAX_DECODE_PIXELS)
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            image = Image.open(fileobj)
+        with image:
+            width, height = image.size
+            if image.getexif().get(0x0112) in ROTATED:
+                width, height = height, width
+            # JPEG cukup di-decode pada resolusi kecil
+            image.draft("RGB", (SAMPLE_SIZE * 2, SAMPLE_SIZE * 2))
+            if image.size[0] * image.size[1] > MAX_DECODE_PIXELS:
+                return {"foto_width": width, "foto_height": height}
+            sample = image.convert("RGB")
+        sample.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE))
+        palette = sample.quantize(colors=5)
+        _, index = max(palette.getcolors())
+        red, green, blue = palette.getpalette()[index * 3 : index * 3 + 3]
+        return {
+            "foto_width": width,
+            "foto_height": height,
+            "foto_color": f"#{red:02x}{green:02x}{blue:02x}",
+            "foto_blurhash": blurhash(sample, *BLURHASH_COMPONENTS),
+        }
+    except Exception:
+        return {}
+    finally:
+        fileobj.seek(position)
+
+
+def apply_metadata(karya, metadata):
+    """Set semua kolom ``foto_*``; kolom yang tidak ada di ``metadata`` dikosongkan."""
+    for name in METADATA_COLUMNS:
+        setattr(karya, name, metadata.get(name))
+
+
+@job_handler("extract_image_metadata")
+def extract_image_metadata(karya_id, key):
+    """Untuk foto yang diupload langsung ke storage (presigned URL)."""
+    karya = db.session.get(karya_seni, karya_id)
+    if karya is None or karya.deleted_at is not None:
+        return
+    with get_storage().open(key) as f:
+        metadata = image_metadata(f)
+    if not metadata:
+        return
+    apply_metadata(karya, metadata)
+    sync_karya(karya_seni.id == karya_id)
+    db.session.commit()
+    invalidate("karya", f"karya:{karya_id}", f"user:{karya.user_id}:content")
+
+
+images_cli = AppGroup("images", help="Metadata gambar karya")
+
+
+@images_cli.command("backfill")
+@click.option("--batch-size", default=200, show_default=True)
+@click.option("--force", is_flag=True, help="Hitung ulang karya yang sudah punya metadata")
+def backfill_command(batch_size, force):
+    """Isi metadata foto karya lama dari file di static/uploads."""
+    last_id, updated, skipped = 0, 0, 0
+    while True:
+        query = select(karya_seni).where(
+            karya_seni.id > last_id, karya_seni.deleted_at.is_(None)
+        )
+        if not force:
+            query = query.where(karya_seni.foto_width.is_(None))
+        batch = db.session.scalars(query.order_by(karya_seni.id).limit(batch_size)).all()
+        if not batch:
+            break
+        changed = []
+        for karya in batch:
+            metadata = {}
+            # Hanya file lokal; URL penuh (S3 dll.) dilewati
+            if karya.link_foto and "://" not in karya.link_foto:
+                try:
+                    with open(local_path(karya.link_foto), "rb") as f:
+                        metadata = image_metadata(f)
+                except OSError:
+                    pass
+            if metadata:
+                apply_metadata(karya, metadata)
+                changed.append(karya)
+            else:
+                skipped += 1
+        last_id = batch[-1].id
+        if changed:
+            sync_karya(karya_seni.id.in_([karya.id for karya in changed]))
+        tags = {f"karya:{karya.id}" for karya in changed}
+        tags |= {f"user:{karya.user_id}:content" for karya in changed}
+        db.session.commit()
+        if tags:
+            invalidate("karya", *tags)
+        updated += len(changed)
+        click.echo(f"... sampai id {last_id}: {updated} diperbarui, {skipped} dilewati")
+    click.echo(f"Selesai: {updated} karya diperbarui, {skipped} dilewati")
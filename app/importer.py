@@ -0,0 +1,302 @@
+"""Import massal karya seni (zip gambar + manifest) dan ruang video (batch JSON).
+
+Semua baris divalidasi dulu; baris yang valid lalu disimpan dengan file gambar
+ditulis paralel dan INSERT executemany per chunk (satu transaksi per chunk).
+Hasilnya laporan per baris.
+
+Sebelum ada member yang dibaca, jumlah file (``IMPORT_MAX_FILES``) dan total
+ukuran setelah dekompresi (``IMPORT_MAX_UNCOMPRESSED_MB``) dicek dari header
+zip. ``zipfile`` tidak pernah mengeluarkan data melebihi ukuran di header,
+jadi zip bomb ditolak tanpa didekompresi.
+"""
+import csv
+import io
+import json
+import mimetypes
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import and_, insert
+
+from app import db
+from app.feed import sync_karya
+from app.images import METADATA_COLUMNS, image_metadata
+from app.models import User, karya_seni, ruang_video
+from app.storage import get_storage
+from app.uploads import new_key
+
+IMPORT_MAX_FILES = 2000
+IMPORT_MAX_UNCOMPRESSED_MB = 1024
+
+KARYA_REQUIRED = ("judul_karya", "foto")
+VIDEO_REQUIRED = ("judul", "link_youtube", "link_thumbnail", "dibuat_oleh")
+
+
+class BulkImportError(ValueError):
+    """Input import tidak bisa diproses sama sekali (mis. manifest tidak ada)."""
+
+
+def check_archive(archive):
+    config = current_app.config
+    max_files = config.get("IMPORT_MAX_FILES", IMPORT_MAX_FILES)
+    max_mb = config.get("IMPORT_MAX_UNCOMPRESSED_MB", IMPORT_MAX_UNCOMPRESSED_MB)
+    members = archive.infolist()
+    if len(members) > max_files:
+        raise BulkImportError(f"Zip berisi lebih dari {max_files} file")
+    if sum(info.file_size for info in members) > max_mb * 1024 * 1024:
+        raise BulkImportError(f"Total ukuran isi zip melebihi {max_mb} MB")
+
+
+def read_manifest(archive):
+    names = set(archive.namelist())
+    if "manifest.json" in names:
+        try:
+            data = json.loads(archive.read("manifest.json"))
+        except ValueError:
+            raise BulkImportError("manifest.json bukan JSON yang valid")
+        if not isinstance(data, dict):
+            return data
+        if "items" not in data:
+            raise BulkImportError('manifest.json harus berupa list atau {"items": [...]}')
+        return data["items"]
+    if "manifest.csv" in names:
+        try:
+            text = archive.read("manifest.csv").decode("utf-8-sig")
+            return list(csv.DictReader(io.StringIO(text)))
+        except (UnicodeDecodeError, csv.Error):
+            raise BulkImportError("manifest.csv harus CSV UTF-8 yang valid")
+    raise BulkImportError("Zip harus berisi manifest.json atau manifest.csv")
+
+
+def _missing(item, required):
+    return [f"Field {name} wajib diisi" for name in required if not item.get(name)]
+
+
+def validate_karya(items, archive, allowed_extensions):
+    names = set(archive.namelist())
+    report, valid = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            report.append({"row": index, "status": "error", "errors": ["Item harus object"]})
+            continue
+        errors = _missing(item, KARYA_REQUIRED)
+        foto = item.get("foto")
+        if foto:
+            ext = foto.rsplit(".", 1)[-1].lower() if "." in foto else ""
+            if ext not in allowed_extensions:
+                errors.append(f"Ekstensi file {foto} tidak diizinkan")
+            elif foto not in names:
+                errors.append(f"File {foto} tidak ada di zip")
+        report.append({"row": index, "status": "error" if errors else "pending", "errors": errors})
+        if not errors:
+            valid.append(index)
+    return report, valid
+
+
+def validate_videos(items):
+    report, valid = [], []
+    for index, item in enumerate(items):
+        errors = _missing(item, VIDEO_REQUIRED) if isinstance(item, dict) else ["Item harus object"]
+        report.append({"row": index, "status": "error" if errors else "pending", "errors": errors})
+        if not errors:
+            valid.append(index)
+    return report, valid
+
+
+def _insert_chunks(model, rows, indices, report, chunk_size):
+    """INSERT per chunk; kembalikan index baris yang gagal disimpan."""
+    failed = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        chunk_indices = indices[start:start + chunk_size]
+        try:
+            db.session.execute(insert(model), chunk)
+            db.session.commit()
+            status, errors = "created", []
+        except Exception as e:
+            db.session.rollback()
+            status, errors = "error", [f"Gagal menyimpan chunk: {e}"]
+            failed.extend(chunk_indices)
+        for index in chunk_indices:
+            report[index]["status"] = status
+            report[index]["errors"] = errors
+    return failed
+
+
+def _delete_files(storage, keys):
+    for key in keys:
+        try:
+            storage.delete(key)
+        except Exception:
+            current_app.logger.exception("Gagal menghapus file import %s", key)
+
+
+def summarize(report):
+    created = sum(1 for row in report if row["status"] == "created")
+    return {"created": created, "failed": len(report) - created, "results": report}
+
+
+def import_karya(zip_file, user_id, allowed_extensions, chunk_size=500, workers=4):
+    """Import karya dari zip berisi gambar dan manifest.
+
+    ``zip_file`` boleh path atau file object (mis. upload); file object
+    disalin dulu ke file sementara supaya tiap thread bisa membukanya sendiri.
+    """
+    if isinstance(zip_file, (str, os.PathLike)):
+        return _import_karya_path(zip_file, user_id, allowed_extensions, chunk_size, workers)
+
+    with tempfile.NamedTemporaryFile(suffix=".zip") as tmp:
+        shutil.copyfileobj(zip_file, tmp)
+        tmp.flush()
+        return _import_karya_path(tmp.name, user_id, allowed_extensions, chunk_size, workers)
+
+
+def _import_karya_path(zip_path, user_id, allowed_extensions, chunk_size, workers):
+    try:
+        archive = zipfile.ZipFile(zip_path)
+    except zipfile.BadZipFile:
+        raise BulkImportError("File bukan zip yang valid")
+
+    with archive:
+        check_archive(archive)
+        items = read_manifest(archive)
+        if not isinstance(items, list):
+            raise BulkImportError("Manifest harus berupa list item")
+        report, valid = validate_karya(items, archive, allowed_extensions)
+    if not valid:
+        return summarize(report)
+
+    local = threading.local()
+    handles = []
+
+    # Key dan storage diambil di thread utama (butuh app context)
+    storage = get_storage()
+    keys = {index: new_key(items[index]["foto"], "karya") for index in valid}
+
+    def write_file(index):
+        # ZipFile tidak aman dipakai bersama antar thread; satu handle per thread
+        if not hasattr(local, "archive"):
+            local.archive = zipfile.ZipFile(zip_path)
+            handles.append(local.archive)
+        foto = items[index]["foto"]
+        with local.archive.open(foto) as src:
+            metadata = image_metadata(src)
+            public_path = storage.save(keys[index], src, mimetypes.guess_type(foto)[0])
+        return index, public_path, metadata
+
+    now = datetime.utcnow()
+    rows, indices = [], []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for index, public_path, metadata in pool.map(write_file, valid):
+                item = items[index]
+                rows.append(
+                    {
+                        "user_id": user_id,
+                        "judul_karya": item["judul_karya"],
+                        "deskripsi": item.get("deskripsi"),
+                        "link_foto": public_path,
+                        "link_whatsapp": item.get("link_whatsapp"),
+                        "like_count": 0,
+                        "created_at": now,
+                        **dict.fromkeys(METADATA_COLUMNS),
+                        **metadata,
+                    }
+                )
+                indices.append(index)
+                report[index]["link_foto"] = rows[-1]["link_foto"]
+    except Exception:
+        # Belum ada baris yang disimpan; file yang sudah tertulis jadi yatim
+        _delete_files(storage, keys.values())
+        raise
+    finally:
+        for handle in handles:
+            handle.close()
+
+    failed = _insert_chunks(karya_seni, rows, indices, report, chunk_size)
+    _delete_files(storage, [keys[index] for index in failed])
+    # Satu proyeksi feed untuk semua chunk yang berhasil
+    sync_karya(and_(karya_seni.user_id == user_id, karya_seni.created_at == now))
+    db.session.commit()
+    return summarize(report)
+
+
+def import_videos(items, user_id, chunk_size=500):
+    """Import batch ruang video dari list JSON."""
+    if not isinstance(items, list):
+        raise BulkImportError("Body harus berupa list video atau {\"items\": [...]}")
+
+    report, valid = validate_videos(items)
+    now = datetime.utcnow()
+    rows = [
+        {
+            "user_id": user_id,
+            "judul": items[index]["judul"],
+            "link_youtube": items[index]["link_youtube"],
+            "link_thumbnail": items[index]["link_thumbnail"],
+            "deskripsi": items[index].get("deskripsi"),
+            "dibuat_oleh": items[index]["dibuat_oleh"],
+            "like_count": 0,
+            "created_at": now,
+        }
+        for index in valid
+    ]
+    _insert_chunks(ruang_video, rows, valid, report, chunk_size)
+    return summarize(report)
+
+
+import_cli = AppGroup("import", help="Import massal karya seni dan video.")
+
+
+def _user_id(username):
+    user = User.query.filter_by(username=username, deleted_at=None).first()
+    if not user:
+        raise click.ClickException(f"User {username} tidak ditemukan")
+    return user.id
+
+
+def _echo_summary(summary):
+    click.echo(f"{summary['created']} berhasil, {summary['failed']} gagal")
+    for row in summary["results"]:
+        if row["errors"]:
+            click.echo(f"  baris {row['row']}: {'; '.join(row['errors'])}")
+
+
+@import_cli.command("karya")
+@click.argument("zip_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--user", "username", required=True, help="Username pemilik karya.")
+@click.option("--chunk-size", default=500, show_default=True, type=int)
+@click.option("--workers", default=4, show_default=True, type=int)
+def import_karya_command(zip_path, username, chunk_size, workers):
+    """Import karya dari zip (gambar + manifest.json/csv)."""
+    from app.routes.karyaseni import ALLOWED_EXTENSIONS
+
+    try:
+        summary = import_karya(zip_path, _user_id(username), ALLOWED_EXTENSIONS, chunk_size, workers)
+    except BulkImportError as e:
+        raise click.ClickException(str(e))
+    _echo_summary(summary)
+
+
+@import_cli.command("video")
+@click.argument("json_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--user", "username", required=True, help="Username pemilik video.")
+@click.option("--chunk-size", default=500, show_default=True, type=int)
+def import_video_command(json_path, username, chunk_size):
+    """Import video dari file JSON (list atau {"items": [...]})."""
+    with open(json_path, encoding="utf-8") as f:
+        data = json.load(f)
+    items = data.get("items") if isinstance(data, dict) else data
+    try:
+        summary = import_videos(items, _user_id(username), chunk_size)
+    except BulkImportError as e:
+        raise click.ClickException(str(e))
+    _echo_summary(summary)
@@ -0,0 +1,277 @@
+"""Antrian job latar belakang tanpa broker eksternal.
+
+Job disimpan di tabel ``jobs`` (database yang sama dengan aplikasi), sehingga
+``enqueue`` ikut transaksi request: job baru terlihat oleh worker setelah
+request commit. Worker dijalankan dengan ``flask jobs worker``.
+
+Contoh::
+
+    @job_handler("recount_video_likes")
+    def recount_video_likes(video_id):
+        ...
+
+    enqueue("recount_video_likes", {"video_id": 1}, dedup_key="video-likes:1")
+    db.session.commit()
+"""
+import json
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import Job
+
+JOB_HANDLERS = {}
+
+
+def job_handler(name):
+    """Daftarkan fungsi sebagai handler untuk job bernama ``name``."""
+
+    def decorator(fn):
+        JOB_HANDLERS[name] = fn
+        return fn
+
+    return decorator
+
+
+def enqueue(name, payload=None, dedup_key=None, delay=0, max_attempts=5):
+    """Masukkan job ke antrian di session saat ini (commit oleh pemanggil).
+
+    Jika ``dedup_key`` sudah dipakai job yang masih antre, job lama yang
+    dikembalikan dan tidak ada job baru. Key dilepas saat job diklaim worker,
+    jadi perubahan yang datang selama job berjalan mendapat job baru.
+    """
+    if name not in JOB_HANDLERS:
+        raise KeyError(f"Handler job {name!r} belum terdaftar")
+
+    if dedup_key is not None:
+        existing = Job.query.filter_by(dedup_key=dedup_key).first()
+        if existing is not None:
+            return existing
+
+    job = Job(
+        name=name,
+        payload=json.dumps(payload or {}),
+        dedup_key=dedup_key,
+        max_attempts=max_attempts,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+    # Savepoint: bentrok dedup_key tidak membatalkan perubahan lain di request
+    try:
+        with db.session.begin_nested():
+            db.session.add(job)
+    except IntegrityError:
+        return Job.query.filter_by(dedup_key=dedup_key).first()
+    return job
+
+
+def backoff_seconds(attempts, base=2, cap=600):
+    # Exponential backoff dengan jitter supaya retry tidak serentak
+    delay = min(cap, base ** attempts)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class Worker:
+    def __init__(self, app, concurrency=4, poll_interval=1.0, stale_after=300):
+        self.app = app
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+
+    def claim(self, batch=10):
+        """Ambil job yang siap jalan; UPDATE bersyarat mencegah dobel klaim."""
+        now = datetime.utcnow()
+        ids = db.session.execute(
+            select(Job.id)
+            .where(Job.status == "queued", Job.run_at <= now)
+            .order_by(Job.run_at)
+            .limit(batch)
+        ).scalars().all()
+        for job_id in ids:
+            result = db.session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "queued")
+                .values(
+                    status="running",
+                    # Job yang sedang jalan mungkin sudah membaca data lama
+                    dedup_key=None,
+                    locked_by=self.worker_id,
+                    locked_at=now,
+                    attempts=Job.attempts + 1,
+                )
+            )
+            db.session.commit()
+            if result.rowcount == 1:
+                return db.session.get(Job, job_id)
+        return None
+
+    def requeue_stale(self):
+        """Kembalikan job "running" yang ditinggal worker mati ke antrian.
+
+        Worker yang hidup memperbarui ``locked_at`` selama job berjalan, jadi
+        hanya job tanpa heartbeat selama ``stale_after`` detik yang kena.
+        Klaim sudah menghitung satu attempt; job yang attempt-nya habis
+        (mis. selalu membuat worker crash) ditandai failed.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        stale = (Job.status == "running", Job.locked_at < cutoff)
+        db.session.execute(
+            update(Job)
+            .where(*stale, Job.attempts >= Job.max_attempts)
+            .values(
+                status="failed",
+                locked_by=None,
+                locked_at=None,
+                last_error="Worker berhenti saat job berjalan",
+            )
+        )
+        db.session.execute(
+            update(Job).where(*stale).values(status="queued", locked_by=None, locked_at=None)
+        )
+        db.session.commit()
+
+    def _heartbeat(self, job_id, done):
+        # Perbarui locked_at selama job berjalan supaya tidak dianggap ditinggal
+        with self.app.app_context():
+            while not done.wait(self.stale_after / 3):
+                try:
+                    db.session.execute(
+                        update(Job)
+                        .where(Job.id == job_id, Job.locked_by == self.worker_id)
+                        .values(locked_at=datetime.utcnow())
+                    )
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    current_app.logger.exception("Heartbeat job #%s gagal", job_id)
+
+    def _run(self, job, handler):
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job.id, done), name=f"job-heartbeat-{job.id}", daemon=True
+        )
+        heartbeat.start()
+        try:
+            handler(**json.loads(job.payload or "{}"))
+        finally:
+            done.set()
+            heartbeat.join()
+
+    def execute(self, job):
+        handler = JOB_HANDLERS.get(job.name)
+        try:
+            if handler is None:
+                raise KeyError(f"Handler job {job.name!r} tidak ditemukan")
+            self._run(job, handler)
+        except Exception:
+            db.session.rollback()
+            job = db.session.get(Job, job.id)
+            job.last_error = traceback.format_exc(limit=5)
+            job.locked_by = job.locked_at = None
+            if job.attempts < job.max_attempts:
+                job.status = "queued"
+                job.run_at = datetime.utcnow() + timedelta(
+                    seconds=backoff_seconds(job.attempts)
+                )
+            else:
+                job.status = "failed"
+            db.session.commit()
+            current_app.logger.warning("Job %s #%s gagal", job.name, job.id)
+            return False
+
+        job.status = "done"
+        job.locked_by = job.locked_at = None
+        db.session.commit()
+        return True
+
+    def run_once(self):
+        """Jalankan job siap pakai sampai antrian kosong; kembalikan jumlahnya."""
+        count = 0
+        with self.app.app_context():
+            while True:
+                job = self.claim()
+                if job is None:
+                    return count
+                self.execute(job)
+                count += 1
+
+    def _loop(self):
+        while not self.stopping.is_set():
+            try:
+                if not self.run_once():
+                    self.stopping.wait(self.poll_interval)
+            except Exception:
+                self.app.logger.exception("Worker job error")
+                self.stopping.wait(self.poll_interval)
+
+    def run(self):
+        with self.app.app_context():
+            self.requeue_stale()
+        threads = [
+            threading.Thread(target=self._loop, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                time.sleep(self.stale_after / 2)
+                with self.app.app_context():
+                    self.requeue_stale()
+        except KeyboardInterrupt:
+            self.stopping.set()
+            for thread in threads:
+                thread.join()
+
+
+jobs_cli = AppGroup("jobs", help="Antrian job latar belakang.")
+
+
+@jobs_cli.command("worker")
+@click.option("--concurrency", default=4, show_default=True, type=int)
+@click.option("--poll-interval", default=1.0, show_default=True, type=float)
+@click.option("--once", is_flag=True, help="Proses antrian sampai kosong lalu keluar.")
+def worker_command(concurrency, poll_interval, once):
+    """Jalankan worker job."""
+    worker = Worker(current_app._get_current_object(), concurrency, poll_interval)
+    if once:
+        click.echo(f"{worker.run_once()} job diproses")
+        return
+    click.echo(f"Worker {worker.worker_id} berjalan dengan {concurrency} thread")
+    worker.run()
+
+
+@jobs_cli.command("status")
+def status_command():
+    """Tampilkan jumlah job per status."""
+    rows = db.session.execute(
+        select(Job.status, func.count()).group_by(Job.status)
+    ).all()
+    for status, count in rows:
+        click.echo(f"{status}: {count}")
+
+
+@jobs_cli.command("purge")
+@click.option("--older-than-days", default=7, show_default=True, type=int)
+def purge_command(older_than_days):
+    """Hapus job done/failed yang lebih tua dari N hari."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    result = db.session.execute(
+        Job.__table__.delete().where(
+            Job.status.in_(("done", "failed")), Job.created_at < cutoff
+        )
+    )
+    db.session.commit()
+    click.echo(f"{result.rowcount} job dihapus")
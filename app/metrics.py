@@ -0,0 +1,36 @@
+"""Counter metrik sederhana per proses.
+
+Dibaca lewat ``GET /api/internal/metrics``. Tiap counter punya nama dan
+label, mis. ``incr("deadline_exceeded", route="karya_seni.get_all_karya")``.
+"""
+import threading
+from collections import defaultdict
+
+from flask import current_app
+
+
+class Metrics:
+    def __init__(self):
+        self._counters = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def incr(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def snapshot(self):
+        with self._lock:
+            items = list(self._counters.items())
+        result = defaultdict(list)
+        for (name, labels), value in sorted(items):
+            result[name].append({"labels": dict(labels), "value": value})
+        return dict(result)
+
+
+def init_metrics(app):
+    app.extensions["metrics"] = Metrics()
+
+
+def incr(name, value=1, **labels):
+    current_app.extensions["metrics"].incr(name, value, **labels)
@@ -13,8 +13,9 @@ class User(db.Model):
     foto_profil = db.Column(db.String(255), nullable=True)
     bio = db.Column(db.Text, nullable=True)
     lokasi = db.Column(db.String(100), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    deleted_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, nullable=True, onupdate=datetime.utcnow, index=True)
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)
 
 
 class karya_seni(db.Model):
@@ -26,9 +27,14 @@ class karya_seni(db.Model):
     link_foto = db.Column(db.String(255), nullable=False)
     link_whatsapp = db.Column(db.String(255), nullable=True)
     like_count = db.Column(db.Integer, default=0) 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, nullable=True, onupdate=datetime.utcnow)
-    deleted_at = db.Column(db.DateTime, nullable=True)
+    # Metadata foto untuk placeholder di frontend (lihat app/images.py)
+    foto_width = db.Column(db.Integer, nullable=True)
+    foto_height = db.Column(db.Integer, nullable=True)
+    foto_color = db.Column(db.String(7), nullable=True)
+    foto_blurhash = db.Column(db.String(64), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, nullable=True, onupdate=datetime.utcnow, index=True)
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)
 
     def to_dict(self):
         return {
@@ -39,6 +45,10 @@ class karya_seni(db.Model):
             "link_foto": self.link_foto,
             "link_whatsapp": self.link_whatsapp,
             "like_count": self.like_count,
+            "foto_width": self.foto_width,
+            "foto_height": self.foto_height,
+            "foto_color": self.foto_color,
+            "foto_blurhash": self.foto_blurhash,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
@@ -54,9 +64,9 @@ class ruang_video(db.Model):
     deskripsi = db.Column(db.Text, nullable=True)
     dibuat_oleh = db.Column(db.String(100), nullable=False)
     like_count = db.Column(db.Integer, default=0)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, nullable=True, onupdate=datetime.utcnow)
-    deleted_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, nullable=True, onupdate=datetime.utcnow, index=True)
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)
 
 
 class LikeVideo(db.Model):
@@ -65,3 +75,113 @@ class LikeVideo(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     video_id = db.Column(db.Integer, db.ForeignKey("ruang_video.id"), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# Tabel arsip: baris yang sudah soft-delete lebih lama dari masa retensi
+# dipindahkan ke sini oleh app/archival.py supaya tabel utama tetap kecil.
+class UserArchive(db.Model):
+    __tablename__ = "users_archive"
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    email = db.Column(db.String(50), nullable=False)
+    username = db.Column(db.String(50), nullable=False)
+    password = db.Column(db.String(255), nullable=False)
+    nama_lengkap = db.Column(db.String(100), nullable=False)
+    foto_profil = db.Column(db.String(255), nullable=True)
+    bio = db.Column(db.Text, nullable=True)
+    lokasi = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, nullable=True)
+    deleted_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+
+class KaryaSeniArchive(db.Model):
+    __tablename__ = "karya_seni_archive"
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    judul_karya = db.Column(db.String(100), nullable=False)
+    deskripsi = db.Column(db.Text, nullable=True)
+    link_foto = db.Column(db.String(255), nullable=False)
+    link_whatsapp = db.Column(db.String(255), nullable=True)
+    like_count = db.Column(db.Integer, default=0)
+    foto_width = db.Column(db.Integer, nullable=True)
+    foto_height = db.Column(db.Integer, nullable=True)
+    foto_color = db.Column(db.String(7), nullable=True)
+    foto_blurhash = db.Column(db.String(64), nullable=True)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, nullable=True)
+    deleted_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+
+class RuangVideoArchive(db.Model):
+    __tablename__ = "ruang_video_archive"
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    judul = db.Column(db.String(100), nullable=False)
+    link_youtube = db.Column(db.String(255), nullable=False)
+    link_thumbnail = db.Column(db.String(255), nullable=False)
+    deskripsi = db.Column(db.Text, nullable=True)
+    dibuat_oleh = db.Column(db.String(100), nullable=False)
+    like_count = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, nullable=True)
+    deleted_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+
+class Job(db.Model):
+    """Antrian job latar belakang (lihat app/jobs.py)."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (db.Index("ix_jobs_status_run_at", "status", "run_at"),)
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=True)
+    # Unik selama job masih antre; dikosongkan saat job diklaim worker
+    dedup_key = db.Column(db.String(191), unique=True, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=True, onupdate=datetime.utcnow)
+
+
+class KaryaFeed(db.Model):
+    """Read model listing karya: kolom karya_seni + data artist (lihat app/feed.py).
+
+    Hanya berisi karya yang belum dihapus; diisi ulang oleh ``sync_karya`` setiap
+    karya berubah dan oleh ``sync_artists`` saat profil user berubah.
+    """
+
+    __tablename__ = "karya_feed"
+    __table_args__ = (db.Index("ix_karya_feed_created_at_id", "created_at", "id"),)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    judul_karya = db.Column(db.String(100), nullable=False)
+    deskripsi = db.Column(db.Text, nullable=True)
+    link_foto = db.Column(db.String(255), nullable=False)
+    link_whatsapp = db.Column(db.String(255), nullable=True)
+    like_count = db.Column(db.Integer, default=0)
+    foto_width = db.Column(db.Integer, nullable=True)
+    foto_height = db.Column(db.Integer, nullable=True)
+    foto_color = db.Column(db.String(7), nullable=True)
+    foto_blurhash = db.Column(db.String(64), nullable=True)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, nullable=True)
+    artist_username = db.Column(db.String(50), nullable=True)
+    artist_foto = db.Column(db.String(255), nullable=True)
+
+
+class LikeCounterShard(db.Model):
+    """Slot counter like untuk item yang sedang ramai (lihat app/counters.py)."""
+
+    __tablename__ = "like_counter_shards"
+    kind = db.Column(db.String(10), primary_key=True)
+    item_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    slot = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    delta = db.Column(db.Integer, nullable=False, default=0)
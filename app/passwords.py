@@ -0,0 +1,122 @@
+"""Hash dan verifikasi password di thread pool terbatas.
+
+Hashing scrypt/pbkdf2 sengaja mahal. Kalau dijalankan langsung di thread
+request, lonjakan login bisa memakai semua CPU worker dan request lain ikut
+macet. Di sini hashing dijalankan di executor dengan ``PASSWORD_HASH_WORKERS``
+thread (hashlib melepas GIL selama hashing). Paling banyak
+``PASSWORD_HASH_QUEUE`` pekerjaan boleh antre. Di atas itu dilempar
+``PasswordServiceBusy``, dan route membalas 503 dengan ``Retry-After``.
+
+``PASSWORD_HASH_METHOD`` memakai format Werkzeug, mis. ``scrypt:32768:8:1``
+atau ``pbkdf2:sha256:600000``. Hash lama yang parameternya berbeda, termasuk
+password polos dari ``POST /api/users/``, di-hash ulang saat login berhasil.
+"""
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, jsonify
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+
+DEFAULT_SCRYPT = ("32768", "8", "1")
+
+
+class PasswordServiceBusy(Exception):
+    """Antrean hashing penuh."""
+
+
+def canonical_method(method):
+    """Lengkapi parameter default, mis. ``scrypt`` -> ``scrypt:32768:8:1``."""
+    name, *args = method.split(":")
+    if name == "scrypt":
+        if args and len(args) != 3:
+            raise ValueError("'scrypt' butuh 3 parameter: n:r:p")
+        return ":".join(["scrypt", *(args or DEFAULT_SCRYPT)])
+    if name == "pbkdf2":
+        if len(args) > 2:
+            raise ValueError("'pbkdf2' butuh paling banyak 2 parameter: hash:iterasi")
+        hash_name = args[0] if args else "sha256"
+        iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    raise ValueError(f"Metode hash password tidak dikenal: {method}")
+
+
+def is_hashed(stored):
+    return stored.count("$") == 2 and stored.split(":", 1)[0] in ("scrypt", "pbkdf2")
+
+
+class PasswordHasher:
+    def __init__(self, method, workers, queue):
+        self.method = canonical_method(method)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="passwords")
+        self._slots = threading.BoundedSemaphore(workers + queue)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordServiceBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored, password):
+        if not stored or password is None:
+            return False
+        if not is_hashed(stored):
+            # Password polos dari data lama; diganti hash lewat needs_rehash
+            return hmac.compare_digest(stored.encode(), password.encode())
+        return self._run(check_password_hash, stored, password)
+
+    def needs_rehash(self, stored):
+        return not is_hashed(stored) or stored.split("$", 1)[0] != self.method
+
+
+def init_passwords(app):
+    app.config.setdefault("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    app.config.setdefault("PASSWORD_HASH_WORKERS", os.cpu_count() or 2)
+    app.config.setdefault("PASSWORD_HASH_QUEUE", 64)
+    app.config.setdefault("PASSWORD_BUSY_RETRY_AFTER", 1)
+    app.extensions["passwords"] = PasswordHasher(
+        app.config["PASSWORD_HASH_METHOD"],
+        app.config["PASSWORD_HASH_WORKERS"],
+        app.config["PASSWORD_HASH_QUEUE"],
+    )
+
+
+def get_hasher():
+    return current_app.extensions["passwords"]
+
+
+def hash_password(password):
+    return get_hasher().hash(password)
+
+
+def verify_and_update(user, password):
+    """Cek password user; jika cocok dan parameter hash usang, ganti hash-nya.
+
+    Mengembalikan True jika cocok. Perubahan ``user.password`` di-commit pemanggil.
+    """
+    hasher = get_hasher()
+    if not hasher.verify(user.password, password):
+        return False
+    if hasher.needs_rehash(user.password):
+        user.password = hasher.hash(password)
+    return True
+
+
+def busy_response():
+    response = jsonify({"message": "Server sedang sibuk, coba lagi sebentar"})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(current_app.config["PASSWORD_BUSY_RETRY_AFTER"])
+    return response
@@ -0,0 +1,174 @@
+"""Profiling on-demand: cProfile per request dan snapshot tracemalloc.
+
+Mati secara default (``PROFILING_ENABLED=False``): tidak ada hook yang
+dipasang sama sekali. Jika aktif:
+
+* Request yang membawa header ``X-Profile`` bertanda tangan dijalankan di
+  bawah cProfile. Laporannya disimpan di memori (``PROFILING_KEEP`` terakhir)
+  dan id-nya dikirim lewat header ``X-Profile-Id``. Nilai header dibuat lewat
+  ``POST /api/internal/profile-token``.
+* ``POST /api/internal/memory/start`` menyalakan tracemalloc. Selama tracing,
+  pertumbuhan memori per route dicatat, dan ``/memory/snapshot`` membandingkan
+  snapshot dengan snapshot sebelumnya.
+"""
+import cProfile
+import hashlib
+import hmac
+import io
+import itertools
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+
+from flask import current_app, g, request
+
+HEADER = "X-Profile"
+
+
+def sign(secret, expires):
+    return hmac.new(secret.encode(), f"profile:{expires}".encode(), hashlib.sha256).hexdigest()
+
+
+def make_token(secret, ttl):
+    expires = int(time.time()) + ttl
+    return f"{expires}.{sign(secret, expires)}"
+
+
+def verify_token(secret, token):
+    expires, _, signature = (token or "").partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(sign(secret, int(expires)), signature)
+
+
+class ProfileStore:
+    def __init__(self, keep):
+        self.keep = keep
+        self._reports = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, report):
+        with self._lock:
+            report["id"] = next(self._ids)
+            self._reports[report["id"]] = report
+            while len(self._reports) > self.keep:
+                self._reports.popitem(last=False)
+        return report["id"]
+
+    def get(self, report_id):
+        return self._reports.get(report_id)
+
+    def summaries(self):
+        with self._lock:
+            reports = list(self._reports.values())
+        return [
+            {key: report[key] for key in ("id", "time", "route", "duration_ms", "status")}
+            for report in reversed(reports)
+        ]
+
+
+class MemoryTracker:
+    """Snapshot tracemalloc + pertumbuhan memori per route (perkiraan)."""
+
+    def __init__(self):
+        self.previous = None
+        self.routes = defaultdict(lambda: {"requests": 0, "growth_bytes": 0, "max_growth_bytes": 0})
+        self._lock = threading.Lock()
+
+    def record(self, route, growth):
+        with self._lock:
+            stats = self.routes[route]
+            stats["requests"] += 1
+            stats["growth_bytes"] += growth
+            stats["max_growth_bytes"] = max(stats["max_growth_bytes"], growth)
+
+    def route_stats(self):
+        with self._lock:
+            items = [{"route": route, **stats} for route, stats in self.routes.items()]
+        return sorted(items, key=lambda item: item["growth_bytes"], reverse=True)
+
+    def snapshot(self, limit, key_type="lineno"):
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        if self.previous is None:
+            stats = snapshot.statistics(key_type)[:limit]
+            top = [{"location": str(s.traceback), "size_bytes": s.size, "count": s.count} for s in stats]
+        else:
+            stats = snapshot.compare_to(self.previous, key_type)[:limit]
+            top = [
+                {
+                    "location": str(s.traceback),
+                    "size_bytes": s.size,
+                    "size_diff_bytes": s.size_diff,
+                    "count": s.count,
+                    "count_diff": s.count_diff,
+                }
+                for s in stats
+            ]
+        diff = self.previous is not None
+        self.previous = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        return {"diff": diff, "traced_bytes": current, "peak_bytes": peak, "top": top}
+
+    def reset(self):
+        self.previous = None
+        with self._lock:
+            self.routes.clear()
+
+
+def _route():
+    return f"{request.method} {request.url_rule.rule if request.url_rule else request.path}"
+
+
+def init_profiling(app):
+    app.config.setdefault("PROFILING_ENABLED", False)
+    app.config.setdefault("PROFILING_KEEP", 20)
+    app.config.setdefault("PROFILING_TOP", 40)
+    if not app.config["PROFILING_ENABLED"]:
+        return
+
+    store = ProfileStore(app.config["PROFILING_KEEP"])
+    memory = MemoryTracker()
+    app.extensions["profiling"] = {"store": store, "memory": memory}
+
+    @app.before_request
+    def start_profiling():
+        if tracemalloc.is_tracing():
+            g.memory_before = tracemalloc.get_traced_memory()[0]
+        secret = current_app.config.get("INTERNAL_API_TOKEN")
+        token = request.headers.get(HEADER)
+        if token and secret and verify_token(secret, token):
+            g.profiler = cProfile.Profile()
+            g.profile_started = time.perf_counter()
+            g.profiler.enable()
+
+    @app.after_request
+    def finish_profiling(response):
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            duration = time.perf_counter() - g.pop("profile_started")
+            out = io.StringIO()
+            stats = pstats.Stats(profiler, stream=out).sort_stats("cumulative")
+            stats.print_stats(current_app.config["PROFILING_TOP"])
+            report_id = store.add(
+                {
+                    "time": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+                    "route": _route(),
+                    "duration_ms": round(duration * 1000, 1),
+                    "status": response.status_code,
+                    "report": out.getvalue(),
+                }
+            )
+            response.headers["X-Profile-Id"] = str(report_id)
+
+        before = g.pop("memory_before", None)
+        if before is not None and tracemalloc.is_tracing():
+            # Memori proses bersama: di bawah request paralel angkanya perkiraan
+            memory.record(_route(), tracemalloc.get_traced_memory()[0] - before)
+        return response
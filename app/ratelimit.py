@@ -0,0 +1,242 @@
+"""Rate limit token bucket dan admission control untuk route /api.
+
+* Bucket per client (IP, atau id user jika membawa JWT valid):
+  ``RATELIMIT_RATE`` token/detik dengan kapasitas ``RATELIMIT_BURST``. Tiap
+  request memakai token sebanyak bobot route-nya. Jika token habis,
+  dibalas 429 dengan ``Retry-After``.
+* Route boleh punya bucket tambahan per client (``limit=(rate, burst)``),
+  mis. login dan registrasi.
+* Admission control per proses: total bobot request yang sedang berjalan
+  dibatasi ``ADMISSION_CAPACITY``. Request yang tidak muat menunggu di antrean
+  (maksimal ``ADMISSION_QUEUE`` request selama ``ADMISSION_WAIT_SECONDS``).
+  Jika antrean penuh atau waktu tunggu habis, dibalas 503 dengan ``Retry-After``.
+
+Bobot default 1. Route mahal ditandai tepat di bawah decorator route::
+
+    @karya_seni_bp.route("", methods=["GET"])
+    @rate_cost(5)
+    @cached("karya")
+    def get_all_karya():
+        ...
+
+Bucket disimpan di memori proses (``RATELIMIT_STORAGE=memory``) atau di
+Redis (``RATELIMIT_STORAGE=redis``, memakai ``RATELIMIT_REDIS_URL`` atau
+``CACHE_REDIS_URL``; ``pip install -r requirements-redis.txt``), sehingga
+batas berlaku untuk semua worker. Route async di app/asgi.py memakai bucket dan
+admission yang sama.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+from flask import current_app, g, jsonify, request
+
+EXEMPT_PREFIXES = ("/static/", "/api/internal/")
+
+
+def rate_cost(cost, limit=None):
+    """Tandai bobot route; ``cost=0`` membebaskan route dari limit dan admission."""
+
+    def decorator(fn):
+        fn.rate_cost = cost
+        fn.rate_limit = limit
+        return fn
+
+    return decorator
+
+
+class MemoryBuckets:
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, cost):
+        """(diizinkan, detik tunggu sampai token cukup)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return allowed, 0 if allowed else (cost - tokens) / rate
+
+
+# KEYS[1] = bucket; ARGV = rate, burst, cost, now
+TAKE_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local rate, burst, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBuckets:
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self._take = self.client.register_script(TAKE_SCRIPT)
+
+    def take(self, key, rate, burst, cost):
+        allowed, tokens = self._take(keys=["ratelimit:" + key], args=[rate, burst, cost, time.time()])
+        if allowed:
+            return True, 0
+        return False, (cost - float(tokens)) / rate
+
+
+class AdmissionControl:
+    def __init__(self, capacity, queue, wait):
+        self.capacity = capacity
+        self.queue = queue
+        self.wait = wait
+        self.in_flight = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, cost, block=True):
+        """``block=False``: hanya masuk jika muat sekarang, tanpa antre."""
+        cost = min(cost, self.capacity)
+        with self._cond:
+            if self.in_flight + cost <= self.capacity and not self.waiting:
+                self.in_flight += cost
+                return True
+            if not block or self.waiting >= self.queue:
+                return False
+            self.waiting += 1
+            try:
+                admitted = self._cond.wait_for(
+                    lambda: self.in_flight + cost <= self.capacity, timeout=self.wait
+                )
+                if admitted:
+                    self.in_flight += cost
+                return admitted
+            finally:
+                self.waiting -= 1
+
+    def release(self, cost):
+        cost = min(cost, self.capacity)
+        with self._cond:
+            self.in_flight -= cost
+            self._cond.notify_all()
+
+
+def client_key(authorization, address):
+    """Id user dari JWT (tanpa query database), atau alamat IP client."""
+    token = (authorization or "").replace("Bearer ", "")
+    if token:
+        try:
+            data = jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=["HS256"])
+            return f"user:{data['user_id']}"
+        except Exception:
+            pass
+    return f"ip:{address}"
+
+
+def client_id():
+    address = request.remote_addr
+    if current_app.config["RATELIMIT_TRUST_PROXY"] and request.access_route:
+        address = request.access_route[0]
+    return client_key(request.headers.get("Authorization"), address)
+
+
+def take_tokens(buckets, client, endpoint, view, cost):
+    """Ambil token dari bucket client (dan bucket route); detik tunggu jika habis."""
+    config = current_app.config
+    limits = [(client, config["RATELIMIT_RATE"], config["RATELIMIT_BURST"])]
+    if getattr(view, "rate_limit", None):
+        limits.append((f"{client}:{endpoint}", *view.rate_limit))
+    for key, rate, burst in limits:
+        try:
+            allowed, retry_after = buckets.take(key, rate, burst, min(cost, burst))
+        except Exception:
+            # Store bersama tidak bisa dihubungi: jangan blokir traffic
+            current_app.logger.exception("Rate limit tidak bisa dicek")
+            return None
+        if not allowed:
+            return retry_after
+    return None
+
+
+def _too_many(message, status, retry_after):
+    response = jsonify({"message": message})
+    response.status_code = status
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def init_ratelimit(app):
+    app.config.setdefault("RATELIMIT_ENABLED", True)
+    app.config.setdefault("RATELIMIT_STORAGE", "memory")
+    app.config.setdefault("RATELIMIT_REDIS_URL", None)
+    app.config.setdefault("RATELIMIT_RATE", 20)
+    app.config.setdefault("RATELIMIT_BURST", 100)
+    app.config.setdefault("RATELIMIT_TRUST_PROXY", False)
+    app.config.setdefault("ADMISSION_CAPACITY", 64)
+    app.config.setdefault("ADMISSION_QUEUE", 32)
+    app.config.setdefault("ADMISSION_WAIT_SECONDS", 2)
+    if not app.config["RATELIMIT_ENABLED"]:
+        return
+
+    if app.config["RATELIMIT_STORAGE"] == "redis":
+        url = app.config["RATELIMIT_REDIS_URL"] or app.config.get("CACHE_REDIS_URL")
+        if not url:
+            raise ValueError("RATELIMIT_STORAGE=redis butuh RATELIMIT_REDIS_URL atau CACHE_REDIS_URL")
+        buckets = RedisBuckets(url)
+    else:
+        buckets = MemoryBuckets()
+    admission = AdmissionControl(
+        app.config["ADMISSION_CAPACITY"],
+        app.config["ADMISSION_QUEUE"],
+        app.config["ADMISSION_WAIT_SECONDS"],
+    )
+    app.extensions["ratelimit"] = {"buckets": buckets, "admission": admission}
+
+    @app.before_request
+    def limit_request():
+        if request.method == "OPTIONS" or request.path.startswith(EXEMPT_PREFIXES):
+            return None
+        view = current_app.view_functions.get(request.endpoint)
+        cost = getattr(view, "rate_cost", 1)
+        if not cost:
+            return None
+
+        retry_after = take_tokens(buckets, client_id(), request.endpoint, view, cost)
+        if retry_after is not None:
+            return _too_many("Terlalu banyak request, coba lagi nanti", 429, retry_after)
+
+        if not admission.acquire(cost):
+            return _too_many("Server sedang sibuk, coba lagi sebentar", 503, admission.wait)
+        g.admission_cost = cost
+        return None
+
+    def release():
+        cost = g.pop("admission_cost", None)
+        if cost is not None:
+            admission.release(cost)
+
+    @app.after_request
+    def release_streamed(response):
+        # Response streaming (SSE, export) tidak menahan slot selama stream berjalan
+        if response.is_streamed:
+            release()
+        return response
+
+    @app.teardown_request
+    def release_admission(exc):
+        release()
@@ -0,0 +1,180 @@
+"""Pub/sub untuk update like_count secara live (Server-Sent Events).
+
+``publish_like`` dipanggil setelah like berubah. Broker meneruskan pesan ke
+``LikeHub`` di setiap proses; hub menyimpan nilai terakhir per item untuk tiap
+subscriber (coalescing), sehingga burst like hanya menghasilkan satu event per
+item per jendela ``REALTIME_COALESCE_SECONDS``.
+
+Broker bawaan ``LocalBroker`` hanya menjangkau satu proses. Untuk deployment
+multi-proses set ``REALTIME_BROKER_URL=redis://...`` agar ``RedisBroker``
+dipakai (``pip install -r requirements-redis.txt``). Tanpa broker dengan
+``WORKER_PROCESSES`` > 1, subscriber hanya akan melihat like yang ditangani
+worker-nya sendiri, jadi update live dimatikan dan ``/api/live`` dibalas 503.
+
+Di worker gthread setiap stream SSE memakai satu thread selama koneksi
+terbuka. ``REALTIME_MAX_STREAMS`` membatasi jumlah stream per proses; stream di
+atas batas dibalas 503. gunicorn.conf.py menambahkan thread sebanyak itu di
+atas ``GUNICORN_THREADS`` (thread untuk request biasa), sehingga stream tidak
+pernah memakai thread request. Thread stream hampir selalu menunggu event,
+jadi batasnya boleh jauh lebih besar dari jumlah thread request.
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app
+
+CHANNEL = "likes"
+
+
+class Subscription:
+    def __init__(self, keys):
+        self.keys = frozenset(keys)
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+
+    def push(self, key, count):
+        with self.lock:
+            self.pending[key] = count
+        self.event.set()
+
+    def drain(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.event.clear()
+        return pending
+
+
+class LikeHub:
+    """Fan-out in-process: key ("karya:1") -> subscription yang tertarik."""
+
+    def __init__(self):
+        self._by_key = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, keys):
+        subscription = Subscription(keys)
+        with self._lock:
+            for key in subscription.keys:
+                self._by_key[key].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for key in subscription.keys:
+                subscribers = self._by_key.get(key)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._by_key[key]
+
+    def dispatch(self, message):
+        key = message["key"]
+        with self._lock:
+            subscribers = list(self._by_key.get(key, ()))
+        for subscription in subscribers:
+            subscription.push(key, message["like_count"])
+
+
+class LocalBroker:
+    """Broker satu proses; juga dipakai sebagai pengganti Redis di test."""
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def publish(self, message):
+        self.hub.dispatch(message)
+
+
+class RedisBroker:
+    """Broker Redis pub/sub; satu thread listener per proses meneruskan ke hub."""
+
+    def __init__(self, hub, url, channel=CHANNEL):
+        import redis
+
+        self.hub = hub
+        self.channel = channel
+        self.client = redis.Redis.from_url(url)
+        self._listener = threading.Thread(target=self._listen, name="like-broker", daemon=True)
+        self._listener.start()
+
+    def publish(self, message):
+        self.client.publish(self.channel, json.dumps(message))
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for item in pubsub.listen():
+                    self.hub.dispatch(json.loads(item["data"]))
+            except Exception:
+                time.sleep(1)
+
+
+def init_realtime(app):
+    app.config.setdefault("REALTIME_BROKER_URL", None)
+    app.config.setdefault("REALTIME_COALESCE_SECONDS", 0.5)
+    app.config.setdefault("REALTIME_HEARTBEAT_SECONDS", 15)
+    app.config.setdefault("REALTIME_MAX_KEYS", 200)
+    app.config.setdefault("REALTIME_MAX_STREAMS", 32)
+    app.config.setdefault("WORKER_PROCESSES", 1)
+
+    url = app.config["REALTIME_BROKER_URL"]
+    if not url and app.config["WORKER_PROCESSES"] > 1:
+        app.logger.warning(
+            "REALTIME_BROKER_URL kosong dengan %s worker: update like live dimatikan",
+            app.config["WORKER_PROCESSES"],
+        )
+        app.extensions["realtime"] = None
+        return
+
+    hub = LikeHub()
+    broker = RedisBroker(hub, url) if url else LocalBroker(hub)
+    app.extensions["realtime"] = {
+        "hub": hub,
+        "broker": broker,
+        "streams": threading.BoundedSemaphore(app.config["REALTIME_MAX_STREAMS"]),
+    }
+
+
+def publish_like(kind, item_id, like_count):
+    """Kabarkan like_count terbaru sebuah karya/video ke semua subscriber."""
+    realtime = current_app.extensions.get("realtime")
+    if realtime is None:
+        return
+    try:
+        realtime["broker"].publish(
+            {"key": f"{kind}:{item_id}", "like_count": like_count}
+        )
+    except Exception:
+        # Gagal publish tidak boleh menggagalkan request like
+        current_app.logger.exception("Gagal publish update like")
+
+
+def stream_likes(keys, hub, coalesce, heartbeat):
+    """Generator event SSE untuk ``keys``.
+
+    Langganan dibuat saat generator mulai diiterasi, jadi response yang tidak
+    pernah dikirim tidak meninggalkan subscription di hub.
+    """
+    subscription = hub.subscribe(keys)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            if not subscription.event.wait(heartbeat):
+                yield ": keepalive\n\n"
+                continue
+            # Tunggu sebentar supaya like beruntun tergabung dalam satu event
+            time.sleep(coalesce)
+            updates = subscription.drain()
+            if updates:
+                payload = [
+                    {"type": key.split(":")[0], "id": int(key.split(":")[1]), "like_count": count}
+                    for key, count in updates.items()
+                ]
+                yield f"event: likes\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        hub.unsubscribe(subscription)
@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
 import jwt
 
 from app.models import db, User  # pastikan ini sesuai dengan struktur kamu
+from app.cache import invalidate
+from app.passwords import PasswordServiceBusy, busy_response, hash_password, verify_and_update
+from app.ratelimit import rate_cost
+from app.usernames import forget_username
 from config import Config  # buat SECRET_KEY di file config.py
 
 auth_bp = Blueprint("auth", __name__)
@@ -12,6 +15,7 @@ secret_key = Config.SECRET_KEY
 
 
 @auth_bp.route("/register", methods=["POST"])
+@rate_cost(10, limit=(0.05, 5))
 def register():
     data = request.get_json()
     email = data.get("email")
@@ -34,7 +38,10 @@ def register():
     if User.query.filter((User.email == email) | (User.username == username)).first():
         return jsonify({"message": "User sudah terdaftar"}), 409
 
-    hashed_pw = generate_password_hash(password)
+    try:
+        hashed_pw = hash_password(password)
+    except PasswordServiceBusy:
+        return busy_response()
 
     new_user = User(
         email=email,
@@ -48,11 +55,14 @@ def register():
 
     db.session.add(new_user)
     db.session.commit()
+    invalidate("users")
+    forget_username(username)
 
     return jsonify({"message": "Registrasi berhasil"}), 201
 
 
 @auth_bp.route("/login", methods=["POST"])
+@rate_cost(5, limit=(0.2, 10))
 def login():
     data = request.get_json()
     email = data.get("email")
@@ -60,8 +70,15 @@ def login():
 
     user = User.query.filter_by(email=email).first()
 
-    if not user or not check_password_hash(user.password, password):
+    try:
+        valid = user is not None and verify_and_update(user, password)
+    except PasswordServiceBusy:
+        return busy_response()
+    if not valid:
         return jsonify({"message": "Email atau password salah"}), 401
+    # ✅ Simpan hash baru jika parameter hash berubah (rehash saat login)
+    if user in db.session.dirty:
+        db.session.commit()
 
     payload = {"user_id": user.id, "exp": datetime.utcnow() + timedelta(days=1)}
     token = jwt.encode(payload, Config.SECRET_KEY, algorithm="HS256")
@@ -0,0 +1,45 @@
+import hmac
+from functools import wraps
+
+import jwt
+from flask import current_app, jsonify, request
+
+from app.models import User
+
+
+# Middleware token untuk blueprint baru (sama seperti token_required di blueprint lain)
+def token_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = request.headers.get("Authorization")
+        if not token:
+            return jsonify({"message": "Token tidak ditemukan"}), 401
+        try:
+            token = token.replace("Bearer ", "")
+            data = jwt.decode(
+                token, current_app.config["SECRET_KEY"], algorithms=["HS256"]
+            )
+            current_user = User.query.get(data["user_id"])
+            if not current_user or current_user.deleted_at:
+                return jsonify({"message": "User tidak valid"}), 401
+        except Exception as e:
+            return jsonify({"message": f"Token tidak valid: {str(e)}"}), 401
+        return f(current_user, *args, **kwargs)
+
+    return decorated
+
+
+# Endpoint internal: header X-Internal-Token harus sama dengan INTERNAL_API_TOKEN.
+# Tanpa INTERNAL_API_TOKEN endpoint internal dianggap tidak ada (404).
+def internal_token_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        expected = current_app.config.get("INTERNAL_API_TOKEN")
+        if not expected:
+            return jsonify({"message": "Not found"}), 404
+        token = request.headers.get("X-Internal-Token", "")
+        if not hmac.compare_digest(token, expected):
+            return jsonify({"message": "Token internal tidak valid"}), 403
+        return f(*args, **kwargs)
+
+    return decorated
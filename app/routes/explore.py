@@ -0,0 +1,114 @@
+import base64
+import json
+import secrets
+
+from flask import Blueprint, jsonify, request
+
+from app.cache import cached
+from app.explore import sample
+from app.models import KaryaFeed, ruang_video
+from app.ratelimit import rate_cost
+from app.routes.karyaseni import FEED_FIELDS
+from app.routes.ruangvideo import VIDEO_FIELDS
+from app.serializers import url_prefix
+
+explore_bp = Blueprint("explore", __name__)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# Beberapa putaran tambahan kalau ada item yang terhapus setelah snapshot
+MAX_ROUNDS = 3
+
+
+def fetch_live(entries):
+    """Ambil baris yang masih hidup untuk (tipe, id), urutan entries dipertahankan."""
+    karya_ids = [item_id for kind, item_id in entries if kind == "karya"]
+    video_ids = [item_id for kind, item_id in entries if kind == "video"]
+    found = {}
+    if karya_ids:
+        rows = KaryaFeed.query.filter(KaryaFeed.id.in_(karya_ids)).all()
+        items = FEED_FIELDS.serialize_many(rows, list(FEED_FIELDS.fields), {"url_prefix": url_prefix()})
+        found.update((("karya", item["id"]), item) for item in items)
+    if video_ids:
+        rows = ruang_video.query.filter(
+            ruang_video.id.in_(video_ids), ruang_video.deleted_at.is_(None)
+        ).all()
+        items = VIDEO_FIELDS.serialize_many(rows, list(VIDEO_FIELDS.fields))
+        found.update((("video", item["id"]), item) for item in items)
+    return [
+        {"type": kind, **found[(kind, item_id)]}
+        for kind, item_id in entries
+        if (kind, item_id) in found
+    ]
+
+
+def encode_cursor(seed, offset, version):
+    raw = json.dumps({"seed": seed, "offset": offset, "snapshot": version}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """(seed, offset, versi snapshot), atau None jika cursor tidak valid."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        seed, offset, version = str(data["seed"]), int(data["offset"]), str(data["snapshot"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    return (seed, offset, version) if offset >= 0 else None
+
+
+# ✅ Explore: karya/video acak, stabil per seed untuk pagination
+# Contoh: GET /api/explore?type=karya&limit=20&seed=abc
+# Halaman berikutnya: GET /api/explore?type=karya&limit=20&cursor=<next_cursor>
+@explore_bp.route("", methods=["GET"])
+@rate_cost(2)
+@cached("karya", "video", unless=lambda: not (request.args.get("seed") or request.args.get("cursor")))
+def explore():
+    kind = request.args.get("type", "all")
+    if kind not in ("all", "karya", "video"):
+        return jsonify({"message": "Parameter 'type' harus all, karya, atau video"}), 400
+    kinds = ("karya", "video") if kind == "all" else (kind,)
+    if "offset" in request.args:
+        return jsonify({"message": "Parameter 'offset' diganti 'cursor' dari next_cursor"}), 400
+    try:
+        limit = min(int(request.args.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+    except ValueError:
+        return jsonify({"message": "Parameter 'limit' harus angka"}), 400
+    if limit < 1:
+        return jsonify({"message": "Parameter 'limit' minimal 1"}), 400
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        decoded = decode_cursor(cursor)
+        if decoded is None:
+            return jsonify({"message": "Parameter 'cursor' tidak valid"}), 400
+        seed, offset, expected = decoded
+    else:
+        seed = request.args.get("seed") or secrets.token_urlsafe(8)
+        offset, expected = 0, None
+
+    items, next_offset = [], offset
+    for _ in range(MAX_ROUNDS):
+        entries, next_offset, version = sample(kinds, seed, next_offset, limit - len(items))
+        # Posisi di snapshot lain menunjuk item lain: halaman bisa dobel/terlewat
+        if expected is not None and version != expected:
+            return jsonify(
+                {
+                    "message": "Snapshot explore sudah diperbarui, mulai lagi dari halaman pertama",
+                    "seed": seed,
+                    "snapshot": version,
+                }
+            ), 409
+        expected = version
+        items.extend(fetch_live(entries))
+        if len(items) >= limit or next_offset is None:
+            break
+
+    return jsonify(
+        {
+            "items": items,
+            "seed": seed,
+            "snapshot": version,
+            "next_cursor": None if next_offset is None else encode_cursor(seed, next_offset, version),
+        }
+    )
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+from app.exporter import EXPORTS, FORMATS, iter_export
+from app.ratelimit import rate_cost
+from app.routes.decorators import internal_token_required
+
+export_bp = Blueprint("export", __name__)
+
+
+# ✅ Export streaming (NDJSON/CSV) untuk tim analitik; butuh X-Internal-Token
+@export_bp.route("/<string:resource>", methods=["GET"])
+@rate_cost(20)
+@internal_token_required
+def export_resource(resource):
+    if resource not in EXPORTS:
+        return jsonify({"message": "Resource tidak dikenal"}), 404
+
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in FORMATS:
+        return jsonify({"message": "Format harus ndjson atau csv"}), 400
+
+    include_deleted = request.args.get("include_deleted") == "1"
+    filename = f"{resource}-{datetime.utcnow():%Y%m%d%H%M%S}.{fmt}"
+    return Response(
+        stream_with_context(iter_export(resource, fmt, include_deleted)),
+        mimetype=FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
@@ -0,0 +1,138 @@
+import tracemalloc
+
+from flask import Blueprint, current_app, jsonify, request
+
+from app.profiling import HEADER, make_token
+from app.routes.decorators import internal_token_required
+
+internal_bp = Blueprint("internal", __name__)
+
+
+def int_arg(name, default, maximum):
+    """Parameter angka ``?name=``, dibatasi ke 1..maximum; None jika bukan angka."""
+    try:
+        value = int(request.args.get(name, default))
+    except ValueError:
+        return None
+    return max(1, min(value, maximum))
+
+
+def not_a_number(name):
+    return jsonify({"message": f"Parameter '{name}' harus angka"}), 400
+
+
+# ✅ Query lambat terbaru di proses ini (terbaru dulu)
+@internal_bp.route("/slow-queries", methods=["GET"])
+@internal_token_required
+def slow_queries():
+    recorder = current_app.extensions.get("slowlog")
+    if recorder is None:
+        return jsonify({"message": "Slow-query log tidak aktif (SLOW_QUERY_MS=0)"}), 404
+    limit = int_arg("limit", 50, recorder.entries.maxlen)
+    if limit is None:
+        return not_a_number("limit")
+    return jsonify(
+        {
+            "threshold_ms": current_app.config["SLOW_QUERY_MS"],
+            "items": recorder.recent(limit),
+        }
+    )
+
+
+# ✅ Counter metrik proses ini (mis. deadline_exceeded per route)
+@internal_bp.route("/metrics", methods=["GET"])
+@internal_token_required
+def metrics():
+    return jsonify(current_app.extensions["metrics"].snapshot())
+
+
+def profiling():
+    return current_app.extensions.get("profiling")
+
+
+def profiling_disabled():
+    return jsonify({"message": "Profiling tidak aktif (PROFILING_ENABLED=0)"}), 404
+
+
+# ✅ Nilai header X-Profile untuk mem-profile request berikutnya
+@internal_bp.route("/profile-token", methods=["POST"])
+@internal_token_required
+def profile_token():
+    if profiling() is None:
+        return profiling_disabled()
+    ttl = int_arg("ttl", 300, 3600)
+    if ttl is None:
+        return not_a_number("ttl")
+    return jsonify(
+        {"header": HEADER, "value": make_token(current_app.config["INTERNAL_API_TOKEN"], ttl)}
+    )
+
+
+@internal_bp.route("/profiles", methods=["GET"])
+@internal_token_required
+def list_profiles():
+    if profiling() is None:
+        return profiling_disabled()
+    return jsonify(profiling()["store"].summaries())
+
+
+@internal_bp.route("/profiles/<int:report_id>", methods=["GET"])
+@internal_token_required
+def get_profile(report_id):
+    if profiling() is None:
+        return profiling_disabled()
+    report = profiling()["store"].get(report_id)
+    if report is None:
+        return jsonify({"message": "Laporan profile tidak ditemukan"}), 404
+    if request.args.get("format") == "text":
+        return current_app.response_class(report["report"], mimetype="text/plain")
+    return jsonify(report)
+
+
+# ✅ tracemalloc: start/stop, snapshot (diff dengan snapshot sebelumnya), per route
+@internal_bp.route("/memory/start", methods=["POST"])
+@internal_token_required
+def memory_start():
+    if profiling() is None:
+        return profiling_disabled()
+    frames = int_arg("frames", 1, 25)
+    if frames is None:
+        return not_a_number("frames")
+    if not tracemalloc.is_tracing():
+        profiling()["memory"].reset()
+        tracemalloc.start(frames)
+    return jsonify({"tracing": True, "frames": tracemalloc.get_traceback_limit()})
+
+
+@internal_bp.route("/memory/stop", methods=["POST"])
+@internal_token_required
+def memory_stop():
+    if profiling() is None:
+        return profiling_disabled()
+    tracemalloc.stop()
+    profiling()["memory"].reset()
+    return jsonify({"tracing": False})
+
+
+@internal_bp.route("/memory/snapshot", methods=["POST"])
+@internal_token_required
+def memory_snapshot():
+    if profiling() is None:
+        return profiling_disabled()
+    if not tracemalloc.is_tracing():
+        return jsonify({"message": "tracemalloc belum aktif, panggil /memory/start"}), 409
+    limit = int_arg("limit", 25, 200)
+    if limit is None:
+        return not_a_number("limit")
+    key_type = "traceback" if request.args.get("group") == "traceback" else "lineno"
+    return jsonify(profiling()["memory"].snapshot(limit, key_type))
+
+
+@internal_bp.route("/memory/routes", methods=["GET"])
+@internal_token_required
+def memory_routes():
+    if profiling() is None:
+        return profiling_disabled()
+    return jsonify(
+        {"tracing": tracemalloc.is_tracing(), "routes": profiling()["memory"].route_stats()}
+    )
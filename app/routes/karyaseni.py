@@ -1,25 +1,27 @@
-import os
 from datetime import datetime
-from werkzeug.utils import secure_filename
 from flask import Blueprint, request, jsonify, current_app
 from app import db
-from app.models import karya_seni, User
+from app.models import KaryaFeed, karya_seni, User
+from app.fieldsets import Field, Fieldset, column
+from app.importer import BulkImportError, import_karya
+from app.cache import cache_tags, cached, invalidate
+from app.changefeed import change_feed_response
+from app.counters import add_like, like_total
+from app.feed import set_like_count, sync_karya
+from app.idempotency import idempotent
+from app.images import apply_metadata, image_metadata
+from app.jobs import enqueue
+from app.deadlines import deadline
+from app.ratelimit import rate_cost
+from app.realtime import publish_like
+from app.serializers import media_url, url_prefix, wita
+from app.uploads import claim_upload, save_upload
+from app.usernames import resolve_username
 import jwt
 from functools import wraps
-from pytz import timezone, utc
-import posixpath
 
 karya_seni_bp = Blueprint("karyaseni", __name__)
-UPLOAD_FOLDER = os.path.join("static", "uploads")
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
-WITA = timezone("Asia/Makassar")
-
-
-# Fungsi bantu untuk konversi UTC ke WITA
-def utc_to_wita(dt_utc):
-    if dt_utc:
-        return utc.localize(dt_utc).astimezone(WITA).strftime("%Y-%m-%d %H:%M:%S")
-    return None
 
 
 # Middleware token
@@ -48,6 +50,93 @@ def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+# Field yang bisa dipilih lewat ?fields= pada list dan detail karya
+KARYA_FIELDS = Fieldset(
+    karya_seni,
+    {
+        "id": column("id"),
+        "user_id": column("user_id"),
+        "judul_karya": column("judul_karya"),
+        "deskripsi": column("deskripsi"),
+        "link_foto": column("link_foto"),
+        "link_whatsapp": column("link_whatsapp"),
+        "created_at": column("created_at", wita),
+        "updated_at": column("updated_at", wita),
+        "like_count": column("like_count", lambda value: value or 0),
+        "foto_width": column("foto_width"),
+        "foto_height": column("foto_height"),
+        "foto_color": column("foto_color"),
+        "foto_blurhash": column("foto_blurhash"),
+        "artist": Field(
+            lambda karya, ctx: ctx["artists"].get(karya.user_id, "Anonim"), ("user_id",)
+        ),
+    },
+)
+
+# Listing dari read model karya_feed: key sama dengan KARYA_FIELDS, artist
+# sudah ada di baris feed sehingga tidak perlu query ke users
+FEED_FIELDS = Fieldset(
+    KaryaFeed,
+    {
+        **{
+            key: field
+            for key, field in KARYA_FIELDS.fields.items()
+            if key != "artist"
+        },
+        "artist": column("artist_username", lambda value: value or "Anonim"),
+        "artist_foto": Field(
+            lambda row, ctx: media_url(row.artist_foto, ctx["url_prefix"]), ("artist_foto",)
+        ),
+    },
+)
+
+
+def feed_page(keys, newest_first=False, limit=None):
+    query = KaryaFeed.query.options(FEED_FIELDS.load_only(keys))
+    if newest_first:
+        # Range scan index (created_at, id)
+        query = query.order_by(KaryaFeed.created_at.desc(), KaryaFeed.id.desc())
+    else:
+        query = query.order_by(KaryaFeed.id)
+    if limit:
+        query = query.limit(limit)
+    return FEED_FIELDS.serialize_many(query.all(), keys, {"url_prefix": url_prefix()})
+
+
+# Versi ringkas untuk halaman profil (/by-user), dengan nama key berbeda
+KARYA_BY_USER_FIELDS = Fieldset(
+    karya_seni,
+    {
+        "id": column("id"),
+        "title": column("judul_karya"),
+        "description": column("deskripsi"),
+        "photo": column("link_foto"),
+        "whatsapp": column("link_whatsapp"),
+        "photo_width": column("foto_width"),
+        "photo_height": column("foto_height"),
+        "photo_color": column("foto_color"),
+        "photo_blurhash": column("foto_blurhash"),
+        "created_at": column("created_at", wita),
+    },
+)
+
+
+def artist_names(karya_list):
+    # Satu query untuk semua username artist, bukan satu query per karya
+    user_ids = {karya.user_id for karya in karya_list}
+    if not user_ids:
+        return {}
+    rows = (
+        db.session.query(User.id, User.username).filter(User.id.in_(user_ids)).all()
+    )
+    return dict(rows)
+
+
+def serialize_karya_list(karya_list, keys):
+    ctx = {"artists": artist_names(karya_list) if "artist" in keys else {}}
+    return KARYA_FIELDS.serialize_many(karya_list, keys, ctx)
+
+
 # ✅ CORS Preflight handler untuk POST /api/karya_seni
 @karya_seni_bp.route("/", methods=["OPTIONS"])
 def preflight_karya():
@@ -56,22 +145,27 @@ def preflight_karya():
 
 # ✅ CREATE
 @karya_seni_bp.route("", methods=["POST"])
+@rate_cost(10)
 @token_required
+@idempotent
 def create_karya(current_user):
     try:
         data = request.form
         foto = request.files.get("link_foto")
-
-        if not foto or not allowed_file(foto.filename):
+        metadata = {}
+
+        # ✅ Foto bisa sudah diupload langsung ke storage (presigned URL)
+        if data.get("link_foto_key"):
+            public_url = claim_upload(data["link_foto_key"], "karya", current_user.id)
+            if not public_url:
+                return jsonify({"error": "link_foto_key tidak valid"}), 400
+        elif foto and allowed_file(foto.filename):
+            # ✅ Ukuran, warna & blurhash untuk placeholder di frontend
+            metadata = image_metadata(foto.stream)
+            public_url = save_upload(foto, "karya", current_user.id)
+        else:
             return jsonify({"error": "File foto tidak valid"}), 400
 
-        filename = secure_filename(foto.filename)
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        foto.save(filepath)
-
-        public_url = posixpath.join("static", "uploads", filename)
-
         new_karya = karya_seni(
             user_id=current_user.id,
             judul_karya=data.get("judul_karya"),
@@ -79,10 +173,16 @@ def create_karya(current_user):
             link_foto=public_url,
             link_whatsapp=data.get("link_whatsapp"),
             created_at=datetime.utcnow(),
+            **metadata,
         )
 
         db.session.add(new_karya)
+        db.session.flush()
+        if data.get("link_foto_key"):
+            enqueue("extract_image_metadata", {"karya_id": new_karya.id, "key": data["link_foto_key"]})
+        sync_karya(karya_seni.id == new_karya.id)
         db.session.commit()
+        invalidate("karya", f"user:{current_user.id}:content")
         return (
             jsonify(
                 {
@@ -96,35 +196,63 @@ def create_karya(current_user):
         return jsonify({"error": str(e)}), 500
 
 
+# ✅ BULK IMPORT: zip berisi gambar + manifest.json/manifest.csv
+@karya_seni_bp.route("/bulk", methods=["POST"])
+@rate_cost(20)
+@deadline(60)
+@token_required
+def bulk_import_karya(current_user):
+    archive = request.files.get("archive")
+    if not archive:
+        return jsonify({"error": "File zip (field 'archive') wajib diisi"}), 400
+    try:
+        summary = import_karya(archive.stream, current_user.id, ALLOWED_EXTENSIONS)
+    except BulkImportError as e:
+        return jsonify({"error": str(e)}), 400
+    invalidate("karya", f"user:{current_user.id}:content")
+    return jsonify(summary), 201 if summary["created"] else 400
+
+
 # ✅ READ (public)
 # SESUDAH
 @karya_seni_bp.route("", methods=["GET"])
+@rate_cost(5)
+@cached("karya")
 def get_all_karya():
-    karya_list = karya_seni.query.filter_by(deleted_at=None).all()
-    results = []
-    for karya in karya_list:
-        user = User.query.get(karya.user_id)
-        results.append(
-            {
-                "id": karya.id,
-                "user_id": karya.user_id,
-                "judul_karya": karya.judul_karya,
-                "deskripsi": karya.deskripsi,
-                "link_foto": karya.link_foto,
-                "link_whatsapp": karya.link_whatsapp,
-                "created_at": utc_to_wita(karya.created_at),
-                "updated_at": utc_to_wita(karya.updated_at),
-                "like_count": karya.like_count or 0, 
-                "artist": user.username if user else "Anonim"  # 🟢 Tambahkan baris ini
-            }
-        )
-    return jsonify(results)
+    return jsonify(feed_page(FEED_FIELDS.requested()))
+
+
+# ✅ Change feed: karya yang dibuat/diubah/dihapus sejak watermark
+@karya_seni_bp.route("/changes", methods=["GET"])
+def get_karya_changes():
+    return change_feed_response(
+        karya_seni,
+        KARYA_FIELDS,
+        lambda rows, keys: {"artists": artist_names(rows) if "artist" in keys else {}},
+    )
+
+
+# ✅ READ satu karya (public)
+@karya_seni_bp.route("/<int:id>", methods=["GET"])
+@cached("karya:{id}")
+def get_karya_detail(id):
+    keys = KARYA_FIELDS.requested()
+    karya = (
+        karya_seni.query.filter_by(id=id, deleted_at=None)
+        .options(KARYA_FIELDS.load_only(keys))
+        .first()
+    )
+    if not karya:
+        return jsonify({"message": "Karya seni tidak ditemukan"}), 404
+    cache_tags(f"user:{karya.user_id}")
+    return jsonify(serialize_karya_list([karya], keys)[0])
 
 
 
 # ✅ UPDATE
 # ✅ UPDATE
 @karya_seni_bp.route("/<int:id>", methods=["PUT"])
+@rate_cost(5)
 @token_required
 def update_karya(current_user, id):
     karya = karya_seni.query.get_or_404(id)
@@ -138,16 +266,21 @@ def update_karya(current_user, id):
 
     # ✅ Tambahkan proses upload ulang jika ada file foto baru
     foto = request.files.get("link_foto")
-    if foto and allowed_file(foto.filename):
-        filename = secure_filename(foto.filename)
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        foto.save(filepath)
-        public_url = posixpath.join("static", "uploads", filename)
+    if data.get("link_foto_key"):
+        public_url = claim_upload(data["link_foto_key"], "karya", current_user.id)
+        if not public_url:
+            return jsonify({"message": "link_foto_key tidak valid"}), 400
         karya.link_foto = public_url
+        apply_metadata(karya, {})
+        enqueue("extract_image_metadata", {"karya_id": karya.id, "key": data["link_foto_key"]})
+    elif foto and allowed_file(foto.filename):
+        apply_metadata(karya, image_metadata(foto.stream))
+        karya.link_foto = save_upload(foto, "karya", current_user.id)
 
     karya.updated_at = datetime.utcnow()
+    sync_karya(karya_seni.id == karya.id)
     db.session.commit()
+    invalidate("karya", f"karya:{id}", f"user:{karya.user_id}:content")
 
     return jsonify({"message": "Karya seni berhasil diperbarui"})
 
@@ -161,35 +294,32 @@ def delete_karya(current_user, id):
         return jsonify({"message": "Tidak boleh hapus karya milik orang lain"}), 403
 
     karya.deleted_at = datetime.utcnow()
+    sync_karya(karya_seni.id == karya.id)
     db.session.commit()
+    invalidate("karya", f"karya:{id}", f"user:{karya.user_id}:content")
     return jsonify({"message": "Karya seni berhasil dihapus (soft delete)"})
 
 
 # ✅ GET karya berdasarkan username (public)
 @karya_seni_bp.route("/by-user", methods=["GET"])
+@cached()
 def get_karya_by_username():
     username = request.args.get("owner")
     if not username:
         return jsonify({"message": "Parameter 'owner' (username) wajib diisi"}), 400
 
-    user = User.query.filter_by(username=username, deleted_at=None).first()
-    if not user:
+    user_id = resolve_username(username)
+    if user_id is None:
         return jsonify({"message": "User tidak ditemukan"}), 404
 
-    karya_list = karya_seni.query.filter_by(user_id=user.id, deleted_at=None).all()
-    results = []
-    for karya in karya_list:
-        results.append(
-            {
-                "id": karya.id,
-                "title": karya.judul_karya,
-                "description": karya.deskripsi,
-                "photo": karya.link_foto,
-                "whatsapp": karya.link_whatsapp,
-                "created_at": utc_to_wita(karya.created_at),
-            }
-        )
-    return jsonify(results)
+    cache_tags(f"user:{user_id}", f"user:{user_id}:content")
+    keys = KARYA_BY_USER_FIELDS.requested()
+    karya_list = (
+        karya_seni.query.filter_by(user_id=user_id, deleted_at=None)
+        .options(KARYA_BY_USER_FIELDS.load_only(keys))
+        .all()
+    )
+    return jsonify(KARYA_BY_USER_FIELDS.serialize_many(karya_list, keys))
 
 
 # 👍 Endpoint LIKE karya seni
@@ -197,13 +327,21 @@ def get_karya_by_username():
 @token_required
 def like_karya(current_user, id):
     karya = karya_seni.query.get_or_404(id)
-    karya.like_count = (karya.like_count or 0) + 1
-    karya.updated_at = datetime.utcnow()
+    # Karya yang sedang ramai: like masuk ke counter ter-shard
+    if not add_like("karya", karya.id, 1):
+        karya.like_count = (karya.like_count or 0) + 1
+        karya.updated_at = datetime.utcnow()
+        set_like_count(karya)
     db.session.commit()
+    # Listing tidak di-invalidate per like (like_count di listing boleh
+    # tertinggal sampai TTL; angka live lewat /api/live/likes)
+    invalidate(f"karya:{id}")
+    like_count = like_total("karya", id)
+    publish_like("karya", id, like_count)
 
     return jsonify({
         "message": "Karya berhasil di-like",
-        "like_count": karya.like_count
+        "like_count": like_count
     }), 200
 
 
@@ -211,64 +349,31 @@ def like_karya(current_user, id):
 @token_required
 def unlike_karya(current_user, id):
     karya = karya_seni.query.get_or_404(id)
-    if karya.like_count and karya.like_count > 0:
-        karya.like_count -= 1
-        karya.updated_at = datetime.utcnow()
+    like_count = like_total("karya", id)
+    if like_count > 0:
+        if not add_like("karya", karya.id, -1):
+            karya.like_count = (karya.like_count or 0) - 1
+            karya.updated_at = datetime.utcnow()
+            set_like_count(karya)
         db.session.commit()
+        invalidate(f"karya:{id}")
+        like_count = like_total("karya", id)
+        publish_like("karya", id, like_count)
     return jsonify({
         "message": "Karya berhasil di-unlike",
-        "like_count": karya.like_count
+        "like_count": like_count
     }), 200
 
 # ✅ GET 6 karya seni terbaru untuk beranda
 @karya_seni_bp.route("/beranda", methods=["GET"])
+@rate_cost(3)
+@cached("karya")
 def get_karya_terbaru():
-    karya_list = (
-        karya_seni.query.filter_by(deleted_at=None)
-        .order_by(karya_seni.created_at.desc())  # Urutkan dari yang paling baru
-        .limit(6)
-        .all()
-    )
+    return jsonify(feed_page(FEED_FIELDS.requested(), newest_first=True, limit=6))
+
 
-    results = []
-    for karya in karya_list:
-        user = User.query.get(karya.user_id)
-        results.append({
-            "id": karya.id,
-            "user_id": karya.user_id,
-            "judul_karya": karya.judul_karya,
-            "deskripsi": karya.deskripsi,
-            "link_foto": karya.link_foto,
-            "link_whatsapp": karya.link_whatsapp,
-            "created_at": utc_to_wita(karya.created_at),
-            "updated_at": utc_to_wita(karya.updated_at),
-            "like_count": karya.like_count or 0,
-            "artist": user.username if user else "Anonim"
-        })
-    return jsonify(results)
 @karya_seni_bp.route("/latest", methods=["GET"])
+@rate_cost(3)
+@cached("karya")
 def get_latest_karya():
-    karya_list = (
-        karya_seni.query.filter_by(deleted_at=None)
-        .order_by(karya_seni.created_at.desc())
-        .limit(6)
-        .all()
-    )
-    results = []
-    for karya in karya_list:
-        user = User.query.get(karya.user_id)
-        results.append(
-            {
-                "id": karya.id,
-                "user_id": karya.user_id,
-                "judul_karya": karya.judul_karya,
-                "deskripsi": karya.deskripsi,
-                "link_foto": karya.link_foto,
-                "link_whatsapp": karya.link_whatsapp,
-                "created_at": utc_to_wita(karya.created_at),
-                "updated_at": utc_to_wita(karya.updated_at),
-                "like_count": karya.like_count or 0,
-                "artist": user.username if user else "Anonim",
-            }
-        )
-    return jsonify(results)
+    return jsonify(feed_page(FEED_FIELDS.requested(), newest_first=True, limit=6))
@@ -0,0 +1,54 @@
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+
+from app.realtime import stream_likes
+
+live_bp = Blueprint("live", __name__)
+
+
+def parse_ids(raw):
+    return {int(value) for value in raw.split(",") if value.strip()} if raw else set()
+
+
+# ✅ SSE: update like_count untuk karya/video yang dipilih
+# Contoh: GET /api/live/likes?karya=1,2&video=5
+@live_bp.route("/likes", methods=["GET"])
+def stream_like_counts():
+    try:
+        keys = {f"karya:{i}" for i in parse_ids(request.args.get("karya"))}
+        keys |= {f"video:{i}" for i in parse_ids(request.args.get("video"))}
+    except ValueError:
+        return jsonify({"message": "Parameter karya/video harus daftar id angka"}), 400
+
+    if not keys:
+        return jsonify({"message": "Pilih minimal satu id karya atau video"}), 400
+    if len(keys) > current_app.config["REALTIME_MAX_KEYS"]:
+        return jsonify({"message": "Terlalu banyak id dalam satu langganan"}), 400
+
+    realtime = current_app.extensions["realtime"]
+    if realtime is None:
+        # Multi-worker tanpa broker: sebagian besar update tidak akan sampai
+        return jsonify({"message": "Update live tidak tersedia"}), 503
+
+    # Tiap stream memakai satu thread worker selama koneksi terbuka
+    streams = realtime["streams"]
+    if not streams.acquire(blocking=False):
+        response = jsonify({"message": "Terlalu banyak koneksi live, coba lagi nanti"})
+        response.status_code = 503
+        response.headers["Retry-After"] = "10"
+        return response
+
+    response = Response(
+        stream_with_context(
+            stream_likes(
+                keys,
+                realtime["hub"],
+                current_app.config["REALTIME_COALESCE_SECONDS"],
+                current_app.config["REALTIME_HEARTBEAT_SECONDS"],
+            )
+        ),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # close() dipanggil server WSGI, juga saat body tidak pernah diiterasi
+    response.call_on_close(streams.release)
+    return response
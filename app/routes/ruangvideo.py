@@ -4,13 +4,23 @@ from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
 from app import db
 from app.models import ruang_video, User, LikeVideo
+from app.jobs import enqueue, job_handler
+from app.idempotency import idempotent
+from app.deadlines import deadline
+from app.ratelimit import rate_cost
+from app.fieldsets import Field, Fieldset, column
+from app.importer import BulkImportError, import_videos
+from app.cache import cache_tags, cached, invalidate
+from app.changefeed import change_feed_response
+from app.counters import add_like, like_total, take_shards
+from app.realtime import publish_like
+from app.serializers import wita
+from app.usernames import resolve_username
 import jwt
 from functools import wraps
-from pytz import timezone, utc
 from flask_cors import cross_origin
 
 ruang_video_bp = Blueprint("ruangvideo", __name__)
-WITA = timezone("Asia/Makassar")
 
 
 # JWT middleware
@@ -35,16 +45,57 @@ def token_required(f):
     return decorated
 
 
-def utc_to_wita(dt_utc):
-    if dt_utc:
-        return utc.localize(dt_utc).astimezone(WITA).strftime("%Y-%m-%d %H:%M:%S")
-    return None
+# Field yang bisa dipilih lewat ?fields= pada list dan detail video
+VIDEO_FIELDS = Fieldset(
+    ruang_video,
+    {
+        "id": column("id"),
+        "user_id": column("user_id"),
+        "judul": column("judul"),
+        "link_youtube": column("link_youtube"),
+        "link_thumbnail": column("link_thumbnail"),
+        "deskripsi": column("deskripsi"),
+        "dibuat_oleh": column("dibuat_oleh"),
+        "created_at": column("created_at", wita),
+        "updated_at": column("updated_at", wita),
+    },
+)
+
+# Versi ringkas untuk halaman profil (/by-user)
+VIDEO_BY_USER_FIELDS = Fieldset(
+    ruang_video,
+    {
+        "id": column("id"),
+        "title": column("judul"),
+        "description": column("deskripsi"),
+        "youtubeLink": column("link_youtube"),
+        # Model tidak punya thumbnail_url, jadi nilainya selalu None seperti sebelumnya
+        "thumbnail": Field(lambda video, ctx: None),
+    },
+)
+
+# Video milik user login (/me)
+MY_VIDEO_FIELDS = Fieldset(
+    ruang_video,
+    {
+        "id": column("id"),
+        "title": column("judul"),
+        "description": column("deskripsi"),
+        "youtubeLink": column("link_youtube"),
+        "thumbnail": column("link_thumbnail"),
+        "dibuat_oleh": column("dibuat_oleh"),
+        "created_at": column("created_at", wita),
+        "updated_at": column("updated_at", wita),
+    },
+)
 
 
 # ✅ CREATE
 @ruang_video_bp.route("", methods=["POST"])
+@rate_cost(5)
 @cross_origin(origin="http://localhost:5173")
 @token_required
+@idempotent
 def create_video(current_user):
     
     try:
@@ -80,32 +131,62 @@ def create_video(current_user):
 
         db.session.add(new_video)
         db.session.commit()
+        invalidate("video", f"user:{current_user.id}:content")
         return jsonify({"message": "Video berhasil ditambahkan"}), 201
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# ✅ BULK IMPORT: list JSON atau {"items": [...]}
+@ruang_video_bp.route("/bulk", methods=["POST"])
+@rate_cost(20)
+@deadline(60)
+@token_required
+def bulk_import_video(current_user):
+    data = request.get_json(silent=True)
+    items = data.get("items") if isinstance(data, dict) else data
+    try:
+        summary = import_videos(items, current_user.id)
+    except BulkImportError as e:
+        return jsonify({"error": str(e)}), 400
+    invalidate("video", f"user:{current_user.id}:content")
+    return jsonify(summary), 201 if summary["created"] else 400
+
+
 # ✅ READ (public)
 @ruang_video_bp.route("", methods=["GET"])
+@rate_cost(5)
+@cached("video")
 def get_all_video():
-    videos = ruang_video.query.filter_by(deleted_at=None).all()
-    results = []
-    for v in videos:
-        results.append(
-            {
-                "id": v.id,
-                "user_id": v.user_id,
-                "judul": v.judul,
-                "link_youtube": v.link_youtube,
-                "link_thumbnail": v.link_thumbnail,
-                "deskripsi": v.deskripsi,
-                "dibuat_oleh": v.dibuat_oleh,
-                "created_at": utc_to_wita(v.created_at),
-                "updated_at": utc_to_wita(v.updated_at),
-            }
-        )
-    return jsonify(results)
+    keys = VIDEO_FIELDS.requested()
+    videos = (
+        ruang_video.query.filter_by(deleted_at=None)
+        .options(VIDEO_FIELDS.load_only(keys))
+        .all()
+    )
+    return jsonify(VIDEO_FIELDS.serialize_many(videos, keys))
+
+
+# ✅ Change feed: video yang dibuat/diubah/dihapus sejak watermark
+@ruang_video_bp.route("/changes", methods=["GET"])
+def get_video_changes():
+    return change_feed_response(ruang_video, VIDEO_FIELDS)
+
+
+# ✅ READ satu video (public)
+@ruang_video_bp.route("/<int:id>", methods=["GET"])
+@cached("video:{id}")
+def get_video_detail(id):
+    keys = VIDEO_FIELDS.requested()
+    video = (
+        ruang_video.query.filter_by(id=id, deleted_at=None)
+        .options(VIDEO_FIELDS.load_only(keys))
+        .first()
+    )
+    if not video:
+        return jsonify({"message": "Video tidak ditemukan"}), 404
+    return jsonify(VIDEO_FIELDS.serialize(video, keys))
 
 
 # ✅ UPDATE
@@ -124,6 +205,7 @@ def update_video(current_user, id):
     video.dibuat_oleh = data.get("dibuat_oleh", video.dibuat_oleh)
     video.updated_at = datetime.utcnow()
     db.session.commit()
+    invalidate("video", f"video:{id}", f"user:{video.user_id}:content")
     return jsonify({"message": "Video berhasil diperbarui"})
 
 
@@ -137,56 +219,43 @@ def delete_video(current_user, id):
 
     video.deleted_at = datetime.utcnow()
     db.session.commit()
+    invalidate("video", f"video:{id}", f"user:{video.user_id}:content")
     return jsonify({"message": "Video berhasil dihapus"})
 
 
 @ruang_video_bp.route("/by-user", methods=["GET"])
+@cached()
 def get_video_by_owner():
 
     username = request.args.get("owner")
     if not username:
         return jsonify({"message": "Parameter 'owner' (username) wajib"}), 400
 
-    user = User.query.filter_by(username=username, deleted_at=None).first()
-    if not user:
+    user_id = resolve_username(username)
+    if user_id is None:
         return jsonify({"message": "User tidak ditemukan"}), 404
 
-    video_list = ruang_video.query.filter_by(user_id=user.id, deleted_at=None).all()
-    result = []
-    for video in video_list:
-        result.append(
-            {
-                "id": video.id,
-                "title": video.judul,
-                "description": video.deskripsi,
-                "youtubeLink": video.link_youtube,
-                "thumbnail": (
-                    video.thumbnail_url if hasattr(video, "thumbnail_url") else None
-                ),
-            }
-        )
-    return jsonify(result)
+    cache_tags(f"user:{user_id}", f"user:{user_id}:content")
+    keys = VIDEO_BY_USER_FIELDS.requested()
+    video_list = (
+        ruang_video.query.filter_by(user_id=user_id, deleted_at=None)
+        .options(VIDEO_BY_USER_FIELDS.load_only(keys))
+        .all()
+    )
+    return jsonify(VIDEO_BY_USER_FIELDS.serialize_many(video_list, keys))
 
 # ✅ HANYA video milik user login
 @ruang_video_bp.route("/me", methods=["GET"])
 @token_required
+@cached("user:{user_id}:content", per_user=True)
 def get_my_video(current_user):
-    videos = ruang_video.query.filter_by(user_id=current_user.id, deleted_at=None).all()
-    result = []
-    for v in videos:
-        result.append(
-            {
-                "id": v.id,
-                "title": v.judul,
-                "description": v.deskripsi,
-                "youtubeLink": v.link_youtube,
-                "thumbnail": v.link_thumbnail,
-                "dibuat_oleh": v.dibuat_oleh,
-                "created_at": utc_to_wita(v.created_at),
-                "updated_at": utc_to_wita(v.updated_at),
-            }
-        )
-    return jsonify(result)
+    keys = MY_VIDEO_FIELDS.requested()
+    videos = (
+        ruang_video.query.filter_by(user_id=current_user.id, deleted_at=None)
+        .options(MY_VIDEO_FIELDS.load_only(keys))
+        .all()
+    )
+    return jsonify(MY_VIDEO_FIELDS.serialize_many(videos, keys))
 
 
 @ruang_video_bp.route("/<int:id>/like", methods=["POST"])
@@ -199,25 +268,43 @@ def toggle_like_video(current_user, id):
 
     if existing_like:
         db.session.delete(existing_like)
-        action = "unliked"
+        delta, action = -1, "unliked"
     else:
         new_like = LikeVideo(user_id=current_user.id, video_id=id)
         db.session.add(new_like)
-        action = "liked"
+        delta, action = 1, "liked"
 
-    db.session.commit()
+    # Video yang sedang ramai: perkiraan sementara masuk ke counter ter-shard
+    if not add_like("video", id, delta):
+        video.like_count = max((video.like_count or 0) + delta, 0)
 
-    # Hitung ulang jumlah like
-    like_count = LikeVideo.query.filter_by(video_id=id).count()
-    video.like_count = like_count
+    # Hitung ulang jumlah like di worker; dedup_key menggabungkan like beruntun
+    enqueue("recount_video_likes", {"video_id": id}, dedup_key=f"video-likes:{id}")
     db.session.commit()
+    invalidate(f"video:{id}", f"user:{current_user.id}:likes")
+    like_count = max(like_total("video", id), 0)
+    publish_like("video", id, like_count)
 
     return jsonify({
         "message": f"Video berhasil di-{action}",
-        "like_count": video.like_count
+        "like_count": like_count
     }), 200
 
 
+@job_handler("recount_video_likes")
+def recount_video_likes(video_id):
+    # Hitungan dari like_video sudah mencakup delta di counter ter-shard
+    take_shards("video", video_id)
+    like_count = LikeVideo.query.filter_by(video_id=video_id).count()
+    ruang_video.query.filter_by(id=video_id).update(
+        {"like_count": like_count, "updated_at": ruang_video.updated_at},
+        synchronize_session=False,
+    )
+    db.session.commit()
+    invalidate(f"video:{video_id}")
+    publish_like("video", video_id, like_count)
+
+
 # @ruang_video_bp.route("/liked", methods=["GET"])
 # @token_required
 # def get_liked_video_ids(current_user):
@@ -226,11 +313,11 @@ def toggle_like_video(current_user, id):
 
 @ruang_video_bp.route("/liked", methods=["GET"])
 @token_required
+@cached("user:{user_id}:likes", per_user=True)
 def get_liked_video_ids(current_user):
     try:
-        print("User ID:", current_user.id)
         liked_ids = [lv.video_id for lv in LikeVideo.query.filter_by(user_id=current_user.id).all()]
         return jsonify({"liked_video_ids": liked_ids})
     except Exception as e:
-        print("🔥 ERROR:", e)
+        current_app.logger.exception("Gagal mengambil video yang disukai user %s", current_user.id)
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,119 @@
+from flask import Blueprint, current_app, jsonify, request
+
+from app.ratelimit import rate_cost
+from app.routes.decorators import token_required
+from app.storage import SignedLocalUploads, StorageError, get_storage
+from app.uploads import key_owner, key_pattern, new_key
+
+storage_bp = Blueprint("storage", __name__)
+
+# Ekstensi yang boleh diupload langsung per jenis upload
+ALLOWED_EXTENSIONS = {
+    "karya": {"png", "jpg", "jpeg", "gif"},
+    "profile": {"png", "jpg", "jpeg"},
+}
+MAX_PARTS = 1000
+
+
+def presign_expires():
+    return current_app.config.get("STORAGE_PRESIGN_EXPIRES", 900)
+
+
+def requested_key(data, owner_id):
+    """Validasi body {kind, filename}; kembalikan (key, None) atau (None, response error)."""
+    kind = data.get("kind")
+    filename = data.get("filename") or ""
+    if kind not in ALLOWED_EXTENSIONS:
+        return None, (jsonify({"message": "kind harus 'karya' atau 'profile'"}), 400)
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if ext not in ALLOWED_EXTENSIONS[kind]:
+        return None, (jsonify({"message": f"Ekstensi file {filename} tidak diizinkan"}), 400)
+    return new_key(filename, kind, owner_id), None
+
+
+# ✅ Presigned URL untuk upload langsung ke storage
+# Body: {"kind": "karya", "filename": "lukisan.jpg", "content_type": "image/jpeg"}
+# Setelah upload, kirim "key" sebagai field link_foto_key / foto_profil_key
+@storage_bp.route("/presign", methods=["POST"])
+@token_required
+def presign_upload(current_user):
+    data = request.get_json(silent=True) or {}
+    key, error = requested_key(data, current_user.id)
+    if error:
+        return error
+    storage = get_storage()
+    upload = storage.presign_upload(key, data.get("content_type"), presign_expires())
+    return jsonify({"key": key, "public_url": storage.url(key), **upload}), 201
+
+
+# ✅ Multipart upload untuk file besar (backend s3/memory)
+# Body: {"kind": "karya", "filename": "...", "content_type": "...", "parts": 3}
+@storage_bp.route("/multipart", methods=["POST"])
+@token_required
+def create_multipart(current_user):
+    storage = get_storage()
+    if not storage.supports_multipart:
+        return jsonify({"message": "Backend storage tidak mendukung multipart upload"}), 400
+
+    data = request.get_json(silent=True) or {}
+    key, error = requested_key(data, current_user.id)
+    if error:
+        return error
+    try:
+        parts = int(data.get("parts", 1))
+    except (TypeError, ValueError):
+        return jsonify({"message": "parts harus angka"}), 400
+    if not 1 <= parts <= MAX_PARTS:
+        return jsonify({"message": f"parts harus antara 1 dan {MAX_PARTS}"}), 400
+
+    upload = storage.create_multipart(key, data.get("content_type"), parts, presign_expires())
+    return jsonify({"key": key, "public_url": storage.url(key), **upload}), 201
+
+
+# Body: {"key": "...", "upload_id": "...", "parts": [{"part_number": 1, "etag": "..."}]}
+@storage_bp.route("/multipart/complete", methods=["POST"])
+@token_required
+def complete_multipart(current_user):
+    storage = get_storage()
+    if not storage.supports_multipart:
+        return jsonify({"message": "Backend storage tidak mendukung multipart upload"}), 400
+
+    data = request.get_json(silent=True) or {}
+    key = data.get("key") or ""
+    parts = data.get("parts")
+    if not any(key_pattern(kind).fullmatch(key) for kind in ALLOWED_EXTENSIONS):
+        return jsonify({"message": "Key tidak valid"}), 400
+    if key_owner(key) != current_user.id:
+        return jsonify({"message": "Key bukan milik user ini"}), 403
+    if not data.get("upload_id") or not isinstance(parts, list) or not parts:
+        return jsonify({"message": "upload_id dan parts wajib diisi"}), 400
+    try:
+        public_url = storage.complete_multipart(key, data["upload_id"], parts)
+    except (KeyError, TypeError, StorageError) as e:
+        return jsonify({"message": f"Gagal menyelesaikan upload: {e}"}), 400
+    return jsonify({"key": key, "public_url": public_url})
+
+
+# ✅ URL download (presigned jika bucket privat)
+@storage_bp.route("/download", methods=["GET"])
+def download_url():
+    key = request.args.get("key") or ""
+    if not any(key_pattern(kind).fullmatch(key) for kind in ALLOWED_EXTENSIONS):
+        return jsonify({"message": "Key tidak valid"}), 400
+    return jsonify({"url": get_storage().presign_download(key, presign_expires())})
+
+
+# Target presigned URL untuk backend local/memory (pengganti PUT langsung ke S3)
+@storage_bp.route("/local/<path:key>", methods=["PUT"])
+@rate_cost(10)
+def local_upload(key):
+    storage = get_storage()
+    if not isinstance(storage, SignedLocalUploads):
+        return jsonify({"message": "Not found"}), 404
+    if not storage.verify(key, request.args.get("expires"), request.args.get("sig")):
+        return jsonify({"message": "Signature tidak valid atau kedaluwarsa"}), 403
+    try:
+        storage.save(key, request.stream, request.mimetype or None)
+    except StorageError as e:
+        return jsonify({"message": str(e)}), 400
+    return "", 204
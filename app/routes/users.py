@@ -1,15 +1,21 @@
-import os
 from flask import Blueprint, request, jsonify, current_app
-from werkzeug.utils import secure_filename
 from datetime import datetime
 from functools import wraps
 from app.models import db, User
 import jwt
 from app.models import User, karya_seni, ruang_video
+from app.fieldsets import Field, Fieldset, column
+from app.cache import cache_tags, cached, invalidate
+from app.changefeed import change_feed_response
+from app.feed import sync_artists
+from app.passwords import PasswordServiceBusy, busy_response, hash_password
+from app.ratelimit import rate_cost
+from app.serializers import media_url, url_prefix
+from app.uploads import claim_upload, save_upload
+from app.usernames import forget_username, resolve_username
 
 users_bp = Blueprint("users", __name__)
 
-UPLOAD_FOLDER = "static/uploads/profile_pictures"
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg"}
 
 
@@ -18,6 +24,98 @@ def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def foto_profil_url(user, ctx):
+    return media_url(user.foto_profil, ctx["url_prefix"])
+
+
+def or_empty(value):
+    return value or ""
+
+
+def upload_url(name):
+    """Field URL lengkap untuk kolom upload ``name``."""
+    return Field(lambda obj, ctx: media_url(getattr(obj, name), ctx["url_prefix"]), (name,))
+
+
+# Karya dan video di detail seniman (key lama dipertahankan untuk frontend)
+DETAIL_KARYA_FIELDS = Fieldset(
+    karya_seni,
+    {
+        "id": column("id"),
+        "judul_karya": column("judul_karya", or_empty),
+        "deskripsi": column("deskripsi", or_empty),
+        "link_foto": column("link_foto", or_empty),
+        "link_whatsapp": column("link_whatsapp", or_empty),
+        "photo": upload_url("link_foto"),
+        "foto_width": column("foto_width"),
+        "foto_height": column("foto_height"),
+        "foto_color": column("foto_color"),
+        "foto_blurhash": column("foto_blurhash"),
+    },
+)
+
+DETAIL_VIDEO_FIELDS = Fieldset(
+    ruang_video,
+    {
+        "id": column("id"),
+        "judul": column("judul", or_empty),
+        "deskripsi": column("deskripsi", or_empty),
+        "link_youtube": column("link_youtube", or_empty),
+        "link_thumbnail": upload_url("link_thumbnail"),
+        "title": column("judul", or_empty),
+        "description": column("deskripsi", or_empty),
+        "youtubeLink": column("link_youtube", or_empty),
+        "thumbnail": upload_url("link_thumbnail"),
+    },
+)
+
+
+def detail_karya(user, ctx):
+    karya_list = karya_seni.query.filter_by(user_id=user.id, deleted_at=None).all()
+    return DETAIL_KARYA_FIELDS.serialize_many(karya_list, list(DETAIL_KARYA_FIELDS.fields), ctx)
+
+
+def detail_video(user, ctx):
+    video_list = ruang_video.query.filter_by(user_id=user.id, deleted_at=None).all()
+    return DETAIL_VIDEO_FIELDS.serialize_many(video_list, list(DETAIL_VIDEO_FIELDS.fields), ctx)
+
+
+# Field yang bisa dipilih lewat ?fields= pada list user
+USER_FIELDS = Fieldset(
+    User,
+    {
+        "id": column("id"),
+        "email": column("email"),
+        "username": column("username"),
+        "nama_lengkap": column("nama_lengkap"),
+        "bio": column("bio"),
+        "lokasi": column("lokasi"),
+        "created_at": column("created_at"),
+        "foto_profil": Field(foto_profil_url, ("foto_profil",)),
+    },
+)
+
+# Profil publik berdasarkan username
+USER_PROFILE_FIELDS = Fieldset(
+    User, {key: field for key, field in USER_FIELDS.fields.items() if key != "created_at"}
+)
+
+# Detail seniman beserta karya dan videonya
+USER_DETAIL_FIELDS = Fieldset(
+    User,
+    {
+        "id": column("id"),
+        "username": column("username"),
+        "nama_lengkap": column("nama_lengkap"),
+        "bio": column("bio"),
+        "lokasi": column("lokasi"),
+        "foto_profil": Field(foto_profil_url, ("foto_profil",)),
+        "karya_seni": Field(detail_karya),
+        "ruang_video": Field(detail_video),
+    },
+)
+
+
 # ✅ Middleware verifikasi token
 def token_required(f):
     @wraps(f)
@@ -43,21 +141,29 @@ def token_required(f):
 
 # ✅ Register user baru
 @users_bp.route("/", methods=["POST"])
+@rate_cost(10, limit=(0.05, 5))
 def register_user():
     data = request.form
+    try:
+        hashed_pw = hash_password(data["password"])
+    except PasswordServiceBusy:
+        return busy_response()
     new_user = User(
         email=data["email"],
         username=data["username"],
-        password=data["password"],
+        password=hashed_pw,
         nama_lengkap=data["nama_lengkap"],
     )
     db.session.add(new_user)
     db.session.commit()
+    invalidate("users")
+    forget_username(new_user.username)
     return jsonify({"message": "User registered successfully!"}), 201
 
 
 # ✅ Update user by ID (hanya jika JWT valid dan ID cocok)
 @users_bp.route("/<int:id>", methods=["PUT"])
+@rate_cost(5)
 @token_required
 def update_user(current_user, id):
     user = User.query.get_or_404(id)
@@ -67,6 +173,7 @@ def update_user(current_user, id):
         return jsonify({"message": "Tidak diizinkan mengedit user lain"}), 403
 
     data = request.form
+    old_username = user.username
     user.nama_lengkap = data.get("nama_lengkap", user.nama_lengkap)
     user.username = data.get("username", user.username)
     user.bio = data.get("bio", user.bio)
@@ -74,69 +181,64 @@ def update_user(current_user, id):
 
     # Upload foto profil
     foto = request.files.get("foto_profil")
-    if foto and allowed_file(foto.filename):
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        filename = secure_filename(foto.filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        foto.save(filepath)
-        user.foto_profil = filepath
+    if data.get("foto_profil_key"):
+        foto_url = claim_upload(data["foto_profil_key"], "profile", current_user.id)
+        if not foto_url:
+            return jsonify({"message": "foto_profil_key tidak valid"}), 400
+        user.foto_profil = foto_url
+    elif foto and allowed_file(foto.filename):
+        user.foto_profil = save_upload(foto, "profile", current_user.id)
 
     user.updated_at = datetime.utcnow()
+    sync_artists(User.id == user.id)
     db.session.commit()
+    # Username/foto juga tampil di listing karya (karya_feed)
+    invalidate("users", "karya", f"user:{id}")
+    if user.username != old_username:
+        forget_username(old_username, user.username)
 
     return jsonify({"message": "Profil berhasil diperbarui"})
 
 
 # ✅ Ambil semua user
 @users_bp.route("/", methods=["GET"])
+@rate_cost(5)
+@cached("users")
 def get_users():
-    users = User.query.filter_by(deleted_at=None).all()
-    result = []
-    for user in users:
-        result.append(
-            {
-                "id": user.id,
-                "email": user.email,
-                "username": user.username,
-                "nama_lengkap": user.nama_lengkap,
-                "bio": user.bio,
-                "lokasi": user.lokasi,
-                "created_at": user.created_at,
-                "foto_profil": (
-                    request.host_url.rstrip("/") + "/" + user.foto_profil
-                    if user.foto_profil
-                    else None
-                ),
-            }
-        )
-    return jsonify(result)
+    keys = USER_FIELDS.requested()
+    users = (
+        User.query.filter_by(deleted_at=None)
+        .options(USER_FIELDS.load_only(keys))
+        .all()
+    )
+    return jsonify(USER_FIELDS.serialize_many(users, keys, {"url_prefix": url_prefix()}))
+
+
+# ✅ Change feed: user yang dibuat/diubah/dihapus sejak watermark
+@users_bp.route("/changes", methods=["GET"])
+def get_user_changes():
+    return change_feed_response(
+        User, USER_FIELDS, {"url_prefix": url_prefix()}
+    )
 
 
 @users_bp.route("/username/<string:username>", methods=["GET"])
+@cached()
 def get_user_by_username(username):
-    #log
-    print("🪪 Diterima username:", repr(username))  # Tambahkan ini
-    user = User.query.filter_by(username=username, deleted_at=None).first()
-    print("📄 Hasil query user:", user)
-    user = User.query.filter_by(username=username, deleted_at=None).first()
+    keys = USER_PROFILE_FIELDS.requested()
+    user_id = resolve_username(username)
+    user = None
+    if user_id is not None:
+        user = (
+            User.query.filter_by(id=user_id, deleted_at=None)
+            .options(USER_PROFILE_FIELDS.load_only(keys))
+            .first()
+        )
     if not user:
         return jsonify({"message": "User tidak ditemukan"}), 404
 
-    return jsonify(
-        {
-            "id": user.id,
-            "email": user.email, 
-            "username": user.username,
-            "nama_lengkap": user.nama_lengkap,
-            "bio": user.bio,
-            "lokasi": user.lokasi,
-            "foto_profil": (
-                request.host_url.rstrip("/") + "/" + user.foto_profil
-                if user.foto_profil
-                else None
-            ),
-        }
-    )
+    cache_tags(f"user:{user.id}", f"user:{user.id}:content")
+    return jsonify(USER_PROFILE_FIELDS.serialize(user, keys, {"url_prefix": url_prefix()}))
 
 
 # # read seniman
@@ -182,78 +284,28 @@ def get_user_by_username(username):
 
 @users_bp.route("/me", methods=["GET"])
 @token_required
+@cached("user:{user_id}", per_user=True)
 def get_current_user(current_user):
-    return jsonify({
-        "id": current_user.id,
-        "email": current_user.email,
-        "username": current_user.username,
-        "nama_lengkap": current_user.nama_lengkap,
-        "bio": current_user.bio,
-        "lokasi": current_user.lokasi,
-        "foto_profil": (
-            request.host_url.rstrip("/") + "/" + current_user.foto_profil
-            if current_user.foto_profil
-            else None
-        ),
-        "created_at": current_user.created_at
-    })
+    return jsonify(
+        USER_FIELDS.serialize(current_user, list(USER_FIELDS.fields), {"url_prefix": url_prefix()})
+    )
 
 
 @users_bp.route("/<int:user_id>/detail", methods=["GET"])
+@cached("user:{user_id}", "user:{user_id}:content")
 def get_user_detail(user_id):
+    keys = USER_DETAIL_FIELDS.requested()
     try:
-        user = User.query.filter_by(id=user_id, deleted_at=None).first()
+        user = (
+            User.query.filter_by(id=user_id, deleted_at=None)
+            .options(USER_DETAIL_FIELDS.load_only(keys))
+            .first()
+        )
         if not user:
             return jsonify({"message": "User tidak ditemukan"}), 404
 
-        karya_list = karya_seni.query.filter_by(user_id=user.id, deleted_at=None).all()
-        video_list = ruang_video.query.filter_by(user_id=user.id, deleted_at=None).all()
-
-        # Debug print
-        print("📌 User:", user.username)
-        print("🎨 Jumlah karya:", len(karya_list))
-        print("📹 Jumlah video:", len(video_list))
-
-        karya_data = [
-            {
-                "id": k.id,
-                "judul_karya": k.judul_karya or "",
-                "deskripsi": k.deskripsi or "",
-                "link_foto": k.link_foto or "",
-                "link_whatsapp": k.link_whatsapp or "",
-                "photo": f"http://127.0.0.1:5000/{k.link_foto}" if k.link_foto else None,
-            }
-            for k in karya_list
-        ]
-
-        video_data = [
-    {
-        "id": v.id,
-        "judul": v.judul or "",
-        "deskripsi": v.deskripsi or "",
-        "link_youtube": v.link_youtube or "",
-        "link_thumbnail": v.link_thumbnail if v.link_thumbnail.startswith("http") else request.host_url.rstrip("/") + "/" + v.link_thumbnail,
-        "title": v.judul or "",
-        "description": v.deskripsi or "",
-        "youtubeLink": v.link_youtube or "",
-        "thumbnail": request.host_url.rstrip("/") + "/" + v.link_thumbnail if v.link_thumbnail else None,
-    }
-    for v in video_list
-]
-
-
-        return jsonify({
-            "id": user.id,
-            "username": user.username,
-            "nama_lengkap": user.nama_lengkap,
-            "bio": user.bio,
-            "lokasi": user.lokasi,
-            "foto_profil": request.host_url.rstrip("/") + "/" + user.foto_profil if user.foto_profil else None,
-            "karya_seni": karya_data,
-            "ruang_video": video_data
-        })
+        return jsonify(USER_DETAIL_FIELDS.serialize(user, keys, {"url_prefix": url_prefix()}))
 
     except Exception as e:
-        print("🔥 ERROR di /<user_id>/detail:", e)
+        current_app.logger.exception("Gagal mengambil detail user %s", user_id)
         return jsonify({"error": str(e)}), 500
-
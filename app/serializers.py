@@ -0,0 +1,35 @@
+"""Helper bersama untuk serialisasi response: waktu WITA dan URL upload.
+
+WITA (Asia/Makassar) tidak punya DST, jadi konversi dari UTC cukup memakai
+offset tetap +8 jam, tanpa lookup zona waktu pytz per baris. Prefix URL
+(``http://host/``) dihitung sekali per request lalu dipakai untuk semua baris.
+"""
+from datetime import timedelta
+
+from flask import g, request
+
+WITA_OFFSET = timedelta(hours=8)
+
+
+def wita(dt_utc):
+    """Datetime UTC (naive) -> ``YYYY-MM-DD HH:MM:SS`` WITA."""
+    if dt_utc is None:
+        return None
+    return (dt_utc + WITA_OFFSET).isoformat(" ", "seconds")
+
+
+def url_prefix():
+    """``request.host_url`` dengan satu ``/`` di akhir, di-cache di ``g``."""
+    prefix = g.get("url_prefix")
+    if prefix is None:
+        prefix = g.url_prefix = request.host_url.rstrip("/") + "/"
+    return prefix
+
+
+def media_url(path, prefix):
+    """URL lengkap untuk nilai kolom upload: path lokal diberi prefix, URL dibiarkan."""
+    if not path:
+        return None
+    if "://" in path:
+        return path
+    return prefix + path
@@ -0,0 +1,171 @@
+"""Log query lambat beserta EXPLAIN-nya.
+
+Event ``before/after_cursor_execute`` mengukur durasi tiap statement. Statement
+yang lebih lama dari ``SLOW_QUERY_MS`` dicatat bersama route asal dan
+durasinya. Parameter bind tidak dicatat (bisa berisi hash password atau
+token); parameter hanya dipakai untuk menjalankan EXPLAIN.
+
+EXPLAIN (``EXPLAIN QUERY PLAN`` di SQLite) untuk SELECT dijalankan di thread
+terpisah lewat koneksi pool sendiri, jadi request yang lambat tidak bertambah
+lambat. Yang dicatat dan di-EXPLAIN adalah teks statement asli
+(``context.statement``), tanpa hint batas waktu dari app/deadlines.py.
+
+Entry ditulis sebagai satu baris JSON ke ``SLOW_QUERY_LOG`` (rotating) dan
+disimpan ``SLOW_QUERY_BUFFER`` entry terakhir di memori untuk endpoint
+``GET /api/internal/slow-queries``.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+from app import db
+
+EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "mysql": "EXPLAIN ", "mariadb": "EXPLAIN "}
+# Hanya query baca yang di-EXPLAIN
+EXPLAINABLE = re.compile(r"\s*(SELECT|WITH)\b", re.IGNORECASE)
+
+
+def origin():
+    if has_request_context():
+        return f"{request.method} {request.path} ({request.endpoint})"
+    return "cli/worker"
+
+
+class SlowQueryRecorder:
+    def __init__(self, engine, threshold_ms, logger, buffer_size, explain=True, explain_ttl=300):
+        self.engine = engine
+        self.threshold = threshold_ms / 1000
+        self.logger = logger
+        self.entries = deque(maxlen=buffer_size)
+        self.explain_enabled = explain
+        self.explain_ttl = explain_ttl
+        # EXPLAIN satu kali per statement per explain_ttl detik
+        self._explained = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slowlog")
+
+    def install(self):
+        event.listen(self.engine, "before_cursor_execute", self.before)
+        event.listen(self.engine, "after_cursor_execute", self.after)
+        event.listen(self.engine, "handle_error", self.on_error)
+
+    def before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slowlog_started", []).append((id(cursor), time.perf_counter()))
+
+    def after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("slowlog_started")
+        if not started:
+            return
+        duration = time.perf_counter() - started.pop()[1]
+        if duration < self.threshold or conn.info.get("slowlog_explaining"):
+            return
+        # Teks sebelum diubah listener lain (hint MAX_EXECUTION_TIME berbeda tiap request)
+        statement = getattr(context, "statement", None) or statement
+        entry = {
+            "time": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+            "duration_ms": round(duration * 1000, 1),
+            "route": origin(),
+            "statement": statement,
+            "executemany": executemany,
+        }
+        explain = (
+            self.explain_enabled
+            and not executemany
+            and EXPLAINABLE.match(statement)
+            and self._should_explain(statement)
+        )
+        if explain:
+            self._executor.submit(self._explain_and_record, entry, statement, parameters)
+        else:
+            self.record(entry)
+
+    def on_error(self, context):
+        # Statement gagal tidak sampai ke after(); buang waktu mulainya
+        conn, execution = context.connection, context.execution_context
+        started = conn.info.get("slowlog_started") if conn is not None else None
+        cursor = getattr(execution, "cursor", None)
+        if started and cursor is not None and started[-1][0] == id(cursor):
+            started.pop()
+
+    def _should_explain(self, statement):
+        now = time.monotonic()
+        with self._lock:
+            last = self._explained.get(statement)
+            if last is not None and now - last < self.explain_ttl:
+                return False
+            self._explained[statement] = now
+            self._explained.move_to_end(statement)
+            while len(self._explained) > 1000:
+                self._explained.popitem(last=False)
+        return True
+
+    def _explain_and_record(self, entry, statement, parameters):
+        prefix = EXPLAIN_PREFIX.get(self.engine.dialect.name, "EXPLAIN ")
+        try:
+            with self.engine.connect() as conn:
+                conn.info["slowlog_explaining"] = True
+                try:
+                    result = conn.exec_driver_sql(prefix + statement, parameters)
+                    entry["explain"] = [dict(row._mapping) for row in result]
+                finally:
+                    conn.info["slowlog_explaining"] = False
+        except Exception as e:
+            entry["explain_error"] = str(e)
+        self.record(entry)
+
+    def record(self, entry):
+        self.entries.append(entry)
+        self.logger.warning(json.dumps(entry, default=str))
+
+    def recent(self, limit):
+        return list(self.entries)[-limit:][::-1]
+
+
+def init_slowlog(app):
+    app.config.setdefault("SLOW_QUERY_MS", 200)
+    app.config.setdefault(
+        "SLOW_QUERY_LOG",
+        os.path.join(os.path.dirname(app.static_folder), "logs", "slow_queries.log"),
+    )
+    app.config.setdefault("SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024)
+    app.config.setdefault("SLOW_QUERY_LOG_BACKUPS", 5)
+    app.config.setdefault("SLOW_QUERY_BUFFER", 200)
+    app.config.setdefault("SLOW_QUERY_EXPLAIN", True)
+
+    if not app.config["SLOW_QUERY_MS"]:
+        return
+
+    logger = logging.getLogger("app.slowlog")
+    logger.propagate = False
+    path = app.config["SLOW_QUERY_LOG"]
+    if path and not any(getattr(h, "baseFilename", None) == os.path.abspath(path) for h in logger.handlers):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=app.config["SLOW_QUERY_LOG_MAX_BYTES"],
+            backupCount=app.config["SLOW_QUERY_LOG_BACKUPS"],
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+
+    with app.app_context():
+        engine = db.engine
+    recorder = SlowQueryRecorder(
+        engine,
+        app.config["SLOW_QUERY_MS"],
+        logger,
+        app.config["SLOW_QUERY_BUFFER"],
+        explain=app.config["SLOW_QUERY_EXPLAIN"],
+    )
+    recorder.install()
+    app.extensions["slowlog"] = recorder
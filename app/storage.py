@@ -0,0 +1,322 @@
+"""Backend penyimpanan file upload.
+
+``STORAGE_BACKEND`` memilih implementasi:
+
+* ``local``  : disk lokal di root project (perilaku lama, default)
+* ``s3``     : object storage S3-compatible (AWS S3, MinIO, R2, ...) via boto3
+* ``memory`` : penyimpanan di memori, untuk test
+
+Klien bisa upload langsung ke storage lewat presigned URL (lihat
+app/routes/storage.py) sehingga app server tidak perlu meneruskan byte gambar.
+Backend ``local`` dan ``memory`` meniru presigned URL dengan token HMAC yang
+diverifikasi endpoint ``PUT /api/storage/local/<key>``.
+"""
+import abc
+import hashlib
+import hmac
+import io
+import os
+import shutil
+import threading
+import time
+from urllib.parse import urlencode
+
+from flask import current_app, url_for
+
+
+class StorageError(Exception):
+    pass
+
+
+class Storage(abc.ABC):
+    # Backend yang mendukung presigned multipart upload
+    supports_multipart = False
+
+    @abc.abstractmethod
+    def save(self, key, fileobj, content_type=None):
+        """Simpan isi ``fileobj`` sebagai ``key``; kembalikan ``url(key)``."""
+
+    @abc.abstractmethod
+    def exists(self, key):
+        pass
+
+    @abc.abstractmethod
+    def open(self, key):
+        """File object (binary, seekable) untuk membaca isi ``key``."""
+
+    @abc.abstractmethod
+    def delete(self, key):
+        pass
+
+    @abc.abstractmethod
+    def url(self, key):
+        """Nilai yang disimpan di database / dikirim ke klien untuk ``key``."""
+
+    @abc.abstractmethod
+    def key_for(self, value):
+        """Kebalikan ``url``: key dari nilai kolom, atau None jika bukan milik backend ini."""
+
+    @abc.abstractmethod
+    def presign_upload(self, key, content_type, expires=900):
+        pass
+
+    def presign_download(self, key, expires=900):
+        return self.url(key)
+
+    def move(self, src, dst):
+        with self.open(src) as f:
+            self.save(dst, f)
+        self.delete(src)
+
+
+class SignedLocalUploads:
+    """Presigned URL tiruan: token HMAC atas (key, expires) dengan SECRET_KEY."""
+
+    @staticmethod
+    def signature(key, expires):
+        secret = current_app.config["SECRET_KEY"].encode()
+        return hmac.new(secret, f"{key}:{expires}".encode(), hashlib.sha256).hexdigest()
+
+    def presign_upload(self, key, content_type, expires=900):
+        expires_at = int(time.time()) + expires
+        query = urlencode({"expires": expires_at, "sig": self.signature(key, expires_at)})
+        return {
+            "method": "PUT",
+            "url": url_for("storage.local_upload", key=key, _external=True) + "?" + query,
+            "headers": {"Content-Type": content_type} if content_type else {},
+        }
+
+    def verify(self, key, expires, sig):
+        try:
+            expires = int(expires)
+        except (TypeError, ValueError):
+            return False
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self.signature(key, expires), sig or "")
+
+
+class LocalStorage(SignedLocalUploads, Storage):
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, key):
+        path = os.path.normpath(os.path.join(self.root, *key.split("/")))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise StorageError("Key storage tidak valid")
+        return path
+
+    def save(self, key, fileobj, content_type=None):
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            shutil.copyfileobj(fileobj, f)
+        return self.url(key)
+
+    def exists(self, key):
+        return os.path.isfile(self.path(key))
+
+    def open(self, key):
+        return open(self.path(key), "rb")
+
+    def delete(self, key):
+        if self.exists(key):
+            os.remove(self.path(key))
+
+    def move(self, src, dst):
+        target = self.path(dst)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(self.path(src), target)
+
+    def url(self, key):
+        # Path relatif seperti sebelumnya; dilayani Flask dari /static
+        return key
+
+    def key_for(self, value):
+        return value if value and "://" not in value else None
+
+
+class MemoryStorage(SignedLocalUploads, Storage):
+    supports_multipart = True
+
+    def __init__(self, public_base="memory://"):
+        self.public_base = public_base
+        self.objects = {}
+        self.multipart = {}
+        self._lock = threading.Lock()
+
+    def save(self, key, fileobj, content_type=None):
+        with self._lock:
+            self.objects[key] = (fileobj.read(), content_type)
+        return self.url(key)
+
+    def exists(self, key):
+        return key in self.objects
+
+    def open(self, key):
+        return io.BytesIO(self.objects[key][0])
+
+    def delete(self, key):
+        with self._lock:
+            self.objects.pop(key, None)
+
+    def move(self, src, dst):
+        with self._lock:
+            self.objects[dst] = self.objects.pop(src)
+
+    def url(self, key):
+        return self.public_base + key
+
+    def key_for(self, value):
+        if value and value.startswith(self.public_base):
+            return value[len(self.public_base):]
+        return None
+
+    def create_multipart(self, key, content_type, parts, expires=900):
+        upload_id = hashlib.sha1(f"{key}:{time.time()}".encode()).hexdigest()
+        with self._lock:
+            self.multipart[upload_id] = (key, content_type, {})
+        return {
+            "upload_id": upload_id,
+            "parts": [
+                {"part_number": n, **self.presign_upload(f"{key}.part{n}", None, expires)}
+                for n in range(1, parts + 1)
+            ],
+        }
+
+    def complete_multipart(self, key, upload_id, parts):
+        with self._lock:
+            stored_key, content_type, _ = self.multipart.pop(upload_id, (None, None, None))
+            if stored_key != key:
+                raise StorageError("Upload multipart tidak ditemukan")
+            numbers = sorted(part["part_number"] for part in parts)
+            chunks = [self.objects.pop(f"{key}.part{n}", (b"", None))[0] for n in numbers]
+        return self.save(key, io.BytesIO(b"".join(chunks)), content_type)
+
+
+class S3Storage(Storage):
+    supports_multipart = True
+
+    def __init__(self, bucket, endpoint_url=None, region=None, public_url=None):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        # upload_fileobj otomatis multipart untuk file di atas 8 MB
+        self.transfer_config = TransferConfig(multipart_threshold=8 * 1024 * 1024)
+        if public_url:
+            self.public_url = public_url.rstrip("/")
+        elif endpoint_url:
+            self.public_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.public_url = f"https://{bucket}.s3.amazonaws.com"
+
+    def save(self, key, fileobj, content_type=None):
+        extra = {"ContentType": content_type} if content_type else None
+        self.client.upload_fileobj(
+            fileobj, self.bucket, key, ExtraArgs=extra, Config=self.transfer_config
+        )
+        return self.url(key)
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError:
+            return False
+        return True
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def open(self, key):
+        body = self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        return io.BytesIO(body.read())
+
+    def move(self, src, dst):
+        self.client.copy_object(
+            Bucket=self.bucket, Key=dst, CopySource={"Bucket": self.bucket, "Key": src}
+        )
+        self.delete(src)
+
+    def url(self, key):
+        return f"{self.public_url}/{key}"
+
+    def key_for(self, value):
+        prefix = self.public_url + "/"
+        if value and value.startswith(prefix):
+            return value[len(prefix):]
+        return None
+
+    def presign_upload(self, key, content_type, expires=900):
+        params = {"Bucket": self.bucket, "Key": key}
+        if content_type:
+            params["ContentType"] = content_type
+        return {
+            "method": "PUT",
+            "url": self.client.generate_presigned_url("put_object", Params=params, ExpiresIn=expires),
+            "headers": {"Content-Type": content_type} if content_type else {},
+        }
+
+    def presign_download(self, key, expires=900):
+        return self.client.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": key}, ExpiresIn=expires
+        )
+
+    def create_multipart(self, key, content_type, parts, expires=900):
+        params = {"Bucket": self.bucket, "Key": key}
+        if content_type:
+            params["ContentType"] = content_type
+        upload_id = self.client.create_multipart_upload(**params)["UploadId"]
+        return {
+            "upload_id": upload_id,
+            "parts": [
+                {
+                    "part_number": n,
+                    "method": "PUT",
+                    "url": self.client.generate_presigned_url(
+                        "upload_part",
+                        Params={"Bucket": self.bucket, "Key": key, "UploadId": upload_id, "PartNumber": n},
+                        ExpiresIn=expires,
+                    ),
+                    "headers": {},
+                }
+                for n in range(1, parts + 1)
+            ],
+        }
+
+    def complete_multipart(self, key, upload_id, parts):
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part["part_number"], "ETag": part["etag"]}
+                    for part in sorted(parts, key=lambda part: part["part_number"])
+                ]
+            },
+        )
+        return self.url(key)
+
+
+def init_storage(app):
+    backend = app.config.get("STORAGE_BACKEND", "local")
+    if backend == "s3":
+        storage = S3Storage(
+            app.config["S3_BUCKET"],
+            endpoint_url=app.config.get("S3_ENDPOINT_URL"),
+            region=app.config.get("S3_REGION"),
+            public_url=app.config.get("S3_PUBLIC_URL"),
+        )
+    elif backend == "memory":
+        storage = MemoryStorage()
+    else:
+        storage = LocalStorage(os.path.dirname(app.static_folder))
+    app.extensions["storage"] = storage
+
+
+def get_storage():
+    return current_app.extensions["storage"]
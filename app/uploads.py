@@ -0,0 +1,181 @@
+"""Penyimpanan file upload dengan layout direktori ter-shard.
+
+File tidak lagi ditumpuk di satu folder datar; tiap file masuk ke dua level
+subfolder dari prefix hash nama filenya, mis.
+``static/uploads/3f/a2/lukisan.jpeg``. Jumlah file per folder tetap kecil
+berapa pun total upload-nya.
+
+Byte file ditulis lewat backend storage aktif (app/storage.py); path shard
+dipakai sebagai key object-nya.
+"""
+import hashlib
+import os
+import posixpath
+import re
+import shutil
+import uuid
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import select
+from werkzeug.utils import secure_filename
+
+from app import db
+from app.feed import sync_artists, sync_karya
+from app.models import User, karya_seni
+from app.storage import get_storage
+
+# Folder (relatif ke root project) per jenis upload
+UPLOAD_DIRS = {
+    "karya": posixpath.join("static", "uploads"),
+    "profile": posixpath.join("static", "uploads", "profile_pictures"),
+}
+
+SHARDED = re.compile(r"/[0-9a-f]{2}/[0-9a-f]{2}/[^/]+$")
+# Nama file key presigned: u<id user>-<uuid>.<ext>
+OWNED_NAME = re.compile(r"u(\d+)-[0-9a-f]{32}(\.[^/]*)?$")
+
+
+def shard_path(filename, kind):
+    """Path publik (posix, relatif ke root project) untuk ``filename``."""
+    digest = hashlib.md5(filename.encode("utf-8")).hexdigest()
+    return posixpath.join(UPLOAD_DIRS[kind], digest[:2], digest[2:4], filename)
+
+
+def is_sharded(path):
+    return bool(path and SHARDED.search(path))
+
+
+def base_dir():
+    return os.path.dirname(current_app.static_folder)
+
+
+def local_path(public_path):
+    return os.path.join(base_dir(), *public_path.split("/"))
+
+
+def new_key(filename, kind, owner_id=None):
+    """Key unik untuk upload baru (dipakai presigned upload dan import).
+
+    ``owner_id`` dicatat di nama file supaya ``claim_upload`` hanya menerima
+    key dari user yang meminta presigned URL-nya.
+    """
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    name = uuid.uuid4().hex if owner_id is None else f"u{owner_id}-{uuid.uuid4().hex}"
+    return shard_path(f"{name}.{ext}" if ext else name, kind)
+
+
+def key_owner(key):
+    """Id user pemilik key presigned, atau None."""
+    match = OWNED_NAME.fullmatch(posixpath.basename(key))
+    return int(match.group(1)) if match else None
+
+
+def key_pattern(kind):
+    return re.compile(re.escape(UPLOAD_DIRS[kind]) + r"/[0-9a-f]{2}/[0-9a-f]{2}/[^/]+$")
+
+
+def save_upload(file_storage, kind, owner_id=None):
+    """Simpan FileStorage ke storage; kembalikan nilai untuk kolom database.
+
+    Key dibuat oleh ``new_key`` seperti presigned upload, jadi dua upload
+    bernama sama (``foto.jpg``) tidak saling menimpa.
+    """
+    key = new_key(secure_filename(file_storage.filename), kind, owner_id)
+    return get_storage().save(key, file_storage.stream, file_storage.mimetype)
+
+
+def claim_upload(key, kind, owner_id):
+    """Nilai kolom untuk file yang sudah diupload klien lewat presigned URL.
+
+    Kembalikan None jika key bukan milik folder ``kind``, bukan hasil presign
+    user ``owner_id``, atau filenya belum ada.
+    """
+    if not key or not key_pattern(kind).fullmatch(key) or key_owner(key) != owner_id:
+        return None
+    storage = get_storage()
+    if not storage.exists(key):
+        return None
+    return storage.url(key)
+
+
+# Kolom yang berisi path upload: (model, kolom, jenis upload)
+PATH_COLUMNS = (
+    (karya_seni, "link_foto", "karya"),
+    (User, "foto_profil", "profile"),
+)
+
+
+def _link_or_copy(src, dst):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.exists(dst):
+        return
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def migrate_batch(model, column_name, kind, after_id, batch_size):
+    """Pindahkan satu batch baris ke layout shard; kembalikan (id terakhir, jumlah)."""
+    column = getattr(model, column_name)
+    rows = db.session.execute(
+        select(model.id, column)
+        .where(model.id > after_id, column.is_not(None))
+        .order_by(model.id)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        return None, 0
+
+    moved = {}
+    for row_id, path in rows:
+        if is_sharded(path) or not path.startswith(UPLOAD_DIRS[kind] + "/"):
+            continue
+        src = local_path(path)
+        if not os.path.isfile(src):
+            continue
+        new_path = shard_path(posixpath.basename(path), kind)
+        # Urutan aman tanpa downtime: file baru dibuat dulu, baris diupdate,
+        # file lama baru dihapus setelah commit.
+        _link_or_copy(src, local_path(new_path))
+        moved[row_id] = (path, new_path)
+
+    for row_id, (_, new_path) in moved.items():
+        db.session.execute(
+            model.__table__.update().where(model.id == row_id).values({column_name: new_path})
+        )
+    if moved:
+        sync = sync_karya if model is karya_seni else sync_artists
+        sync(model.id.in_(list(moved)))
+    db.session.commit()
+
+    for old_path in {old for old, _ in moved.values()}:
+        still_used = any(
+            db.session.execute(
+                select(m.id).where(getattr(m, c) == old_path).limit(1)
+            ).first()
+            for m, c, _ in PATH_COLUMNS
+        )
+        if not still_used and os.path.exists(local_path(old_path)):
+            os.remove(local_path(old_path))
+    return rows[-1][0], len(moved)
+
+
+uploads_cli = AppGroup("uploads", help="Kelola file upload.")
+
+
+@uploads_cli.command("shard")
+@click.option("--batch-size", default=200, show_default=True, type=int)
+def shard_command(batch_size):
+    """Pindahkan upload lama ke layout shard dan update path di database."""
+    if current_app.config.get("STORAGE_BACKEND", "local") != "local":
+        raise click.ClickException("Migrasi shard hanya untuk STORAGE_BACKEND=local")
+    for model, column_name, kind in PATH_COLUMNS:
+        after_id, total = 0, 0
+        while after_id is not None:
+            after_id, moved = migrate_batch(model, column_name, kind, after_id, batch_size)
+            total += moved
+        click.echo(f"{model.__tablename__}.{column_name}: {total} file dipindah")
+    current_app.logger.info("Migrasi shard upload selesai")
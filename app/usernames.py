@@ -0,0 +1,123 @@
+"""Resolver username -> id user dengan cache per proses.
+
+Dipakai route ``/by-user?owner=`` dan ``/username/<username>`` supaya lookup
+username yang sama tidak selalu ke tabel ``users``. Username yang tidak ada
+(salah ketik, user terhapus) juga di-cache, dengan TTL lebih pendek.
+
+Lookup tidak membedakan huruf besar/kecil, jadi key cache memakai username
+huruf kecil: ``Alice`` dan ``alice`` berbagi satu entry (positif maupun
+negatif). Setiap entry mencatat versi tag ``username:<nama>`` di store bersama
+cache response (app/cache.py). ``forget_username`` menaikkan versi itu,
+sehingga rename, registrasi, atau penghapusan user di worker mana pun langsung
+membatalkan entry di semua worker.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from app import db
+from app.models import User
+
+
+def _key(username):
+    return username.lower()
+
+
+def _tag(key):
+    return f"username:{key}"
+
+
+def _matches(username):
+    # Collation *_ci MySQL/MariaDB sudah case-insensitive dan tetap memakai index
+    if db.engine.dialect.name in ("mysql", "mariadb"):
+        return User.username == username
+    return func.lower(User.username) == _key(username)
+
+
+class UsernameResolver:
+    def __init__(self, maxsize, ttl, negative_ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        """(ditemukan, user_id, versi) dari cache lokal."""
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return False, None, None
+            user_id, version, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[username]
+                return False, None, None
+            self._entries.move_to_end(username)
+            return True, user_id, version
+
+    def set(self, username, user_id, version):
+        ttl = self.ttl if user_id is not None else self.negative_ttl
+        with self._lock:
+            self._entries[username] = (user_id, version, time.monotonic() + ttl)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, username):
+        with self._lock:
+            self._entries.pop(username, None)
+
+
+def init_usernames(app):
+    app.config.setdefault("USERNAME_CACHE_SIZE", 10000)
+    app.config.setdefault("USERNAME_CACHE_TTL", 600)
+    app.config.setdefault("USERNAME_NEGATIVE_TTL", 30)
+    app.extensions["usernames"] = UsernameResolver(
+        app.config["USERNAME_CACHE_SIZE"],
+        app.config["USERNAME_CACHE_TTL"],
+        app.config["USERNAME_NEGATIVE_TTL"],
+    )
+
+
+def _version(key):
+    cache = current_app.extensions["cache"]
+    if not cache.shared:
+        # Invalidasi tidak akan sampai ke worker lain
+        return None
+    try:
+        return cache.tag_versions([_tag(key)])[_tag(key)]
+    except Exception:
+        # Store bersama tidak bisa dihubungi: jangan pakai cache
+        return None
+
+
+def resolve_username(username):
+    """Id user hidup dengan ``username``, atau None."""
+    resolver = current_app.extensions["usernames"]
+    key = _key(username)
+    version = _version(key)
+    found, user_id, cached_version = resolver.get(key)
+    if found and version is not None and cached_version == version:
+        return user_id
+
+    user_id = db.session.execute(
+        select(User.id).where(_matches(username), User.deleted_at.is_(None))
+    ).scalar()
+    if version is not None:
+        resolver.set(key, user_id, version)
+    return user_id
+
+
+def forget_username(*usernames):
+    """Batalkan entry untuk username ini di semua worker (panggil setelah commit)."""
+    resolver = current_app.extensions["usernames"]
+    cache = current_app.extensions["cache"]
+    for key in {_key(username) for username in usernames if username}:
+        resolver.discard(key)
+        try:
+            cache.invalidate(_tag(key))
+        except Exception:
+            current_app.logger.exception("Gagal invalidasi username %s", key)
@@ -0,0 +1,11 @@
+# Hook postfork untuk uWSGI (lihat uwsgi.ini); padanan post_fork di gunicorn.conf.py
+from uwsgidecorators import postfork
+
+
+@postfork
+def warm_up_worker():
+    from app.warmup import dispose_engine_after_fork, warm_up
+    from wsgi import app
+
+    dispose_engine_after_fork(app)
+    warm_up(app)
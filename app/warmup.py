@@ -0,0 +1,70 @@
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from app import db
+from app.fieldsets import FIELDSETS
+
+# Fungsi warm-up tambahan (mis. isi cache) didaftarkan lewat register_warmup
+_warmup_hooks = []
+
+
+def register_warmup(fn):
+    """Daftarkan fungsi ``fn(app)`` yang dijalankan saat warm-up."""
+    _warmup_hooks.append(fn)
+    return fn
+
+
+@register_warmup
+def compile_fieldsets(app):
+    # Request pertama tiap endpoint tidak perlu membangun serializer lagi
+    for fieldset in FIELDSETS:
+        fieldset.precompile()
+
+
+def open_pool_connections(count):
+    # Buka beberapa koneksi sekaligus supaya pool sudah terisi sebelum traffic
+    connections = []
+    try:
+        for _ in range(count):
+            conn = db.engine.connect()
+            conn.execute(text("SELECT 1"))
+            connections.append(conn)
+    finally:
+        for conn in connections:
+            conn.close()
+
+
+def warm_up(app):
+    """Siapkan worker sebelum menerima request; kembalikan durasi tiap tahap (ms)."""
+    timings = app.extensions.setdefault("startup_timings", {})
+    with app.app_context():
+        started = time.perf_counter()
+        open_pool_connections(app.config.get("WARMUP_POOL_CONNECTIONS", 2))
+        timings["pool_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        started = time.perf_counter()
+        for hook in _warmup_hooks:
+            hook(app)
+        timings["hooks_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    app.logger.info("Warm-up selesai: %s", timings)
+    return timings
+
+
+def dispose_engine_after_fork(app):
+    # Koneksi hasil warm-up di proses master tidak boleh dipakai bersama worker
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+@click.command("warmup")
+@with_appcontext
+def warmup_command():
+    """Jalankan warm-up dan laporkan waktu startup."""
+    timings = warm_up(current_app._get_current_object())
+    for name, value in timings.items():
+        click.echo(f"{name}: {value} ms")
@@ -0,0 +1,7 @@
+from app import create_app
+from app.asgi import AsyncGateway
+
+# Entry point ASGI opsional: uvicorn asgi:app
+# Dengan --workers N, set juga WORKER_PROCESSES=N (lihat config.py)
+# Route list read-heavy dilayani async, sisanya tetap lewat Flask (WSGI)
+app = AsyncGateway(create_app())
@@ -0,0 +1,116 @@
+"""Bandingkan konkurensi list endpoint: Flask WSGI (thread pool) vs gateway ASGI.
+
+Keduanya dibandingkan pada jumlah request in-flight yang sama
+(``--concurrency``): WSGI memakai thread sebanyak itu, ASGI satu event loop
+dengan request in-flight sebanyak itu. Memori tidak disamakan; puncak alokasi
+(tracemalloc) tiap mode dilaporkan supaya biaya memori per request in-flight
+bisa dibandingkan.
+
+    python benchmarks/bench_asgi.py --rows 2000 --requests 400
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_app(rows):
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["DATABASE_URI"] = "sqlite:///" + db_path
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["RATELIMIT_ENABLED"] = "0"
+
+    from app import create_app, db
+    from app.models import User, karya_seni
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user = User(email="b@b", username="bench", password="x", nama_lengkap="Bench")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all(
+            karya_seni(user_id=user.id, judul_karya=f"karya {i}", deskripsi="lorem " * 40,
+                       link_foto="static/uploads/x.jpeg")
+            for i in range(rows)
+        )
+        db.session.commit()
+    return app
+
+
+def bench_wsgi(app, total, threads):
+    client = app.test_client()
+
+    def one(_):
+        return client.get("/api/karya_seni").status_code
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        codes = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert all(code == 200 for code in codes)
+    return elapsed, peak
+
+
+def bench_asgi(app, total, concurrency):
+    from app.asgi import AsyncGateway
+    from app.async_db import dispose_async_engine
+
+    gateway = AsyncGateway(app)
+
+    async def one(sem):
+        async with sem:
+            sent = []
+
+            async def receive():
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(message):
+                sent.append(message)
+
+            scope = {"type": "http", "method": "GET", "path": "/api/karya_seni",
+                     "headers": [(b"host", b"localhost")], "scheme": "http"}
+            await gateway(scope, receive, send)
+            return sent[0]["status"]
+
+    async def main():
+        sem = asyncio.Semaphore(concurrency)
+        codes = await asyncio.gather(*(one(sem) for _ in range(total)))
+        await dispose_async_engine()
+        return codes
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    codes = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert all(code == 200 for code in codes)
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    app = build_app(args.rows)
+    for name, fn in (("wsgi", bench_wsgi), ("asgi", bench_asgi)):
+        elapsed, peak = fn(app, args.requests, args.concurrency)
+        print(f"{name}: in-flight={args.concurrency:<4} {args.requests / elapsed:8.1f} req/s  "
+              f"peak={peak / 1024 / 1024:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
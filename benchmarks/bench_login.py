@@ -0,0 +1,92 @@
+"""Throughput dan latensi ekor ``POST /api/auth/login`` pada cost hash tertentu.
+
+Login dijalankan dari ``--threads`` thread klien sekaligus (meniru worker
+gthread), sementara ``PASSWORD_HASH_WORKERS`` membatasi hashing yang berjalan
+paralel. Request yang ditolak karena antrean penuh dihitung sebagai 503.
+
+    python benchmarks/bench_login.py --method scrypt:16384:8:1 --requests 200
+    python benchmarks/bench_login.py --method pbkdf2:sha256:600000 --hash-workers 2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_app(users, method, hash_workers, queue):
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["DATABASE_URI"] = "sqlite:///" + db_path
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["RATELIMIT_ENABLED"] = "0"
+    os.environ["PASSWORD_HASH_METHOD"] = method
+    os.environ["PASSWORD_HASH_WORKERS"] = str(hash_workers)
+    os.environ["PASSWORD_HASH_QUEUE"] = str(queue)
+
+    from app import create_app, db
+    from app.models import User
+    from app.passwords import hash_password
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        hashed = hash_password("rahasia")
+        db.session.add_all(
+            User(email=f"u{i}@bench", username=f"u{i}", password=hashed, nama_lengkap="Bench")
+            for i in range(users)
+        )
+        db.session.commit()
+    return app
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def bench(app, total, threads, users):
+    client = app.test_client()
+
+    def one(i):
+        start = time.perf_counter()
+        response = client.post(
+            "/api/auth/login", json={"email": f"u{i % users}@bench", "password": "rahasia"}
+        )
+        return response.status_code, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - start
+
+    codes = [code for code, _ in results]
+    assert all(code in (200, 503) for code in codes), set(codes)
+    latencies = [latency for code, latency in results if code == 200]
+    return elapsed, codes.count(200), codes.count(503), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--method", default="scrypt:32768:8:1")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--hash-workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--queue", type=int, default=64)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+
+    app = build_app(args.users, args.method, args.hash_workers, args.queue)
+    elapsed, ok, busy, latencies = bench(app, args.requests, args.threads, args.users)
+    print(f"{args.method}: hash-workers={args.hash_workers} threads={args.threads}")
+    print(f"  {ok / elapsed:8.1f} login/s  ok={ok} 503={busy}")
+    if latencies:
+        print("  latency ms: " + "  ".join(
+            f"p{pct}={percentile(latencies, pct) * 1000:.1f}" for pct in (50, 95, 99)
+        ))
+
+
+if __name__ == "__main__":
+    main()
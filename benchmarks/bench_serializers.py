@@ -0,0 +1,129 @@
+"""Baris/detik serializer list karya: per-baris (lama) vs ``serialize_many``.
+
+Cara lama: dict comprehension per baris yang memanggil getter tiap field,
+konversi WITA lewat pytz per tanggal, dan prefix URL dihitung ulang per baris.
+Cara baru: plan terkompilasi ``FEED_FIELDS`` untuk satu batch baris.
+
+    python benchmarks/bench_serializers.py --rows 5000 --repeat 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_app(rows):
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["DATABASE_URI"] = "sqlite:///" + db_path
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["RATELIMIT_ENABLED"] = "0"
+
+    from app import create_app, db
+    from app.feed import sync_karya
+    from app.models import User, karya_seni
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user = User(email="b@b", username="bench", password="x", nama_lengkap="Bench",
+                    foto_profil="static/uploads/profil.jpeg")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all(
+            karya_seni(user_id=user.id, judul_karya=f"karya {i}", deskripsi="lorem " * 40,
+                       link_foto="static/uploads/x.jpeg", foto_width=800, foto_height=600)
+            for i in range(rows)
+        )
+        db.session.flush()
+        sync_karya(karya_seni.id > 0)
+        db.session.commit()
+    return app
+
+
+def legacy_serializer(fieldset, keys):
+    """Serializer sebelum plan terkompilasi, dengan helper waktu/URL versi lama."""
+    try:
+        from pytz import timezone, utc
+
+        zone = timezone("Asia/Makassar")
+
+        def to_wita(dt):
+            return utc.localize(dt).astimezone(zone).strftime("%Y-%m-%d %H:%M:%S") if dt else None
+    except ImportError:
+        from datetime import timezone as tz
+        from zoneinfo import ZoneInfo
+
+        zone = ZoneInfo("Asia/Makassar")
+
+        def to_wita(dt):
+            if not dt:
+                return None
+            return dt.replace(tzinfo=tz.utc).astimezone(zone).strftime("%Y-%m-%d %H:%M:%S")
+
+    def public_url(path, base_url):
+        if not path:
+            return None
+        if "://" in path:
+            return path
+        return base_url.rstrip("/") + "/" + path
+
+    getters = {key: fieldset.fields[key].getter for key in keys}
+    for key in ("created_at", "updated_at"):
+        if key in getters:
+            getters[key] = lambda row, ctx, name=key: to_wita(getattr(row, name))
+    if "artist_foto" in getters:
+        getters["artist_foto"] = lambda row, ctx: public_url(row.artist_foto, ctx["base_url"])
+
+    def serialize(rows, host_url):
+        ctx = {"base_url": host_url}
+        return [{key: get(row, ctx) for key, get in getters.items()} for row in rows]
+
+    return serialize
+
+
+def rate(fn, rows, repeat):
+    fn()  # pemanasan (plan di-cache, import pytz)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return rows * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    app = build_app(args.rows)
+
+    from app.models import KaryaFeed
+    from app.routes.karyaseni import FEED_FIELDS
+
+    keys = list(FEED_FIELDS.fields)
+    with app.test_request_context("/api/karya_seni"):
+        from app.serializers import url_prefix
+
+        rows = KaryaFeed.query.options(FEED_FIELDS.load_only(keys)).all()
+        legacy = legacy_serializer(FEED_FIELDS, keys)
+        host_url = "http://localhost/"
+        before = legacy(rows, host_url)
+        after = FEED_FIELDS.serialize_many(rows, keys, {"url_prefix": url_prefix()})
+        assert before == after, "output serializer berbeda"
+
+        old = rate(lambda: legacy(rows, host_url), len(rows), args.repeat)
+        new = rate(
+            lambda: FEED_FIELDS.serialize_many(rows, keys, {"url_prefix": url_prefix()}),
+            len(rows),
+            args.repeat,
+        )
+    print(f"{len(rows)} baris x {args.repeat}, {len(keys)} field")
+    print(f"  per-baris (lama): {old:10.0f} baris/s")
+    print(f"  serialize_many  : {new:10.0f} baris/s  ({new / old:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,101 @@
 import os
 from dotenv import load_dotenv
 
-# Wajib load .env
+# Wajib load .env (cukup sekali, di sini)
 load_dotenv()
 
-print("DATABASE_URI from .env:", os.getenv("DATABASE_URI"))
-
 
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URI")
     SECRET_KEY = os.getenv("SECRET_KEY")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    CORS_ORIGIN = os.getenv("CORS_ORIGIN", "http://localhost:5173")
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_pre_ping": True,
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "280")),
+    }
+
+    # Kompresi response: hanya body >= COMPRESS_MIN_SIZE byte yang dikompres
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+
+    # Change feed menahan baris yang baru berubah selama N detik (lihat app/changefeed.py)
+    CHANGE_FEED_SETTLE_SECONDS = int(os.getenv("CHANGE_FEED_SETTLE_SECONDS", "2"))
+
+    # Broker update like live; kosong = in-process (live mati jika WORKER_PROCESSES > 1)
+    REALTIME_BROKER_URL = os.getenv("REALTIME_BROKER_URL")
+    # Stream SSE per proses; gunicorn.conf.py menambah thread sebanyak ini
+    REALTIME_MAX_STREAMS = int(os.getenv("REALTIME_MAX_STREAMS", "32"))
+
+    # Jumlah proses worker (diisi gunicorn.conf.py / uwsgi.ini)
+    WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", "1"))
+
+    # Jumlah koneksi pool yang dibuka saat warm-up sebelum menerima traffic
+    WARMUP_POOL_CONNECTIONS = int(os.getenv("WARMUP_POOL_CONNECTIONS", "2"))
+
+    # Token untuk /api/export dan /api/internal/*; kosong = endpoint internal mati
+    INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN")
+
+    # Batas body request (413 jika lebih); zip import juga dibatasi isinya
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_MB", "100")) * 1024 * 1024
+    IMPORT_MAX_FILES = int(os.getenv("IMPORT_MAX_FILES", "2000"))
+    IMPORT_MAX_UNCOMPRESSED_MB = int(os.getenv("IMPORT_MAX_UNCOMPRESSED_MB", "1024"))
+
+    # Storage upload: local | s3 | memory (lihat app/storage.py)
+    # Untuk MinIO lokal: STORAGE_BACKEND=s3, S3_ENDPOINT_URL=http://localhost:9000
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+    S3_BUCKET = os.getenv("S3_BUCKET")
+    S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+    S3_REGION = os.getenv("S3_REGION")
+    S3_PUBLIC_URL = os.getenv("S3_PUBLIC_URL")
+    STORAGE_PRESIGN_EXPIRES = int(os.getenv("STORAGE_PRESIGN_EXPIRES", "900"))
+
+    # Counter like ter-shard untuk item ramai (lihat app/counters.py); 0 = mati
+    COUNTER_SHARDS = int(os.getenv("COUNTER_SHARDS", "8"))
+    COUNTER_HOT_WRITES = int(os.getenv("COUNTER_HOT_WRITES", "20"))
+    COUNTER_HOT_WINDOW = int(os.getenv("COUNTER_HOT_WINDOW", "10"))
+
+    # Snapshot id untuk /api/explore dibangun ulang tiap N detik
+    EXPLORE_REFRESH_SECONDS = int(os.getenv("EXPLORE_REFRESH_SECONDS", "300"))
+
+    # Cache response (lihat app/cache.py); tanpa CACHE_REDIS_URL cache hanya
+    # aktif jika WORKER_PROCESSES = 1
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1") == "1"
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+    CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", "60"))
+
+    # Query di atas SLOW_QUERY_MS dicatat + EXPLAIN (lihat app/slowlog.py); 0 = mati
+    SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", "200"))
+    SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "logs", "slow_queries.log"
+    )
+
+    # Profiling on-demand lewat /api/internal (butuh INTERNAL_API_TOKEN)
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+
+    # Cache username -> id user (lihat app/usernames.py)
+    USERNAME_CACHE_TTL = int(os.getenv("USERNAME_CACHE_TTL", "600"))
+    USERNAME_NEGATIVE_TTL = int(os.getenv("USERNAME_NEGATIVE_TTL", "30"))
+
+    # Header Idempotency-Key untuk POST create (lihat app/idempotency.py)
+    IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", str(24 * 3600)))
+    IDEMPOTENCY_WAIT_SECONDS = int(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+
+    # Hash password (lihat app/passwords.py); format metode mengikuti Werkzeug
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "64"))
+
+    # Rate limit & admission control (lihat app/ratelimit.py)
+    RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "1") == "1"
+    RATELIMIT_STORAGE = os.getenv("RATELIMIT_STORAGE", "memory")  # memory | redis
+    RATELIMIT_REDIS_URL = os.getenv("RATELIMIT_REDIS_URL")
+    RATELIMIT_RATE = float(os.getenv("RATELIMIT_RATE", "20"))
+    RATELIMIT_BURST = float(os.getenv("RATELIMIT_BURST", "100"))
+    RATELIMIT_TRUST_PROXY = os.getenv("RATELIMIT_TRUST_PROXY", "0") == "1"
+    ADMISSION_CAPACITY = int(os.getenv("ADMISSION_CAPACITY", "64"))
+    ADMISSION_QUEUE = int(os.getenv("ADMISSION_QUEUE", "32"))
+    ADMISSION_WAIT_SECONDS = float(os.getenv("ADMISSION_WAIT_SECONDS", "2"))
+
+    # Deadline default per request; statement DB ikut dibatasi (lihat app/deadlines.py)
+    REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "10"))
@@ -0,0 +1,46 @@
+"""Konfigurasi gunicorn produksi: ``gunicorn -c gunicorn.conf.py wsgi:app``.
+
+Dengan ``preload_app`` aplikasi (blueprint, model, konfigurasi) diimpor sekali
+di proses master lalu dibagi ke worker lewat fork. Koneksi database tidak boleh
+ikut terbagi, jadi pool di-dispose setelah fork dan tiap worker membuka pool
+sendiri lewat warm-up sebelum menerima traffic.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# Dibaca app (config.WORKER_PROCESSES): state di memori proses tidak dibagi antar worker
+os.environ.setdefault("WORKER_PROCESSES", str(workers))
+# Stream SSE /api/live memakai satu thread selama terbuka: thread untuk stream
+# ditambahkan di atas GUNICORN_THREADS, jadi request biasa tidak ikut tertahan
+live_streams = int(os.getenv("REALTIME_MAX_STREAMS", "32"))
+os.environ.setdefault("REALTIME_MAX_STREAMS", str(live_streams))
+threads = int(os.getenv("GUNICORN_THREADS", "4")) + live_streams
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+accesslog = "-"
+
+
+def _flask_app(server):
+    return server.app.wsgi()
+
+
+def when_ready(server):
+    if preload_app:
+        app = _flask_app(server)
+        server.log.info("App dimuat di master: %s", app.extensions["startup_timings"])
+
+
+def post_fork(server, worker):
+    from app.warmup import dispose_engine_after_fork, warm_up
+
+    app = _flask_app(server)
+    dispose_engine_after_fork(app)
+    timings = warm_up(app)
+    server.log.info("Worker %s siap: %s", worker.pid, timings)
@@ -0,0 +1,76 @@
+"""Fixture bersama: app dengan database SQLite sementara per test."""
+import jwt
+import pytest
+
+from config import Config
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """Override ``Config`` sebelum ``create_app``; test boleh menambah override."""
+    overrides = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "SECRET_KEY": "test-secret-key-yang-cukup-panjang-32b",
+        "RATELIMIT_ENABLED": False,
+        "SLOW_QUERY_MS": 0,
+        "PASSWORD_HASH_METHOD": "pbkdf2:sha256:1000",
+        "CACHE_REDIS_URL": None,
+    }
+
+    def apply(**values):
+        overrides.update(values)
+        for name, value in overrides.items():
+            monkeypatch.setattr(Config, name, value, raising=False)
+
+    apply()
+    return apply
+
+
+@pytest.fixture
+def app(config):
+    from app import create_app, db
+
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    from app import db
+    from app.models import User
+
+    def make(username="ani", **fields):
+        with app.app_context():
+            user = User(
+                email=f"{username}@test",
+                username=username,
+                nama_lengkap=username.title(),
+                **{"password": "x", **fields},
+            )
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+
+    return make
+
+
+@pytest.fixture
+def auth(app):
+    """Header Authorization untuk user ``user_id``."""
+
+    def header(user_id):
+        token = jwt.encode({"user_id": user_id}, app.config["SECRET_KEY"], algorithm="HS256")
+        return {"Authorization": "Bearer " + token}
+
+    return header
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.archival import archive_expired, restore
+from app.jobs import Worker
+from app.models import (
+    KaryaFeed,
+    KaryaSeniArchive,
+    LikeVideo,
+    User,
+    UserArchive,
+    karya_seni,
+    ruang_video,
+)
+from app.storage import get_storage
+
+LONG_AGO = datetime.utcnow() - timedelta(days=200)
+RECENT = datetime.utcnow() - timedelta(days=10)
+
+
+@pytest.fixture
+def app(config):
+    config(STORAGE_BACKEND="memory", CACHE_ENABLED=False)
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def add_karya(app, user_id, deleted_at=None, link_foto="x", count=1):
+    with app.app_context():
+        rows = [
+            karya_seni(user_id=user_id, judul_karya="k", link_foto=link_foto, deleted_at=deleted_at)
+            for _ in range(count)
+        ]
+        db.session.add_all(rows)
+        db.session.commit()
+        return [row.id for row in rows]
+
+
+def test_archive_runs_in_batches_and_keeps_recent_rows(app, make_user):
+    user_id = make_user()
+    old = add_karya(app, user_id, LONG_AGO, count=5)
+    (recent,) = add_karya(app, user_id, RECENT)
+    (live,) = add_karya(app, user_id)
+
+    with app.app_context():
+        assert archive_expired(90, batch_size=2, max_batches=1)["karya"] == 2
+        assert archive_expired(90, batch_size=2)["karya"] == 3
+        assert sorted(row.id for row in KaryaSeniArchive.query) == old
+        assert sorted(row.id for row in karya_seni.query) == [recent, live]
+
+
+def test_user_stays_until_content_is_archived(app, make_user):
+    user_id = make_user(deleted_at=LONG_AGO)
+    (karya_id,) = add_karya(app, user_id)
+
+    with app.app_context():
+        assert archive_expired(90)["user"] == 0
+        assert db.session.get(User, user_id) is not None
+
+        db.session.get(karya_seni, karya_id).deleted_at = LONG_AGO
+        db.session.commit()
+        # Karya diarsip lebih dulu, lalu user-nya di run yang sama
+        assert archive_expired(90) == {"karya": 1, "video": 0, "user": 1}
+        assert db.session.get(UserArchive, user_id) is not None
+
+
+def test_restore_needs_owner_and_brings_back_feed_and_files(app, make_user):
+    with app.app_context():
+        storage = get_storage()
+        storage.objects["static/uploads/profile_pictures/a.png"] = (b"a", "image/png")
+        foto = storage.url("static/uploads/profile_pictures/a.png")
+    user_id = make_user(deleted_at=LONG_AGO, foto_profil=foto)
+    (karya_id,) = add_karya(app, user_id, LONG_AGO)
+
+    with app.app_context():
+        archive_expired(90)
+        assert set(storage.objects) == {"archive/static/uploads/profile_pictures/a.png"}
+
+        with pytest.raises(ValueError):
+            restore("karya", karya_id)
+        restore("user", user_id)
+        restore("karya", karya_id)
+        assert set(storage.objects) == {"static/uploads/profile_pictures/a.png"}
+        assert db.session.get(karya_seni, karya_id).deleted_at is None
+        assert db.session.get(KaryaFeed, karya_id) is not None
+
+
+def test_shared_file_is_not_moved_while_in_use(app, make_user):
+    with app.app_context():
+        storage = get_storage()
+        storage.objects["static/uploads/k.png"] = (b"k", "image/png")
+        path = storage.url("static/uploads/k.png")
+    user_id = make_user()
+    add_karya(app, user_id, LONG_AGO, link_foto=path)
+    add_karya(app, user_id, link_foto=path)
+
+    with app.app_context():
+        assert archive_expired(90)["karya"] == 1
+        assert set(storage.objects) == {"static/uploads/k.png"}
+
+
+def test_archiving_a_user_recounts_their_likes(app, make_user):
+    owner = make_user()
+    fan = make_user("budi", deleted_at=LONG_AGO)
+    with app.app_context():
+        video = ruang_video(
+            user_id=owner, judul="v", link_youtube="y", link_thumbnail="t", dibuat_oleh="ani",
+            like_count=1,
+        )
+        db.session.add(video)
+        db.session.flush()
+        db.session.add(LikeVideo(user_id=fan, video_id=video.id))
+        db.session.commit()
+        video_id = video.id
+
+        assert archive_expired(90)["user"] == 1
+    Worker(app).run_once()
+    with app.app_context():
+        assert db.session.get(ruang_video, video_id).like_count == 0
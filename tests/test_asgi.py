@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import pytest
+
+from app import db
+from app.asgi import AsyncGateway
+from app.async_db import dispose_async_engine
+from app.feed import rebuild
+from app.models import karya_seni, ruang_video
+
+
+@pytest.fixture
+def app(config):
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    yield app
+    asyncio.run(dispose_async_engine())
+
+
+def call(gateway, path):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "GET", "path": path, "query_string": b"", "scheme": "http",
+        "headers": [(b"host", b"localhost")], "client": ("10.0.0.1", 5000),
+    }
+    asyncio.run(gateway(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+@pytest.mark.parametrize("path", ["/api/karya_seni", "/api/ruang_video", "/api/users/"])
+def test_async_routes_match_flask(app, make_user, path):
+    user_id = make_user(foto_profil="profil/a.jpg")
+    with app.app_context():
+        db.session.add(karya_seni(
+            user_id=user_id, judul_karya="Senja", link_foto="karya/a.jpg", link_whatsapp="0812",
+        ))
+        db.session.add(ruang_video(
+            user_id=user_id, judul="Tari", link_youtube="https://youtu.be/x", link_thumbnail="t.jpg",
+            dibuat_oleh="Ani",
+        ))
+        db.session.commit()
+        rebuild()
+
+    expected = app.test_client().get(path, base_url="http://localhost")
+    status, body = call(AsyncGateway(app), path)
+    assert status == expected.status_code == 200
+    assert body == expected.get_json()
+    assert body
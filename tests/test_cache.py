@@ -0,0 +1,58 @@
+def test_cached_view_with_user_id_kwarg(app, client, make_user, auth):
+    user_id = make_user(bio="lama")
+
+    first = client.get(f"/api/users/{user_id}/detail")
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    second = client.get(f"/api/users/{user_id}/detail")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
+
+    # Update user menaikkan versi tag user:{id}
+    response = client.put(f"/api/users/{user_id}", headers=auth(user_id), data={"bio": "baru"})
+    assert response.status_code == 200
+    third = client.get(f"/api/users/{user_id}/detail")
+    assert third.headers["X-Cache"] == "MISS"
+    assert third.get_json()["bio"] == "baru"
+
+
+def test_cache_key_includes_host(app, client, make_user):
+    user_id = make_user(foto_profil="static/uploads/profile_pictures/a.png")
+
+    a = client.get(f"/api/users/{user_id}/detail", base_url="http://a.example")
+    b = client.get(f"/api/users/{user_id}/detail", base_url="http://b.example")
+    assert b.headers["X-Cache"] == "MISS"
+    assert a.get_json()["foto_profil"].startswith("http://a.example/")
+    assert b.get_json()["foto_profil"].startswith("http://b.example/")
+
+
+def test_per_user_cache_is_not_shared(app, client, make_user, auth):
+    ani, budi = make_user(), make_user("budi")
+    assert client.get("/api/users/me", headers=auth(ani)).get_json()["username"] == "ani"
+    assert client.get("/api/users/me", headers=auth(budi)).get_json()["username"] == "budi"
+
+
+
+def test_local_store_is_not_used_with_several_workers(config, make_user):
+    # make_user memakai app default; database-nya sama
+    user_id = make_user()
+    config(WORKER_PROCESSES=3, CACHE_REDIS_URL=None)
+    from app import create_app
+
+    app = create_app()
+    assert app.extensions["cache"].shared is False
+
+    client = app.test_client()
+    for _ in range(2):
+        response = client.get(f"/api/users/{user_id}/detail")
+        assert response.status_code == 200
+        assert "X-Cache" not in response.headers
+
+
+def test_liked_videos_cache_logs_instead_of_printing(app, client, make_user, auth, capsys):
+    user_id = make_user()
+    first = client.get("/api/ruang_video/liked", headers=auth(user_id))
+    second = client.get("/api/ruang_video/liked", headers=auth(user_id))
+    assert first.get_json() == {"liked_video_ids": []}
+    assert second.headers["X-Cache"] == "HIT"
+    assert capsys.readouterr().out == ""
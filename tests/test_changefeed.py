@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app import db
+from app.models import ruang_video
+
+CHANGES = "/api/ruang_video/changes"
+
+
+@pytest.fixture
+def app(config):
+    config(CHANGE_FEED_SETTLE_SECONDS=2, CACHE_ENABLED=False)
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def add_videos(app, user_id, *times):
+    """Satu video per ``(created_at, updated_at)``; kembalikan id-nya."""
+    with app.app_context():
+        videos = [
+            ruang_video(
+                user_id=user_id, judul=f"v{i}", link_youtube="y", link_thumbnail="t",
+                dibuat_oleh="ani", created_at=created, updated_at=updated,
+            )
+            for i, (created, updated) in enumerate(times)
+        ]
+        db.session.add_all(videos)
+        db.session.commit()
+        return [video.id for video in videos]
+
+
+def set_columns(app, video_id, **values):
+    # Core update dengan nilai eksplisit: onupdate tidak menimpa updated_at
+    with app.app_context():
+        db.session.execute(update(ruang_video).where(ruang_video.id == video_id).values(**values))
+        db.session.commit()
+
+
+def page(client, since=None, limit=2):
+    query = f"?limit={limit}" + (f"&since={since}" if since else "")
+    response = client.get(CHANGES + query)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def walk(client, since=None, limit=2):
+    seen = []
+    while True:
+        body = page(client, since, limit)
+        seen.extend(body["items"])
+        since = body["watermark"]
+        if not body["has_more"]:
+            return seen, since
+
+
+def test_ties_across_page_boundary_are_sent_once(app, client, make_user):
+    t = datetime.utcnow() - timedelta(minutes=10)
+    # Lima baris dengan waktu sama, dua di antaranya lewat cabang updated_at
+    ids = add_videos(
+        app, make_user(), (t, None), (t, None), (t - timedelta(minutes=1), t), (t, None),
+        (t - timedelta(minutes=2), t),
+    )
+    items, _ = walk(client, limit=2)
+    assert sorted(item["id"] for item in items) == sorted(ids)
+    assert len(items) == len(ids)
+
+
+def test_row_updated_between_pages_is_sent_again(app, client, make_user):
+    t = datetime.utcnow() - timedelta(minutes=10)
+    first, second, third = add_videos(app, make_user(), (t, None), (t + timedelta(seconds=1), None),
+                                      (t + timedelta(seconds=2), None))
+    body = page(client, limit=2)
+    assert [item["id"] for item in body["items"]] == [first, second]
+
+    set_columns(app, first, judul="baru", updated_at=t + timedelta(minutes=5))
+    items, _ = walk(client, since=body["watermark"], limit=2)
+    assert [(item["id"], item["judul"]) for item in items] == [(third, "v2"), (first, "baru")]
+
+
+def test_soft_deleted_row_is_a_tombstone(app, client, make_user):
+    t = datetime.utcnow() - timedelta(minutes=10)
+    kept, removed = add_videos(app, make_user(), (t, None), (t, None))
+    watermark = page(client, limit=10)["watermark"]
+
+    set_columns(app, removed, deleted_at=t + timedelta(minutes=1), updated_at=t + timedelta(minutes=1))
+    items = page(client, since=watermark, limit=10)["items"]
+    assert items == [{"id": removed, "deleted": True, "deleted_at": (t + timedelta(minutes=1)).isoformat()}]
+    # Sinkron awal tidak menerima tombstone
+    assert [item["id"] for item in page(client, limit=10)["items"]] == [kept]
+
+
+def test_rows_inside_settle_window_are_held_back(app, client, make_user):
+    t = datetime.utcnow() - timedelta(minutes=10)
+    user_id = make_user()
+    (old,) = add_videos(app, user_id, (t, None))
+    (fresh,) = add_videos(app, user_id, (datetime.utcnow(), None))
+
+    body = page(client, limit=10)
+    assert [item["id"] for item in body["items"]] == [old]
+
+    # Setelah jendela settle lewat, baris itu terkirim dari watermark yang sama
+    app.config["CHANGE_FEED_SETTLE_SECONDS"] = 0
+    items = page(client, since=body["watermark"], limit=10)["items"]
+    assert [item["id"] for item in items] == [fresh]
@@ -0,0 +1,78 @@
+import gzip
+
+import brotli
+import pytest
+from flask import Response
+
+from app import compression
+
+
+@pytest.fixture
+def app(config):
+    config(COMPRESS_MIN_SIZE=200)
+    from app import create_app, db
+
+    app = create_app()
+
+    @app.route("/api/_stream")
+    def stream():
+        return Response(("x" * 100 for _ in range(10)), mimetype="text/plain")
+
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def users(make_user):
+    for name in ("ani", "budi", "citra", "dewi"):
+        make_user(name, bio="seniman " * 10)
+
+
+def test_gzip_and_brotli_negotiation(client, users):
+    plain = client.get("/api/users/")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    gz = client.get("/api/users/", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(gz.data) == plain.data
+
+    br = client.get("/api/users/", headers={"Accept-Encoding": "gzip, br"})
+    assert br.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(br.data) == plain.data
+
+    identity = client.get("/api/users/", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in identity.headers
+
+
+def test_small_bodies_are_not_compressed(app, client, users):
+    app.config["COMPRESS_MIN_SIZE"] = 1024 * 1024
+    response = client.get("/api/users/", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+def test_streamed_responses_are_not_compressed(client):
+    response = client.get("/api/_stream", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert "Content-Encoding" not in response.headers
+
+
+def test_cache_hit_reuses_compressed_body(client, users, monkeypatch):
+    calls = []
+    original = compression.compress
+
+    def counting(data, encoding, config):
+        calls.append(encoding)
+        return original(data, encoding, config)
+
+    monkeypatch.setattr(compression, "compress", counting)
+    headers = {"Accept-Encoding": "gzip"}
+    responses = [client.get("/api/users/", headers=headers) for _ in range(3)]
+    assert [r.headers["X-Cache"] for r in responses] == ["MISS", "HIT", "HIT"]
+    # Hit pertama mengisi simpanan entry cache; hit berikutnya tidak kompres lagi
+    assert len(calls) == 2
+    assert responses[2].data == responses[1].data
+    assert gzip.decompress(responses[2].data) == gzip.decompress(responses[0].data)
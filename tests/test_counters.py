@@ -0,0 +1,50 @@
+import pytest
+
+from app import db
+from app.jobs import Worker
+from app.models import Job, LikeCounterShard, karya_seni, ruang_video
+
+
+@pytest.fixture
+def app(config):
+    # Setiap like langsung dianggap "ramai" dan masuk ke counter ter-shard
+    config(COUNTER_HOT_WRITES=1, COUNTER_FOLD_DELAY=0)
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def add_items(app, user_id):
+    with app.app_context():
+        karya = karya_seni(user_id=user_id, judul_karya="k", link_foto="static/uploads/k.png")
+        video = ruang_video(
+            user_id=user_id, judul="v", link_youtube="y", link_thumbnail="t", dibuat_oleh="ani"
+        )
+        db.session.add_all([karya, video])
+        db.session.commit()
+        return karya.id, video.id
+
+
+@pytest.mark.parametrize("kind", ["karya", "video"])
+def test_hot_likes_are_folded_by_a_job(app, client, make_user, auth, kind):
+    user_id = make_user()
+    karya_id, video_id = add_items(app, user_id)
+    item_id, model = (karya_id, karya_seni) if kind == "karya" else (video_id, ruang_video)
+    path = f"/api/karya_seni/{karya_id}/like" if kind == "karya" else f"/api/ruang_video/{video_id}/like"
+
+    response = client.post(path, headers=auth(user_id))
+    assert response.get_json()["like_count"] == 1
+    with app.app_context():
+        assert Job.query.filter_by(dedup_key=f"like-fold:{kind}:{item_id}").count() == 1
+
+    Worker(app).run_once()
+    with app.app_context():
+        item = db.session.get(model, item_id)
+        assert item.like_count == 1
+        # Fold tidak dianggap edit konten
+        assert item.updated_at is None
+        pending = db.session.query(db.func.sum(LikeCounterShard.delta)).scalar()
+        assert not pending
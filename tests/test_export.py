@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+INTERNAL = {"X-Internal-Token": "rahasia-internal"}
+
+
+@pytest.fixture
+def app(config):
+    config(INTERNAL_API_TOKEN="rahasia-internal")
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def test_export_rejects_user_token(client, make_user, auth):
+    user_id = make_user()
+    assert client.get("/api/export/users", headers=auth(user_id)).status_code == 403
+
+
+def test_export_users_only_whitelisted_columns(client, make_user):
+    make_user()
+    response = client.get("/api/export/users?include_deleted=1", headers=INTERNAL)
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert rows[0]["username"] == "ani"
+    assert "email" not in rows[0]
+    assert "password" not in rows[0]
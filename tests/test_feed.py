@@ -0,0 +1,107 @@
+import io
+
+import pytest
+from PIL import Image
+from sqlalchemy import select
+
+from app import db
+from app.feed import rebuild
+from app.models import KaryaFeed, User, karya_seni
+
+
+@pytest.fixture
+def app(config):
+    config(STORAGE_BACKEND="memory", CACHE_ENABLED=False)
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 3), "red").save(buffer, "PNG")
+    buffer.seek(0)
+    return buffer
+
+
+def create_karya(client, headers, judul):
+    response = client.post(
+        "/api/karya_seni",
+        headers=headers,
+        data={"judul_karya": judul, "link_foto": (png(), "a.png")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 201
+    return response.get_json()["data"]["id"]
+
+
+def feed_rows():
+    return db.session.execute(
+        select(KaryaFeed.id, KaryaFeed.judul_karya, KaryaFeed.artist_username).order_by(KaryaFeed.id)
+    ).all()
+
+
+def source_rows():
+    return db.session.execute(
+        select(karya_seni.id, karya_seni.judul_karya, User.username)
+        .join(User, User.id == karya_seni.user_id)
+        .where(karya_seni.deleted_at.is_(None))
+        .order_by(karya_seni.id)
+    ).all()
+
+
+def assert_in_sync(app):
+    with app.app_context():
+        assert feed_rows() == source_rows()
+
+
+def test_write_paths_keep_feed_in_sync(app, client, make_user, auth):
+    user_id = make_user()
+    headers = auth(user_id)
+    first = create_karya(client, headers, "Senja")
+    second = create_karya(client, headers, "Fajar")
+    assert_in_sync(app)
+
+    client.put(f"/api/karya_seni/{first}", headers=headers, data={"judul_karya": "Senja Merah"})
+    assert_in_sync(app)
+
+    client.delete(f"/api/karya_seni/{second}", headers=headers)
+    assert_in_sync(app)
+
+    client.put(f"/api/users/{user_id}", headers=headers, data={"username": "ani_baru"})
+    assert_in_sync(app)
+    with app.app_context():
+        assert feed_rows() == [(first, "Senja Merah", "ani_baru")]
+
+
+def test_rebuild_repairs_feed_without_emptying_it(app, make_user, monkeypatch):
+    user_id = make_user()
+    with app.app_context():
+        db.session.add_all(
+            karya_seni(user_id=user_id, judul_karya=f"k{i}", link_foto="x") for i in range(5)
+        )
+        db.session.flush()
+        # Feed basi: satu baris hilang, satu judul lama, satu baris yatim
+        db.session.add_all(
+            KaryaFeed(id=karya.id, user_id=user_id, judul_karya="lama", link_foto="x")
+            for karya in karya_seni.query.order_by(karya_seni.id).limit(4)
+        )
+        db.session.add(KaryaFeed(id=999, user_id=user_id, judul_karya="yatim", link_foto="x"))
+        db.session.commit()
+
+        seen = []
+        commit = db.session.commit
+
+        def observe_commit():
+            commit()
+            seen.append(db.session.query(KaryaFeed).count())
+
+        monkeypatch.setattr(db.session, "commit", observe_commit)
+        assert rebuild(batch_size=2) == 5
+        monkeypatch.undo()
+        # Tabel tidak pernah kosong di antara batch
+        assert min(seen) >= 5
+        assert feed_rows() == source_rows()
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import ruang_video
+
+
+@pytest.fixture
+def app(config):
+    config(CACHE_ENABLED=False)
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def video_id(app, make_user):
+    user_id = make_user()
+    with app.app_context():
+        video = ruang_video(
+            user_id=user_id, judul="Tari", link_youtube="https://youtu.be/x", link_thumbnail="t.jpg",
+            deskripsi="panjang " * 100, dibuat_oleh="Ani",
+        )
+        db.session.add(video)
+        db.session.commit()
+        return video.id
+
+
+@pytest.fixture
+def statements(app):
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("path", ["/api/ruang_video", "/api/ruang_video/{id}"])
+def test_fields_limit_keys_and_columns(client, video_id, statements, path):
+    response = client.get(path.format(id=video_id) + "?fields=id,judul")
+    assert response.status_code == 200
+    body = response.get_json()
+    item = body[0] if isinstance(body, list) else body
+    assert item == {"id": video_id, "judul": "Tari"}
+
+    selects = [s for s in statements if "FROM ruang_video" in s]
+    assert selects and not any("deskripsi" in s for s in selects)
+
+
+def test_without_fields_returns_everything(client, video_id):
+    item = client.get("/api/ruang_video").get_json()[0]
+    assert item["deskripsi"].startswith("panjang")
+    assert {"id", "judul", "link_youtube", "created_at"} <= set(item)
+
+
+@pytest.mark.parametrize("path", ["/api/ruang_video", "/api/karya_seni", "/api/users/"])
+def test_unknown_field_is_rejected(client, path):
+    response = client.get(path + "?fields=id,password")
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["message"] == "Field tidak dikenal: password"
+    assert "password" not in body["allowed_fields"]
+    assert "id" in body["allowed_fields"]
+
+
+def test_user_list_fields(client, make_user):
+    make_user()
+    assert client.get("/api/users/?fields=username").get_json() == [{"username": "ani"}]
@@ -0,0 +1,81 @@
+import io
+
+import pytest
+
+from app import db
+from app.models import karya_seni
+
+
+@pytest.fixture
+def app(config):
+    config(STORAGE_BACKEND="memory")
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def create(client, headers, key, judul="Senja", filename="senja.png"):
+    data = {"judul_karya": judul}
+    if filename:
+        data["link_foto"] = (io.BytesIO(b"gambar"), filename)
+    return client.post(
+        "/api/karya_seni",
+        headers={**headers, "Idempotency-Key": key},
+        data=data,
+        content_type="multipart/form-data",
+    )
+
+
+def karya_count(app):
+    with app.app_context():
+        return karya_seni.query.count()
+
+
+def test_retry_with_same_key_is_replayed(app, client, make_user, auth):
+    headers = auth(make_user())
+    first = create(client, headers, "k1")
+    second = create(client, headers, "k1")
+    assert first.status_code == second.status_code == 201
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.get_json() == first.get_json()
+    assert karya_count(app) == 1
+
+
+def test_same_key_different_payload_is_rejected(app, client, make_user, auth):
+    headers = auth(make_user())
+    assert create(client, headers, "k1").status_code == 201
+    assert create(client, headers, "k1", judul="Fajar").status_code == 422
+    assert karya_count(app) == 1
+
+
+def test_key_is_per_user(app, client, make_user, auth):
+    assert create(client, auth(make_user()), "k1").status_code == 201
+    response = create(client, auth(make_user("budi")), "k1")
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+    assert karya_count(app) == 2
+
+
+def test_error_response_is_not_stored(app, client, make_user, auth):
+    headers = auth(make_user())
+    assert create(client, headers, "k1", filename="senja.exe").status_code == 400
+    response = create(client, headers, "k1")
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+
+
+def test_header_ignored_without_shared_store(config, make_user, auth):
+    user_id = make_user()
+    config(STORAGE_BACKEND="memory", WORKER_PROCESSES=3, CACHE_REDIS_URL=None)
+    from app import create_app
+
+    app = create_app()
+    client = app.test_client()
+    assert create(client, auth(user_id), "k1").status_code == 201
+    response = create(client, auth(user_id), "k1")
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+    assert karya_count(app) == 2
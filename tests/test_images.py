@@ -0,0 +1,55 @@
+import io
+import warnings
+
+import pytest
+from PIL import Image
+
+from app import images
+from app.images import blurhash, image_metadata
+
+
+def encoded(image, format, **params):
+    buffer = io.BytesIO()
+    image.save(buffer, format, **params)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [
+        # 1x1: semua basis bernilai 1, AC merah = 2 -> kuantisasi maksimum "~", tiap AC "|c"
+        ((1, 1), "L~TI:j" + "|c" * 11),
+        # 8x6 rata: AC terbesar (0, 1) = 2/48 * 8 = 1/3 -> kuantisasi 54 "s"
+        ((8, 6), "LsTI:j]9fQ]9|csUfQsUfQfQfQfQ"),
+    ],
+)
+def test_blurhash_known_vectors(size, expected):
+    # "L" = komponen 4x3, "TI:j" = DC #ff0000
+    assert blurhash(Image.new("RGB", size, (255, 0, 0))) == expected
+
+
+def test_exif_rotated_jpeg_swaps_dimensions():
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    photo = encoded(Image.new("RGB", (40, 20), "blue"), "JPEG", exif=exif)
+    photo.read(3)
+
+    metadata = image_metadata(photo)
+    assert (metadata["foto_width"], metadata["foto_height"]) == (20, 40)
+    assert metadata["foto_color"].startswith("#")
+    # Posisi file dikembalikan
+    assert photo.tell() == 3
+
+
+def test_huge_png_is_not_decoded(monkeypatch):
+    monkeypatch.setattr(images, "MAX_DECODE_PIXELS", 100)
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 150)
+    png = encoded(Image.new("RGB", (20, 10), "green"), "PNG")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert image_metadata(png) == {"foto_width": 20, "foto_height": 10}
+
+
+def test_unreadable_file_gives_no_metadata():
+    assert image_metadata(io.BytesIO(b"bukan gambar")) == {}
@@ -0,0 +1,112 @@
+import io
+import zipfile
+
+import pytest
+from sqlalchemy.sql.dml import Insert
+
+from app import db
+from app.importer import import_karya
+from app.models import karya_seni
+from app.routes.karyaseni import ALLOWED_EXTENSIONS
+from app.storage import get_storage
+
+
+@pytest.fixture
+def app(config):
+    config(STORAGE_BACKEND="memory")
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def post_zip(client, headers, files):
+    return client.post(
+        "/api/karya_seni/bulk",
+        headers=headers,
+        data={"archive": (make_zip(files), "karya.zip")},
+        content_type="multipart/form-data",
+    )
+
+
+@pytest.mark.parametrize(
+    "files, message",
+    [
+        ({"manifest.json": "{bukan json"}, "bukan JSON"),
+        ({"manifest.json": '{"data": []}'}, "items"),
+        ({"manifest.json": '"teks"'}, "list"),
+        ({"manifest.csv": b"\xff\xfe\x00judul"}, "UTF-8"),
+        ({"a.png": b"x"}, "manifest"),
+    ],
+)
+def test_bulk_import_rejects_malformed_manifest(client, make_user, auth, files, message):
+    response = post_zip(client, auth(make_user()), files)
+    assert response.status_code == 400
+    assert message in response.get_json()["error"]
+
+
+def test_bulk_import_rejects_non_zip(client, make_user, auth):
+    response = client.post(
+        "/api/karya_seni/bulk",
+        headers=auth(make_user()),
+        data={"archive": (io.BytesIO(b"bukan zip"), "karya.zip")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 400
+
+
+def test_failed_chunk_deletes_its_files(app, make_user, monkeypatch):
+    user_id = make_user()
+    manifest = '[{"judul_karya": "a", "foto": "a.png"}, {"judul_karya": "b", "foto": "b.png"}]'
+    archive = make_zip({"manifest.json": manifest, "a.png": b"a", "b.png": b"b"})
+
+    with app.app_context():
+        execute = db.session.execute
+        inserts = []
+
+        def failing_second_insert(statement, *args, **kwargs):
+            if isinstance(statement, Insert) and statement.table.name == "karya_seni":
+                inserts.append(statement)
+                if len(inserts) == 2:
+                    raise RuntimeError("disk penuh")
+            return execute(statement, *args, **kwargs)
+
+        monkeypatch.setattr(db.session, "execute", failing_second_insert)
+        summary = import_karya(archive, user_id, ALLOWED_EXTENSIONS, chunk_size=1, workers=1)
+        monkeypatch.undo()
+
+        assert [row["status"] for row in summary["results"]] == ["created", "error"]
+        saved = karya_seni.query.one()
+        storage = get_storage()
+        assert list(storage.objects) == [saved.link_foto.removeprefix(storage.public_base)]
+
+
+@pytest.mark.parametrize(
+    "settings, files, message",
+    [
+        ({"IMPORT_MAX_FILES": 2}, {"manifest.json": "[]", "a.png": b"a", "b.png": b"b"}, "lebih dari 2 file"),
+        ({"IMPORT_MAX_UNCOMPRESSED_MB": 1}, {"manifest.json": "[]", "a.png": b"0" * (2 * 1024 * 1024)}, "1 MB"),
+    ],
+)
+def test_bulk_import_rejects_oversized_archives(app, client, make_user, auth, settings, files, message):
+    app.config.update(settings)
+    response = post_zip(client, auth(make_user()), files)
+    assert response.status_code == 400
+    assert message in response.get_json()["error"]
+
+
+def test_request_body_is_limited(app, client, make_user, auth):
+    app.config["MAX_CONTENT_LENGTH"] = 1024
+    response = post_zip(client, auth(make_user()), {"manifest.json": "[]", "a.png": bytes(range(256)) * 64})
+    assert response.status_code == 413
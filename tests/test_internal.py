@@ -0,0 +1,44 @@
+import tracemalloc
+
+import pytest
+
+from app.profiling import verify_token
+
+INTERNAL = {"X-Internal-Token": "rahasia-internal"}
+
+
+@pytest.fixture
+def app(config):
+    config(INTERNAL_API_TOKEN="rahasia-internal", PROFILING_ENABLED=True, SLOW_QUERY_MS=200)
+    from app import create_app
+
+    app = create_app()
+    yield app
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize(
+    "method, path",
+    [
+        ("post", "/api/internal/profile-token?ttl=abc"),
+        ("post", "/api/internal/memory/start?frames=abc"),
+        ("get", "/api/internal/slow-queries?limit=abc"),
+    ],
+)
+def test_non_numeric_params_are_rejected(client, method, path):
+    response = getattr(client, method)(path, headers=INTERNAL)
+    assert response.status_code == 400
+
+
+def test_negative_ttl_still_mints_a_valid_token(client):
+    response = client.post("/api/internal/profile-token?ttl=-60", headers=INTERNAL)
+    assert response.status_code == 200
+    assert verify_token("rahasia-internal", response.get_json()["value"])
+
+
+def test_memory_params_are_clamped(client):
+    response = client.post("/api/internal/memory/start?frames=0", headers=INTERNAL)
+    assert response.get_json()["frames"] == 1
+    assert client.post("/api/internal/memory/snapshot?limit=abc", headers=INTERNAL).status_code == 400
+    assert client.post("/api/internal/memory/snapshot?limit=-1", headers=INTERNAL).status_code == 200
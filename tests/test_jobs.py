@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from app import db
+from app.jobs import JOB_HANDLERS, Worker, enqueue
+from app.models import Job, LikeVideo, ruang_video
+
+
+def make_video(app, user_id):
+    with app.app_context():
+        video = ruang_video(
+            user_id=user_id, judul="v", link_youtube="y", link_thumbnail="t", dibuat_oleh="ani"
+        )
+        db.session.add(video)
+        db.session.commit()
+        return video.id
+
+
+def test_enqueue_dedups_queued_job(app, make_user):
+    video_id = make_video(app, make_user())
+    with app.app_context():
+        first = enqueue("recount_video_likes", {"video_id": video_id}, dedup_key="k")
+        db.session.commit()
+        second = enqueue("recount_video_likes", {"video_id": video_id}, dedup_key="k")
+        db.session.commit()
+        assert second.id == first.id
+        assert Job.query.count() == 1
+
+
+def test_like_during_running_recount_gets_new_job(app, client, make_user, auth):
+    user_id = make_user()
+    other_id = make_user("budi")
+    video_id = make_video(app, user_id)
+    assert client.post(f"/api/ruang_video/{video_id}/like", headers=auth(user_id)).status_code == 200
+
+    worker = Worker(app)
+    with app.app_context():
+        running = worker.claim()
+        assert running.name == "recount_video_likes"
+        assert running.dedup_key is None
+
+    # Like kedua masuk saat recount pertama sedang berjalan
+    assert client.post(f"/api/ruang_video/{video_id}/like", headers=auth(other_id)).status_code == 200
+    with app.app_context():
+        queued = Job.query.filter_by(status="queued").all()
+        assert [job.dedup_key for job in queued] == [f"video-likes:{video_id}"]
+
+        # Recount pertama selesai dengan hitungan lama, job berikutnya memperbaikinya
+        ruang_video.query.filter_by(id=video_id).update({"like_count": 1})
+        db.session.commit()
+        worker.execute(running)
+    worker.run_once()
+    with app.app_context():
+        assert LikeVideo.query.filter_by(video_id=video_id).count() == 2
+        assert db.session.get(ruang_video, video_id).like_count == 2
+
+
+def running_job(app, worker, name, **fields):
+    with app.app_context():
+        enqueue(name, {"video_id": 0}, **fields)
+        db.session.commit()
+        return worker.claim().id
+
+
+def test_heartbeat_keeps_slow_job_from_being_requeued(app, monkeypatch):
+    started = threading.Event()
+
+    def slow(video_id):
+        started.set()
+        time.sleep(0.6)
+
+    monkeypatch.setitem(JOB_HANDLERS, "slow_test", slow)
+    worker = Worker(app, stale_after=0.3)
+    job_id = running_job(app, worker, "slow_test")
+
+    def run():
+        with app.app_context():
+            worker.execute(db.session.get(Job, job_id))
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    started.wait()
+    time.sleep(0.45)
+    with app.app_context():
+        worker.requeue_stale()
+        assert db.session.get(Job, job_id).status == "running"
+    thread.join()
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        assert (job.status, job.attempts) == ("done", 1)
+
+
+@pytest.mark.parametrize("max_attempts, status", [(2, "queued"), (1, "failed")])
+def test_stale_job_uses_an_attempt(app, max_attempts, status):
+    worker = Worker(app, stale_after=0)
+    job_id = running_job(app, worker, "recount_video_likes", max_attempts=max_attempts)
+    # Worker yang mengklaim mati tanpa heartbeat
+    with app.app_context():
+        worker.requeue_stale()
+        job = db.session.get(Job, job_id)
+        assert (job.status, job.attempts, job.locked_by) == (status, 1, None)
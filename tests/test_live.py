@@ -0,0 +1,65 @@
+import pytest
+
+from app.realtime import publish_like, stream_likes
+
+
+@pytest.fixture
+def app(config):
+    config(REALTIME_MAX_STREAMS=1)
+    from app import create_app
+
+    return create_app()
+
+
+def hub_keys(app):
+    return dict(app.extensions["realtime"]["hub"]._by_key)
+
+
+def test_subscription_lives_only_while_streaming(app):
+    hub = app.extensions["realtime"]["hub"]
+    stream = stream_likes({"karya:1"}, hub, coalesce=0, heartbeat=1)
+    # Generator belum diiterasi: belum ada langganan
+    assert hub_keys(app) == {}
+
+    assert next(stream).startswith("retry:")
+    assert set(hub_keys(app)) == {"karya:1"}
+
+    stream.close()
+    assert hub_keys(app) == {}
+
+
+def test_closing_response_unsubscribes(app, client):
+    response = client.get("/api/live/likes?karya=1", buffered=False)
+    assert response.status_code == 200
+    response.close()
+    assert hub_keys(app) == {}
+
+
+def test_stream_limit_returns_503_and_releases_on_close(app, client):
+    first = client.get("/api/live/likes?video=1", buffered=False)
+    assert first.status_code == 200
+
+    busy = client.get("/api/live/likes?video=2", buffered=False)
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"]
+
+    # Slot kembali walaupun body stream pertama tidak pernah dibaca
+    first.close()
+    again = client.get("/api/live/likes?video=2", buffered=False)
+    assert again.status_code == 200
+    again.close()
+    assert hub_keys(app) == {}
+
+
+def test_live_is_refused_without_broker_on_several_workers(config, caplog):
+    config(WORKER_PROCESSES=3, REALTIME_BROKER_URL=None)
+    from app import create_app
+
+    app = create_app()
+    assert "REALTIME_BROKER_URL kosong" in caplog.text
+    response = app.test_client().get("/api/live/likes?karya=1")
+    assert response.status_code == 503
+
+    # Like tetap jalan; hanya publish yang dilewati
+    with app.app_context():
+        publish_like("karya", 1, 5)
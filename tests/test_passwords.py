@@ -0,0 +1,73 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app import db
+from app.models import User
+from app.passwords import PasswordHasher, canonical_method
+
+
+def login(client, password, email="ani@test"):
+    return client.post("/api/auth/login", json={"email": email, "password": password})
+
+
+def stored_password(app, user_id):
+    with app.app_context():
+        return db.session.get(User, user_id).password
+
+
+def test_plaintext_password_is_rehashed_on_login(app, client, make_user):
+    user_id = make_user(password="rahasia-lama")
+
+    assert login(client, "salah").status_code == 401
+    assert stored_password(app, user_id) == "rahasia-lama"
+
+    assert login(client, "rahasia-lama").status_code == 200
+    assert stored_password(app, user_id).startswith("pbkdf2:sha256:1000$")
+    assert login(client, "rahasia-lama").status_code == 200
+
+
+def test_hash_is_upgraded_after_method_change(app, client, make_user):
+    old_hash = generate_password_hash("rahasia", "pbkdf2:sha256:1000")
+    user_id = make_user(password=old_hash)
+    app.extensions["passwords"] = PasswordHasher("pbkdf2:sha256:2000", 1, 1)
+
+    assert login(client, "rahasia").status_code == 200
+    assert stored_password(app, user_id).startswith("pbkdf2:sha256:2000$")
+
+
+@pytest.mark.parametrize(
+    "method, stored, expected",
+    [
+        ("pbkdf2:sha256:1000", "pbkdf2:sha256:1000$salt$hash", False),
+        ("pbkdf2:sha256:2000", "pbkdf2:sha256:1000$salt$hash", True),
+        ("scrypt", "scrypt:32768:8:1$salt$hash", False),
+        ("scrypt:16384:8:1", "scrypt:32768:8:1$salt$hash", True),
+        ("pbkdf2:sha256:1000", "password-polos", True),
+    ],
+)
+def test_needs_rehash(method, stored, expected):
+    assert PasswordHasher(method, 1, 0).needs_rehash(stored) is expected
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        canonical_method("md5")
+
+
+def test_busy_hasher_returns_503(app, client, make_user):
+    make_user(password=generate_password_hash("rahasia", "pbkdf2:sha256:1000"))
+    hasher = app.extensions["passwords"] = PasswordHasher("pbkdf2:sha256:1000", 1, 0)
+    # Satu-satunya slot sedang dipakai hashing lain
+    hasher._slots.acquire()
+    try:
+        response = login(client, "rahasia")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"]
+        register = client.post(
+            "/api/auth/register",
+            json={"email": "b@test", "username": "budi", "password": "rahasia", "nama_lengkap": "Budi"},
+        )
+        assert register.status_code == 503
+    finally:
+        hasher._slots.release()
+    assert login(client, "rahasia").status_code == 200
@@ -0,0 +1,95 @@
+import asyncio
+import gzip
+
+import pytest
+
+from app import db
+from app.asgi import AsyncGateway
+from app.async_db import dispose_async_engine
+
+
+@pytest.fixture
+def app(config):
+    # GET /api/karya_seni berbobot 5: burst 10 cukup untuk dua request
+    config(RATELIMIT_ENABLED=True, RATELIMIT_RATE=0.01, RATELIMIT_BURST=10, CACHE_ENABLED=False)
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    yield app
+    asyncio.run(dispose_async_engine())
+
+
+def call(gateway, path="/api/karya_seni", headers=()):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "GET", "path": path, "query_string": b"", "scheme": "http",
+        "headers": [(b"host", b"localhost"), *headers], "client": ("10.0.0.1", 5000),
+    }
+    asyncio.run(gateway(scope, receive, send))
+    return sent[0]["status"], dict(sent[0]["headers"]), sent[1]["body"]
+
+
+def test_route_weight_exhausts_bucket(client):
+    assert client.get("/api/karya_seni").status_code == 200
+    assert client.get("/api/karya_seni").status_code == 200
+    response = client.get("/api/karya_seni")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_async_routes_share_buckets_with_flask(app):
+    app.test_client().get("/api/karya_seni", environ_base={"REMOTE_ADDR": "10.0.0.1"})
+    gateway = AsyncGateway(app)
+
+    assert call(gateway)[0] == 200
+    status, headers, _ = call(gateway)
+    assert status == 429
+    assert headers[b"retry-after"]
+    assert app.extensions["ratelimit"]["admission"].in_flight == 0
+
+
+def test_async_admission_rejects_when_full(app):
+    admission = app.extensions["ratelimit"]["admission"]
+    admission.capacity = admission.in_flight = 5
+    admission.queue = 0
+    status, headers, _ = call(AsyncGateway(app))
+    assert status == 503
+    assert headers[b"retry-after"]
+
+
+def test_async_deadline(app):
+    async def slow(conn, ctx):
+        await asyncio.sleep(1)
+
+    app.config["REQUEST_DEADLINE_SECONDS"] = 0.05
+    status, _, _ = call(AsyncGateway(app, routes={"/api/karya_seni": slow}))
+    assert status == 504
+    assert app.extensions["ratelimit"]["admission"].in_flight == 0
+
+
+def test_async_response_is_compressed(app):
+    async def large(conn, ctx):
+        return [{"judul": "x" * 50}] * 100
+
+    gateway = AsyncGateway(app, routes={"/api/karya_seni": large})
+    status, headers, body = call(gateway, headers=[(b"accept-encoding", b"gzip")])
+    assert status == 200
+    assert headers[b"content-encoding"] == b"gzip"
+    assert gzip.decompress(body).startswith(b'[{"judul"')
+
+
+def test_redis_storage_requires_url(config):
+    config(RATELIMIT_ENABLED=True, RATELIMIT_STORAGE="redis", RATELIMIT_REDIS_URL=None)
+    from app import create_app
+
+    with pytest.raises(ValueError, match="RATELIMIT_REDIS_URL"):
+        create_app()
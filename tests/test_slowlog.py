@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from app.deadlines import with_statement_timeout
+
+
+@pytest.fixture
+def app(config, tmp_path):
+    config(SLOW_QUERY_MS=1, SLOW_QUERY_EXPLAIN=False, SLOW_QUERY_LOG=str(tmp_path / "slow.log"))
+    from app import create_app
+
+    app = create_app()
+    # Semua statement dianggap lambat
+    app.extensions["slowlog"].threshold = 0
+    return app
+
+
+def test_failed_statement_does_not_shift_timings(app):
+    with app.app_context():
+        with db.engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM tabel_tidak_ada"))
+            assert conn.info["slowlog_started"] == []
+            conn.execute(text("SELECT 1"))
+            assert conn.info["slowlog_started"] == []
+
+
+def test_parameters_are_not_logged(app, tmp_path):
+    with app.app_context():
+        with db.engine.connect() as conn:
+            conn.execute(text("SELECT :token AS t"), {"token": "rahasia-token"})
+    entry = app.extensions["slowlog"].recent(1)[0]
+    assert entry["statement"].startswith("SELECT")
+    assert "rahasia-token" not in str(entry)
+    assert "rahasia-token" not in (tmp_path / "slow.log").read_text()
+
+
+def test_deadline_hint_does_not_defeat_explain_dedupe(app):
+    # Tiru listener deadline MySQL: teks statement berbeda di tiap eksekusi
+    budgets = iter([900, 850])
+
+    def add_hint(conn, cursor, statement, parameters, context, executemany):
+        return with_statement_timeout(statement, "mysql", next(budgets)), parameters
+
+    recorder = app.extensions["slowlog"]
+    recorder.explain_enabled = True
+    explained = []
+    recorder._explain_and_record = lambda entry, statement, parameters: explained.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", add_hint, retval=True, insert=True)
+        try:
+            with db.engine.connect() as conn:
+                for _ in range(2):
+                    conn.execute(text("SELECT 1 AS satu"))
+        finally:
+            event.remove(db.engine, "before_cursor_execute", add_hint)
+    recorder._executor.shutdown(wait=True)
+
+    assert explained == ["SELECT 1 AS satu"]
+    assert [entry["statement"] for entry in recorder.recent(2)] == ["SELECT 1 AS satu"]
@@ -0,0 +1,90 @@
+import io
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+import pytest
+
+from app import db
+from app.archival import archive_expired, restore
+from app.models import karya_seni
+from app.storage import get_storage
+
+
+@pytest.fixture
+def app(config):
+    config(STORAGE_BACKEND="memory")
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def presigned_upload(client, headers, filename="lukisan.png"):
+    response = client.post(
+        "/api/storage/presign", headers=headers, json={"kind": "karya", "filename": filename}
+    )
+    assert response.status_code == 201
+    upload = response.get_json()
+    url = urlsplit(upload["url"])
+    assert client.put(f"{url.path}?{url.query}", data=b"gambar").status_code == 204
+    return upload["key"]
+
+
+def create_karya(client, headers, key):
+    return client.post(
+        "/api/karya_seni",
+        headers=headers,
+        data={"judul_karya": "Senja", "link_foto_key": key},
+        content_type="multipart/form-data",
+    )
+
+
+def test_claim_rejects_other_users_upload(client, make_user, auth):
+    owner, other = make_user(), make_user("budi")
+    key = presigned_upload(client, auth(owner))
+
+    assert create_karya(client, auth(other), key).status_code == 400
+    response = create_karya(client, auth(owner), key)
+    assert response.status_code == 201
+    assert response.get_json()["data"]["link_foto"].endswith(key)
+
+
+def test_archive_moves_files_through_storage(app, make_user):
+    user_id = make_user()
+    with app.app_context():
+        storage = get_storage()
+        storage.objects["static/uploads/aa/bb/x.png"] = (b"x", "image/png")
+        karya = karya_seni(
+            user_id=user_id,
+            judul_karya="lama",
+            link_foto=storage.url("static/uploads/aa/bb/x.png"),
+            deleted_at=datetime.utcnow() - timedelta(days=200),
+        )
+        db.session.add(karya)
+        db.session.commit()
+        karya_id = karya.id
+
+        assert archive_expired(90)["karya"] == 1
+        assert set(storage.objects) == {"archive/static/uploads/aa/bb/x.png"}
+
+        restore("karya", karya_id)
+        assert set(storage.objects) == {"static/uploads/aa/bb/x.png"}
+
+
+def test_direct_uploads_with_same_name_get_distinct_keys(app, client, make_user, auth):
+    links = []
+    for user_id in (make_user(), make_user("budi"), make_user("cici")):
+        response = client.post(
+            "/api/karya_seni",
+            headers=auth(user_id),
+            data={"judul_karya": "Senja", "link_foto": (io.BytesIO(b"gambar"), "foto.jpg")},
+            content_type="multipart/form-data",
+        )
+        assert response.status_code == 201
+        links.append(response.get_json()["data"]["link_foto"])
+
+    assert len(set(links)) == 3
+    with app.app_context():
+        assert len(get_storage().objects) == 3
@@ -0,0 +1,46 @@
+import pytest
+
+from app import db
+from app.usernames import resolve_username
+
+
+@pytest.fixture
+def app(config):
+    # Response cache dimatikan agar yang diuji hanya resolver username
+    config(CACHE_ENABLED=False)
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def test_spellings_share_one_entry(app, make_user):
+    user_id = make_user("alice")
+    with app.app_context():
+        assert resolve_username("Alice") == user_id
+        assert resolve_username("ALICE") == user_id
+        assert list(app.extensions["usernames"]._entries) == ["alice"]
+
+
+def test_register_clears_negative_entry_of_other_spelling(client):
+    assert client.get("/api/users/username/Dewi").status_code == 404
+
+    response = client.post(
+        "/api/users/",
+        data={"email": "d@test", "username": "dewi", "password": "rahasia123", "nama_lengkap": "Dewi"},
+    )
+    assert response.status_code == 201
+    assert client.get("/api/users/username/Dewi").status_code == 200
+
+
+def test_rename_invalidates_old_and_new_name(app, client, make_user, auth):
+    user_id = make_user("budi")
+    assert client.get("/api/users/username/BUDI").status_code == 200
+    assert client.get("/api/users/username/Citra").status_code == 404
+
+    response = client.put(f"/api/users/{user_id}", headers=auth(user_id), data={"username": "citra"})
+    assert response.status_code == 200
+    assert client.get("/api/users/username/Budi").status_code == 404
+    assert client.get("/api/users/username/citra").status_code == 200
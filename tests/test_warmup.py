@@ -0,0 +1,23 @@
+from app.fieldsets import FIELDSETS
+from app.routes.users import USER_DETAIL_FIELDS
+from app.warmup import warm_up
+
+
+def test_warm_up_compiles_default_fieldset_plans(app):
+    for fieldset in FIELDSETS:
+        fieldset._plans.clear()
+
+    timings = warm_up(app)
+    assert set(timings) >= {"pool_ms", "hooks_ms"}
+    assert tuple(USER_DETAIL_FIELDS.fields) in USER_DETAIL_FIELDS._plans
+    assert all(tuple(fs.fields) in fs._plans for fs in FIELDSETS)
+
+
+def test_user_detail_logs_errors_instead_of_printing(client, make_user, monkeypatch, capsys, caplog):
+    user_id = make_user()
+    monkeypatch.setattr(USER_DETAIL_FIELDS, "serialize", lambda *args: 1 / 0)
+
+    response = client.get(f"/api/users/{user_id}/detail")
+    assert response.status_code == 500
+    assert capsys.readouterr().out == ""
+    assert "Gagal mengambil detail user" in caplog.text
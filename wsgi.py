@@ -0,0 +1,10 @@
+import time
+
+from app import create_app
+
+# Entry point produksi (gunicorn/uWSGI); run.py tetap untuk development
+_started = time.perf_counter()
+app = create_app()
+app.extensions["startup_timings"]["wsgi_load_ms"] = round(
+    (time.perf_counter() - _started) * 1000, 1
+)